@@ -3,6 +3,7 @@ from typing import Annotated, cast
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import func, select
 
+from backend.auth import invalidate_principal
 from backend.core.deps import AdminUser, DbSession
 from backend.domain.models.task import Task
 from backend.domain.models.user import User
@@ -10,6 +11,7 @@ from backend.repositories.task_repo import TaskRepository
 from backend.repositories.user_repo import UserRepository
 from backend.schemas.auth import UserResponse
 from backend.schemas.task import (
+    TaskAdminCursorResponse,
     TaskAdminListResponse,
     TaskAdminResponse,
     TaskUpdate,
@@ -18,7 +20,9 @@ from backend.schemas.task import (
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
-@router.get("/tasks", response_model=TaskAdminListResponse)
+@router.get(
+    "/tasks", response_model=TaskAdminListResponse | TaskAdminCursorResponse
+)
 async def get_admin_tasks(
     current_user: AdminUser,
     db: DbSession,
@@ -27,7 +31,22 @@ async def get_admin_tasks(
     task_type: Annotated[int | None, Query()] = None,
     search: Annotated[str | None, Query()] = None,
     filter: Annotated[str | None, Query()] = None,
-) -> TaskAdminListResponse:
+    cursor: Annotated[str | None, Query(max_length=200)] = None,
+    with_total: bool = False,
+) -> TaskAdminListResponse | TaskAdminCursorResponse:
+    if cursor is not None:
+        return cast(
+            TaskAdminCursorResponse,
+            await TaskRepository(db).get_cursor_page(
+                cursor=cursor,
+                per_page=per_page,
+                task_type=task_type,
+                search=search,
+                filter=filter,
+                is_admin=True,
+                with_total=with_total,
+            ),
+        )
     return cast(
         TaskAdminListResponse,
         await TaskRepository(db).get_paginated(
@@ -84,6 +103,7 @@ async def set_role(
         raise HTTPException(404, "Пользователь не найден")
     user.role = role
     await repo.save(user)
+    invalidate_principal(user.id)
     return {"ok": True}
 
 
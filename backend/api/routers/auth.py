@@ -3,30 +3,28 @@ from typing import Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from backend.auth import (
     ACCESS_TOKEN_EXPIRE_DAYS,
+    Principal,
     create_access_token,
-    hash_password,
-    verify_password,
+    password_hasher,
 )
 from backend.core.config import IS_PROD
 from backend.core.deps import CurrentUser, DbSession
+from backend.core.ratelimit import client_ip, limiter
 from backend.domain.models.user import User
 from backend.repositories.user_repo import UserRepository
 from backend.schemas.auth import UserResponse, validate_password_strength
 from backend.turnstile import verify_turnstile
 
-limiter = Limiter(key_func=get_remote_address)
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 COOKIE_MAX_AGE = ACCESS_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 SAME_SITE_MODE: Literal["strict", "lax"] = "strict" if IS_PROD else "lax"
 
 
-def _set_auth_cookie(response: Response, token: str) -> None:
+def set_auth_cookie(response: Response, token: str) -> None:
     response.set_cookie(
         key="access_token",
         value=token,
@@ -56,9 +54,9 @@ class LoginRequest(BaseModel):
     turnstile_token: Optional[str] = None
 
 
-async def _verify_captcha(token: Optional[str]) -> None:
+async def _verify_captcha(request: Request, token: Optional[str]) -> None:
     if token:
-        if not await verify_turnstile(token):
+        if not await verify_turnstile(token, client_ip(request)):
             raise HTTPException(400, "Капча не пройдена")
     elif os.getenv("TURNSTILE_SECRET_KEY"):
         raise HTTPException(400, "Требуется пройти капчу")
@@ -69,7 +67,7 @@ async def _verify_captcha(token: Optional[str]) -> None:
 async def register(
     request: Request, data: RegisterRequest, response: Response, db: DbSession
 ) -> User:
-    await _verify_captcha(data.turnstile_token)
+    await _verify_captcha(request, data.turnstile_token)
 
     repo = UserRepository(db)
     if await repo.get_by_username(data.username):
@@ -80,11 +78,14 @@ async def register(
     user = await repo.create(
         username=data.username,
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await password_hasher.hash(data.password),
     )
     await repo.create_stats(user.id)
 
-    _set_auth_cookie(response, create_access_token({"sub": user.id}))
+    set_auth_cookie(
+        response,
+        create_access_token({"sub": user.id, "ver": user.token_version}),
+    )
     return user
 
 
@@ -93,14 +94,19 @@ async def register(
 async def login(
     request: Request, data: LoginRequest, response: Response, db: DbSession
 ) -> User:
-    await _verify_captcha(data.turnstile_token)
+    await _verify_captcha(request, data.turnstile_token)
 
     repo = UserRepository(db)
     user = await repo.get_by_username(data.username)
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(
+        data.password, user.hashed_password
+    ):
         raise HTTPException(401, "Неверный логин или пароль")
 
-    _set_auth_cookie(response, create_access_token({"sub": user.id}))
+    set_auth_cookie(
+        response,
+        create_access_token({"sub": user.id, "ver": user.token_version}),
+    )
     return user
 
 
@@ -117,5 +123,5 @@ async def logout(response: Response) -> dict[str, bool]:
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: CurrentUser) -> User:
+async def get_me(current_user: CurrentUser) -> Principal:
     return current_user
@@ -0,0 +1,125 @@
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backend.auth import password_hasher
+from backend.core.background import PeriodicTask
+from backend.core.capacity import WEB_CONCURRENCY
+from backend.core.config import (
+    METRICS_DIR,
+    METRICS_SNAPSHOT_INTERVAL,
+    METRICS_TOKEN,
+)
+from backend.core.metrics import (
+    Counter,
+    Gauge,
+    Labels,
+    WorkerSnapshots,
+    registry,
+)
+from backend.core.workers import BoundedExecutor
+from backend.database import engine
+from backend.services.solution_service import image_executor
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+_EXECUTORS: list[BoundedExecutor] = [password_hasher, image_executor]
+
+# Несколько воркеров: метрики всех процессов с меткой worker.
+MULTI_WORKER = WEB_CONCURRENCY > 1
+worker_snapshots = WorkerSnapshots(METRICS_DIR)
+
+
+async def _publish_snapshot() -> None:
+    worker_snapshots.write(registry)
+
+
+metrics_publisher = PeriodicTask(
+    "metrics-snapshot",
+    _publish_snapshot,
+    METRICS_SNAPSHOT_INTERVAL,
+    flush_on_stop=False,
+)
+
+
+def _pool_state() -> dict[Labels, float]:
+    pool = engine.pool
+    state: dict[Labels, float] = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            state[(name,)] = method()
+    return state
+
+
+def _executor_state() -> dict[Labels, float]:
+    state: dict[Labels, float] = {}
+    for executor in _EXECUTORS:
+        stats = executor.stats()
+        for key in ("workers", "waiting", "in_flight"):
+            state[(executor.name, key)] = stats[key]
+    return state
+
+
+def _executor_utilization() -> dict[Labels, float]:
+    return {
+        (e.name,): e.in_flight / e.workers for e in _EXECUTORS if e.workers
+    }
+
+
+def _executor_totals() -> dict[Labels, float]:
+    state: dict[Labels, float] = {}
+    for executor in _EXECUTORS:
+        state[(executor.name, "completed")] = executor.completed
+        state[(executor.name, "rejected")] = executor.rejected
+    return state
+
+
+registry.register(
+    Gauge(
+        "db_pool_connections",
+        "Соединения пула SQLAlchemy",
+        labels=("state",),
+        collect=_pool_state,
+    )
+)
+registry.register(
+    Gauge(
+        "executor_tasks",
+        "Состояние пулов воркеров (очередь, выполняются, размер)",
+        labels=("pool", "state"),
+        collect=_executor_state,
+    )
+)
+registry.register(
+    Gauge(
+        "executor_utilization_ratio",
+        "Доля занятых воркеров пула",
+        labels=("pool",),
+        collect=_executor_utilization,
+    )
+)
+registry.register(
+    Counter(
+        "executor_tasks_total",
+        "Задачи пулов воркеров по исходу",
+        labels=("pool", "outcome"),
+        collect=_executor_totals,
+    )
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    authorization: Annotated[str | None, Header()] = None,
+) -> PlainTextResponse:
+    if METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {METRICS_TOKEN}"
+    ):
+        raise HTTPException(401, "Требуется токен метрик")
+    workers = worker_snapshots.collect(registry) if MULTI_WORKER else None
+    return PlainTextResponse(
+        registry.render(workers), media_type="text/plain; version=0.0.4"
+    )
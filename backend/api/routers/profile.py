@@ -1,17 +1,65 @@
-from fastapi import APIRouter, HTTPException
-
-from backend.auth import hash_password, verify_password
+from collections.abc import AsyncIterator
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+
+from backend.api.routers.auth import set_auth_cookie
+from backend.auth import (
+    create_access_token,
+    invalidate_principal,
+    password_hasher,
+)
 from backend.core.deps import CurrentUser, DbSession
+from backend.repositories.solution_repo import SolutionRepository
 from backend.repositories.user_repo import UserRepository
 from backend.schemas.auth import ChangePasswordRequest, UserResponse
-from backend.schemas.stats import TypeStatItem, UserStatsResponse
-from backend.services.stats_service import StatsService
+from backend.schemas.stats import (
+    HistoryFilter,
+    HistoryItem,
+    HistoryPageResponse,
+    TypeStatItem,
+    UserStatsResponse,
+)
+from backend.services.stats_service import HISTORY_LIMIT, StatsService
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
 
 def get_stats_service(db: DbSession) -> StatsService:
-    return StatsService(user_repo=UserRepository(db))
+    return StatsService(
+        user_repo=UserRepository(db), solution_repo=SolutionRepository(db)
+    )
+
+
+HistoryQuery = Annotated[HistoryFilter, Depends()]
+HistoryResult = list[HistoryItem] | HistoryPageResponse | StreamingResponse
+
+
+async def _history(
+    db: DbSession,
+    user_id: int,
+    filters: HistoryFilter,
+    cursor: str | None,
+    per_page: int,
+    format: str,
+) -> HistoryResult:
+    service = get_stats_service(db)
+    if format == "ndjson":
+
+        async def body() -> AsyncIterator[bytes]:
+            # get_db закрывает сессию до отправки тела ответа, поэтому
+            # поток сам освобождает соединение, когда заканчивается.
+            try:
+                async for chunk in service.export_history(user_id, filters):
+                    yield chunk
+            finally:
+                await db.close()
+
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+    if cursor is None:
+        return await service.get_history(user_id, filters, per_page)
+    return await service.get_history_page(user_id, filters, cursor, per_page)
 
 
 @router.get("/stats", response_model=UserStatsResponse)
@@ -21,9 +69,18 @@ async def get_my_stats(
     return await get_stats_service(db).get_user_stats(current_user.id)
 
 
-@router.get("/history")
-async def get_history(current_user: CurrentUser, db: DbSession) -> list[dict]:
-    return await get_stats_service(db).get_history(current_user.id)
+@router.get("/history", response_model=list[HistoryItem] | HistoryPageResponse)
+async def get_history(
+    current_user: CurrentUser,
+    db: DbSession,
+    filters: HistoryQuery,
+    cursor: Annotated[str | None, Query(max_length=200)] = None,
+    per_page: Annotated[int, Query(ge=1, le=200)] = HISTORY_LIMIT,
+    format: Literal["json", "ndjson"] = "json",
+) -> HistoryResult:
+    return await _history(
+        db, current_user.id, filters, cursor, per_page, format
+    )
 
 
 @router.get("/type-stats", response_model=list[TypeStatItem])
@@ -35,12 +92,29 @@ async def get_my_type_stats(
 
 @router.post("/change-password")
 async def change_password(
-    data: ChangePasswordRequest, current_user: CurrentUser, db: DbSession
+    data: ChangePasswordRequest,
+    response: Response,
+    current_user: CurrentUser,
+    db: DbSession,
 ) -> dict[str, bool]:
-    if not verify_password(data.old_password, current_user.hashed_password):
+    repo = UserRepository(db)
+    user = await repo.get_by_id(current_user.id)
+    if not user:
+        raise HTTPException(404, "Пользователь не найден")
+    if not await password_hasher.verify(
+        data.old_password, user.hashed_password
+    ):
         raise HTTPException(400, "Неверный текущий пароль")
-    current_user.hashed_password = hash_password(data.new_password)
-    await UserRepository(db).save(current_user)
+    user.hashed_password = await password_hasher.hash(data.new_password)
+    # Остальные сессии с прежним паролем перестают действовать, текущая
+    # получает новый токен.
+    user.token_version = (user.token_version or 0) + 1
+    await repo.save(user)
+    invalidate_principal(user.id)
+    set_auth_cookie(
+        response,
+        create_access_token({"sub": user.id, "ver": user.token_version}),
+    )
     return {"ok": True}
 
 
@@ -48,7 +122,12 @@ async def change_password(
 async def delete_account(
     current_user: CurrentUser, db: DbSession
 ) -> dict[str, bool]:
-    await UserRepository(db).delete(current_user)
+    repo = UserRepository(db)
+    user = await repo.get_by_id(current_user.id)
+    if not user:
+        raise HTTPException(404, "Пользователь не найден")
+    await repo.delete(user)
+    invalidate_principal(user.id)
     return {"ok": True}
 
 
@@ -78,13 +157,22 @@ async def get_user_type_stats(
     return await get_stats_service(db).get_type_stats(user_id)
 
 
-@router.get("/user/{user_id}/history")
+@router.get(
+    "/user/{user_id}/history",
+    response_model=list[HistoryItem] | HistoryPageResponse,
+)
 async def get_user_history(
-    user_id: int, current_user: CurrentUser, db: DbSession
-) -> list[dict]:
+    user_id: int,
+    current_user: CurrentUser,
+    db: DbSession,
+    filters: HistoryQuery,
+    cursor: Annotated[str | None, Query(max_length=200)] = None,
+    per_page: Annotated[int, Query(ge=1, le=200)] = HISTORY_LIMIT,
+    format: Literal["json", "ndjson"] = "json",
+) -> HistoryResult:
     if (
         current_user.role not in ("admin", "teacher")
         and current_user.id != user_id
     ):
         raise HTTPException(403, "Можно смотреть только свою историю")
-    return await get_stats_service(db).get_history(user_id)
+    return await _history(db, user_id, filters, cursor, per_page, format)
@@ -1,9 +1,12 @@
 import os
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile
 
+from backend.core.config import RATE_LIMIT_CHECK, RATE_LIMIT_UPLOAD
 from backend.core.deps import CurrentUser, DbSession
 from backend.core.deps import TeacherOrAdmin as AdminOrTeacher
+from backend.core.ratelimit import limiter, user_or_client_ip
 from backend.repositories.solution_repo import SolutionRepository
 from backend.repositories.task_repo import TaskRepository
 from backend.repositories.user_repo import UserRepository
@@ -12,6 +15,7 @@ from backend.schemas.solution import (
     CheckAnswerResponse,
     SolutionCreate,
     SolutionResponse,
+    TaskProgressResponse,
 )
 from backend.services.solution_service import SolutionService
 
@@ -27,8 +31,12 @@ def get_service(db: DbSession) -> SolutionService:
 
 
 @router.post("/check", response_model=CheckAnswerResponse)
+@limiter.limit(RATE_LIMIT_CHECK, key_func=user_or_client_ip)
 async def check_answer(
-    data: CheckAnswerRequest, current_user: CurrentUser, db: DbSession
+    request: Request,
+    data: CheckAnswerRequest,
+    current_user: CurrentUser,
+    db: DbSession,
 ) -> CheckAnswerResponse:
     return await get_service(db).check_answer(
         data.task_id, data.answer, current_user.id
@@ -49,6 +57,15 @@ async def get_my_solutions(
     return await get_service(db).get_my_solutions(current_user.id, task_id)
 
 
+@router.get("/progress", response_model=list[TaskProgressResponse])
+async def get_my_progress(
+    task_ids: Annotated[list[int], Query(max_length=100)],
+    current_user: CurrentUser,
+    db: DbSession,
+) -> list[TaskProgressResponse]:
+    return await get_service(db).get_progress(current_user.id, task_ids)
+
+
 @router.get("/task/{task_id}/all", response_model=list[SolutionResponse])
 async def get_all_solutions_for_task(
     task_id: int, current_user: AdminOrTeacher, db: DbSession
@@ -57,7 +74,9 @@ async def get_all_solutions_for_task(
 
 
 @router.post("/upload/{solution_id}")
+@limiter.limit(RATE_LIMIT_UPLOAD, key_func=user_or_client_ip)
 async def upload_file(
+    request: Request,
     solution_id: int,
     file: UploadFile,
     current_user: CurrentUser,
@@ -70,14 +89,6 @@ async def upload_file(
     if safe_filename != file.filename or not safe_filename.strip():
         raise HTTPException(400, "Недопустимое имя файла")
 
-    max_size = 10 * 1024 * 1024
-    size = 0
-    while chunk := await file.read(8192):
-        size += len(chunk)
-        if size > max_size:
-            raise HTTPException(413, "Файл слишком большой")
-
-    await file.seek(0)
     return await get_service(db).upload_file(
         solution_id, current_user.id, file
     )
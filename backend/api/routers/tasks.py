@@ -1,43 +1,121 @@
+from collections.abc import Awaitable, Callable, Hashable
 from typing import Annotated, cast
 
-from fastapi import APIRouter, HTTPException, Query
-from sqlalchemy import case, select, update
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.deps import CurrentUser, DbSession
 from backend.domain.models.task import Task, TaskVote
-from backend.repositories.task_repo import TaskRepository
-from backend.schemas.task import TaskListResponse, TaskResponse, VoteRequest
+from backend.repositories.load_plans import TASK_PUBLIC
+from backend.repositories.task_repo import (
+    TaskRepository,
+    sync_catalogue_version,
+    task_response_cache,
+)
+from backend.schemas.task import (
+    TaskCursorResponse,
+    TaskListResponse,
+    TaskResponse,
+    VoteRequest,
+)
+from backend.services.vote_counters import (
+    apply_vote_deltas,
+    vote_buffer,
+    vote_flusher,
+)
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
 
-@router.get("", response_model=TaskListResponse)
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def _cached_json(
+    request: Request,
+    db: AsyncSession,
+    key: Hashable,
+    build: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """Отдаёт ответ из task_response_cache, собирая его при промахе."""
+    await sync_catalogue_version(db)
+    version = task_response_cache.version
+    cached = task_response_cache.get(key)
+    if cached is None:
+        model = await build()
+        cached = task_response_cache.put(
+            key, model.model_dump_json().encode(), version
+        )
+
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        cached.body, media_type="application/json", headers=headers
+    )
+
+
+@router.get("", response_model=TaskListResponse | TaskCursorResponse)
 async def get_tasks(
+    request: Request,
     db: DbSession,
     page: Annotated[int, Query(ge=1)] = 1,
     per_page: Annotated[int, Query(ge=1, le=50)] = 10,
     task_type: Annotated[int | None, Query()] = None,
     search: Annotated[str | None, Query()] = None,
     filter: Annotated[str | None, Query()] = None,
-) -> TaskListResponse:
-    return cast(
-        TaskListResponse,
-        await TaskRepository(db).get_paginated(
-            page=page,
-            per_page=per_page,
-            task_type=task_type,
-            search=search,
-            filter=filter,
-        ),
+    cursor: Annotated[str | None, Query(max_length=200)] = None,
+    with_total: bool = False,
+) -> TaskListResponse | TaskCursorResponse | Response:
+    if cursor is not None:
+        return cast(
+            TaskCursorResponse,
+            await TaskRepository(db).get_cursor_page(
+                cursor=cursor,
+                per_page=per_page,
+                task_type=task_type,
+                search=search,
+                filter=filter,
+                with_total=with_total,
+            ),
+        )
+
+    async def build() -> TaskListResponse:
+        return cast(
+            TaskListResponse,
+            await TaskRepository(db).get_paginated(
+                page=page,
+                per_page=per_page,
+                task_type=task_type,
+                search=search,
+                filter=filter,
+            ),
+        )
+
+    # Поисковые запросы не кэшируются: пространство ключей не ограничено.
+    if search:
+        return await build()
+    return await _cached_json(
+        request, db, ("list", filter, task_type, page, per_page), build
     )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, db: DbSession) -> TaskResponse:
-    task = await TaskRepository(db).get_by_id(task_id)
-    if not task:
-        raise HTTPException(404, "Задание не найдено")
-    return TaskResponse.model_validate(task)
+async def get_task(
+    task_id: int, request: Request, db: DbSession
+) -> TaskResponse | Response:
+    async def build() -> TaskResponse:
+        task = await TaskRepository(db).get_by_id(task_id, plan=TASK_PUBLIC)
+        if not task:
+            raise HTTPException(404, "Задание не найдено")
+        return TaskResponse.model_validate(task)
+
+    return await _cached_json(request, db, ("task", task_id), build)
 
 
 @router.get("/{task_id}/vote")
@@ -91,50 +169,41 @@ async def _update_task_vote_record(
 async def vote_task(
     task_id: int, data: VoteRequest, current_user: CurrentUser, db: DbSession
 ) -> dict:
-    task_exists = await db.scalar(select(Task.id).where(Task.id == task_id))
-    if not task_exists:
-        raise HTTPException(404, "Задание не найдено")
-
-    result = await db.execute(
-        select(TaskVote).where(
-            TaskVote.user_id == current_user.id, TaskVote.task_id == task_id
+    # Одним запросом: существование задания, счётчики и текущий голос.
+    row = (
+        await db.execute(
+            select(Task.likes, Task.dislikes, TaskVote)
+            .outerjoin(
+                TaskVote,
+                and_(
+                    TaskVote.task_id == Task.id,
+                    TaskVote.user_id == current_user.id,
+                ),
+            )
+            .where(Task.id == task_id)
         )
-    )
-    existing_vote = result.scalar_one_or_none()
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(404, "Задание не найдено")
+    likes, dislikes, existing_vote = row
     old_vote_type = existing_vote.vote_type if existing_vote else None
 
     delta_likes, delta_dislikes = _calculate_deltas(old_vote_type, data.vote)
 
-    if delta_likes != 0 or delta_dislikes != 0:
-        stmt = (
-            update(Task)
-            .where(Task.id == task_id)
-            .values(
-                likes=case(
-                    (Task.likes + delta_likes < 0, 0),
-                    else_=Task.likes + delta_likes,
-                ),
-                dislikes=case(
-                    (Task.dislikes + delta_dislikes < 0, 0),
-                    else_=Task.dislikes + delta_dislikes,
-                ),
-            )
-        )
-        await db.execute(stmt)
-
     await _update_task_vote_record(
         db, existing_vote, data.vote, current_user.id, task_id
     )
-
     await db.commit()
 
-    counts = await db.execute(
-        select(Task.likes, Task.dislikes).where(Task.id == task_id)
-    )
-    likes, dislikes = counts.one()
+    # Счётчики в tasks обновит vote_flusher; в ответе учитываем ещё не
+    # сброшенные приращения.
+    vote_buffer.add(task_id, delta_likes, delta_dislikes)
+    pending_likes, pending_dislikes = vote_buffer.pending(task_id)
+    if not vote_flusher.running:
+        await apply_vote_deltas(db)
 
     return {
-        "likes": likes,
-        "dislikes": dislikes,
+        "likes": max(0, likes + pending_likes),
+        "dislikes": max(0, dislikes + pending_dislikes),
         "user_vote": data.vote,
     }
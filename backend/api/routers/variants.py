@@ -1,11 +1,11 @@
 from fastapi import APIRouter
 
 from backend.core.deps import CurrentUser, DbSession, TeacherOrAdmin
-from backend.repositories.class_repo import ClassRepository
 from backend.repositories.solution_repo import SolutionRepository
 from backend.repositories.task_repo import TaskRepository
 from backend.repositories.variant_repo import VariantRepository
 from backend.schemas.variant import (
+    VariantClassMatrixResponse,
     VariantCreate,
     VariantResponse,
     VariantStudentSolutionResponse,
@@ -36,9 +36,8 @@ async def create_variant(
 async def get_variants(
     current_user: CurrentUser, db: DbSession
 ) -> list[VariantResponse]:
-    class_ids = await ClassRepository(db).get_user_class_ids(current_user.id)
     return await get_service(db).get_for_user(
-        current_user.id, current_user.role, class_ids
+        current_user.id, current_user.role, list(current_user.class_ids)
     )
 
 
@@ -46,9 +45,11 @@ async def get_variants(
 async def get_variant(
     variant_id: int, current_user: CurrentUser, db: DbSession
 ) -> VariantResponse:
-    class_ids = await ClassRepository(db).get_user_class_ids(current_user.id)
     return await get_service(db).get_one(
-        variant_id, current_user.id, current_user.role, class_ids
+        variant_id,
+        current_user.id,
+        current_user.role,
+        list(current_user.class_ids),
     )
 
 
@@ -65,6 +66,19 @@ async def get_variant_student_solutions(
     return await get_service(db).get_student_solutions(variant_id, student_id)
 
 
+@router.get(
+    "/{variant_id}/class/{class_id}/matrix",
+    response_model=VariantClassMatrixResponse,
+)
+async def get_variant_class_matrix(
+    variant_id: int,
+    class_id: int,
+    current_user: TeacherOrAdmin,
+    db: DbSession,
+) -> VariantClassMatrixResponse:
+    return await get_service(db).get_class_matrix(variant_id, class_id)
+
+
 @router.delete("/{variant_id}")
 async def delete_variant(
     variant_id: int, current_user: TeacherOrAdmin, db: DbSession
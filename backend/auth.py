@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import os
 from typing import Annotated, Any, cast
@@ -10,8 +11,17 @@ from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.cache import TTLCache
+from backend.core.config import (
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_WORKERS,
+    PRINCIPAL_CACHE_SIZE,
+    PRINCIPAL_CACHE_TTL,
+)
+from backend.core.workers import BoundedExecutor
 from backend.database import get_db
-from backend.domain.models import User
+from backend.domain.models import ClassMember, User
 
 if not os.getenv("SECRET_KEY"):
     from dotenv import load_dotenv
@@ -28,6 +38,27 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    username: str
+    email: str
+    role: str
+    token_version: int
+    created_at: datetime
+    class_ids: tuple[int, ...]
+
+
+principal_cache: TTLCache[int, Principal] = TTLCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL
+)
+
+
+def invalidate_principal(*user_ids: int) -> None:
+    for user_id in user_ids:
+        principal_cache.pop(user_id)
+
+
 def hash_password(password: str) -> str:
     return cast(str, pwd_context.hash(password))
 
@@ -36,7 +67,25 @@ def verify_password(plain: str, hashed: str) -> bool:
     return cast(bool, pwd_context.verify(plain, hashed))
 
 
+class PasswordHasher(BoundedExecutor):
+    async def hash(self, password: str) -> str:
+        return cast(str, await self.run(hash_password, password))
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return cast(bool, await self.run(verify_password, plain, hashed))
+
+
+password_hasher = PasswordHasher(
+    "bcrypt",
+    workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_MAX_QUEUE,
+    use_processes=PASSWORD_HASH_EXECUTOR == "process",
+)
+
+
 def create_access_token(data: dict[str, Any]) -> str:
+    """data: sub — id пользователя, ver — его token_version; токены
+    с устаревшей версией отклоняются."""
     to_encode: dict[str, Any] = data.copy()
     to_encode["sub"] = str(to_encode["sub"])
     expire = datetime.now(timezone.utc) + timedelta(
@@ -46,11 +95,53 @@ def create_access_token(data: dict[str, Any]) -> str:
     return cast(str, encode(to_encode, SECRET_KEY, algorithm=ALGORITHM))
 
 
+async def _load_principal(db: AsyncSession, user_id: int) -> Principal | None:
+    result = await db.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.role,
+            User.token_version,
+            User.created_at,
+        ).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    class_ids = await db.execute(
+        select(ClassMember.class_id).where(ClassMember.user_id == user_id)
+    )
+    return Principal(
+        id=row.id,
+        username=row.username,
+        email=row.email,
+        role=row.role,
+        token_version=row.token_version or 0,
+        created_at=row.created_at,
+        class_ids=tuple(class_ids.scalars().all()),
+    )
+
+
+async def _cached_principal(
+    db: AsyncSession, user_id: int, version: int
+) -> Principal | None:
+    principal = principal_cache.get(user_id)
+    # Версия в токене новее закэшированной: пароль сменили через другой
+    # воркер, и его invalidate_principal сюда не дошёл.
+    if principal is None or principal.token_version < version:
+        principal = await _load_principal(db, user_id)
+        if principal is not None:
+            principal_cache.set(principal.id, principal)
+    return principal
+
+
 async def get_current_user(
     db: Annotated[AsyncSession, Depends(get_db)],
     bearer_token: Annotated[str | None, Depends(oauth2_scheme)] = None,
     access_token: Annotated[str | None, Cookie()] = None,
-) -> User:
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Не удалось проверить токен",
@@ -70,17 +161,20 @@ async def get_current_user(
     except InvalidTokenError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
-    if user is None:
+    # Токены без версии выданы до её появления в JWT.
+    version = payload.get("ver", 0)
+    if not isinstance(version, int):
+        raise credentials_exception
+    principal = await _cached_principal(db, int(user_id), version)
+    if principal is None or principal.token_version != version:
         raise credentials_exception
-    return user
+    return principal
 
 
 def require_role(*roles: str) -> Callable[..., Any]:
     async def role_checker(
-        current_user: Annotated[User, Depends(get_current_user)],
-    ) -> User:
+        current_user: Annotated[Principal, Depends(get_current_user)],
+    ) -> Principal:
         if current_user.role not in roles:
             raise HTTPException(status_code=403, detail="Недостаточно прав")
         return current_user
@@ -0,0 +1,263 @@
+"""EXPLAIN всех запросов репозиториев на наполненной базе.
+
+    python -m backend.bench.seed
+    python -m backend.bench.explain --min-rows 1000 --output explain.json
+
+Скрипт вызывает методы чтения репозиториев на реальных id из базы,
+перехватывает выполненный SQL и прогоняет каждый уникальный SELECT через
+EXPLAIN. Полные просмотры таблиц печатаются как ПОЛНЫЙ ПРОСМОТР; код
+выхода 1, если такие нашлись.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import sys
+from typing import Any
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.instrumentation import fingerprint
+from backend.database import async_session, engine
+from backend.domain.models import Solution, User, Variant
+from backend.repositories.class_repo import ClassRepository
+from backend.repositories.solution_repo import SolutionRepository
+from backend.repositories.task_repo import TaskRepository
+from backend.repositories.user_repo import UserRepository
+from backend.repositories.variant_repo import VariantRepository
+from backend.schemas.stats import HistoryFilter
+
+
+@dataclass
+class Sample:
+    """Id из базы, на которых вызываются методы репозиториев."""
+
+    user_id: int
+    username: str
+    email: str
+    task_ids: list[int]
+    teacher_id: int
+    class_id: int
+    variant_id: int
+
+
+@dataclass
+class Captured:
+    statement: str
+    parameters: Any
+    plan: list[dict[str, Any]] = field(default_factory=list)
+    full_scans: list[str] = field(default_factory=list)
+
+
+@contextmanager
+def capture_statements(target: Engine) -> Iterator[dict[str, Captured]]:
+    """Собирает уникальные по отпечатку SELECT внутри блока."""
+    captured: dict[str, Captured] = {}
+
+    def listener(
+        conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any
+    ) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(
+                fingerprint(statement), Captured(statement, parameters)
+            )
+
+    event.listen(target, "before_cursor_execute", listener)
+    try:
+        yield captured
+    finally:
+        event.remove(target, "before_cursor_execute", listener)
+
+
+def _derived(table: str) -> bool:
+    # Подзапросы: anon_N в SQLite, <derivedN> в MySQL.
+    return table.startswith(("anon_", "<"))
+
+
+def full_scans(
+    dialect: str, plan: Sequence[dict[str, Any]], min_rows: int = 0
+) -> list[str]:
+    """Таблицы, которые план читает целиком."""
+    if dialect == "sqlite":
+        # «SCAN t» без индекса; «SCAN t USING INDEX» — обход индекса.
+        tables = [
+            row["detail"].split()[1]
+            for row in plan
+            if row["detail"].startswith("SCAN ")
+            and "INDEX" not in row["detail"]
+        ]
+    else:
+        tables = [
+            str(row["table"])
+            for row in plan
+            if row.get("type") == "ALL" and (row.get("rows") or 0) >= min_rows
+        ]
+    return [t for t in tables if not _derived(t)]
+
+
+async def explain(db: AsyncSession, item: Captured, min_rows: int = 0) -> None:
+    conn = await db.connection()
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    result = await conn.exec_driver_sql(
+        prefix + item.statement, item.parameters
+    )
+    item.plan = [dict(row) for row in result.mappings()]
+    item.full_scans = full_scans(dialect, item.plan, min_rows)
+
+
+async def load_sample(db: AsyncSession) -> Sample:
+    """Самый активный ученик, его задания и класс с вариантом."""
+    user_id = (
+        await db.execute(
+            select(Solution.user_id)
+            .group_by(Solution.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    variant = (
+        await db.execute(
+            select(Variant.id, Variant.class_id, Variant.created_by)
+            .where(Variant.class_id.is_not(None))
+            .limit(1)
+        )
+    ).one_or_none()
+    if user_id is None or variant is None:
+        raise SystemExit("Нет данных: сначала запустите backend.bench.seed")
+
+    user = (
+        await db.execute(
+            select(User.username, User.email).where(User.id == user_id)
+        )
+    ).one()
+    task_ids = (
+        await db.execute(
+            select(Solution.task_id)
+            .where(Solution.user_id == user_id)
+            .distinct()
+            .limit(20)
+        )
+    ).scalars()
+    return Sample(
+        user_id=user_id,
+        username=user.username,
+        email=user.email,
+        task_ids=list(task_ids),
+        teacher_id=variant.created_by,
+        class_id=variant.class_id,
+        variant_id=variant.id,
+    )
+
+
+async def _tasks(db: AsyncSession, s: Sample) -> None:
+    repo = TaskRepository(db)
+    await repo.get_by_id(s.task_ids[0])
+    await repo.get_many_by_ids(s.task_ids)
+    await repo.get_paginated(page=3, per_page=20)
+    await repo.get_paginated(page=1, per_page=20, task_type=5)
+    await repo.get_paginated(page=1, per_page=20, filter="no_answer")
+    await repo.get_paginated(page=1, per_page=20, search="уравнение")
+    await repo.get_cursor_page("", per_page=20, task_type=5, with_total=True)
+
+
+async def _solutions(db: AsyncSession, s: Sample) -> None:
+    repo = SolutionRepository(db)
+    task_id = s.task_ids[0]
+    await repo.get_latest_for_user_task(s.user_id, task_id)
+    await repo.get_latest_for_user_task(s.user_id, task_id, is_correct=True)
+    await repo.get_user_task_solutions(s.user_id, task_id)
+    await repo.get_all_for_task(task_id)
+    await repo.get_latest_for_tasks(s.user_id, s.task_ids)
+    await repo.get_progress(s.user_id, s.task_ids)
+    await repo.get_history_page(s.user_id, HistoryFilter(), limit=50)
+    await repo.get_history_page(
+        s.user_id, HistoryFilter(task_type=5, is_correct=True), limit=50
+    )
+    await repo.get_class_matrix(s.class_id, s.task_ids)
+
+
+async def _users_and_classes(db: AsyncSession, s: Sample) -> None:
+    users = UserRepository(db)
+    await users.get_by_id(s.user_id)
+    await users.get_by_username(s.username)
+    await users.get_by_email(s.email)
+    await users.get_many_by_ids([s.user_id, s.teacher_id])
+    await users.get_stats(s.user_id)
+    await users.get_stats_with_types(s.user_id)
+    await users.get_type_stats(s.user_id)
+
+    classes = ClassRepository(db)
+    await classes.get_by_id(s.class_id)
+    await classes.get_for_teacher(s.teacher_id)
+    await classes.get_for_user(s.user_id)
+    class_ids = await classes.get_user_class_ids(s.user_id)
+    await classes.get_member(s.class_id, s.user_id)
+    await classes.get_students_in_class(s.class_id)
+
+    variants = VariantRepository(db)
+    await variants.get_by_id(s.variant_id)
+    await variants.get_by_creator(s.teacher_id)
+    await variants.get_by_class_ids(class_ids or [s.class_id])
+
+
+async def run_explain(db: AsyncSession, min_rows: int = 0) -> list[Captured]:
+    """Вызывает методы чтения репозиториев и объясняет их SQL."""
+    sample = await load_sample(db)
+    conn = await db.connection()
+    with capture_statements(conn.engine.sync_engine) as captured:
+        await _tasks(db, sample)
+        await _solutions(db, sample)
+        await _users_and_classes(db, sample)
+
+    items = list(captured.values())
+    for item in items:
+        await explain(db, item, min_rows)
+    return items
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=1000,
+        help="MySQL: не считать полным просмотром таблицы меньше этого",
+    )
+    parser.add_argument("--output", default=None)
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = _parse_args()
+    try:
+        async with async_session() as db:
+            items = await run_explain(db, args.min_rows)
+    finally:
+        await engine.dispose()
+
+    flagged = [item for item in items if item.full_scans]
+    for item in flagged:
+        tables = ", ".join(item.full_scans)
+        print(f"ПОЛНЫЙ ПРОСМОТР {tables}: {fingerprint(item.statement)}")
+    print(f"Запросов: {len(items)}, с полным просмотром: {len(flagged)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                [asdict(item) for item in items],
+                f,
+                ensure_ascii=False,
+                indent=2,
+                default=str,
+            )
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
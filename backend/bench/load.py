@@ -0,0 +1,308 @@
+"""Нагрузочный прогон горячих эндпоинтов API.
+
+    python -m backend.bench.load --base-url http://127.0.0.1:8000 \
+        --concurrency 50 --duration 60 --output run.json \
+        --baseline baseline.json
+
+Токены выпускаются локально, поэтому SECRET_KEY должен совпадать с
+сервером.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import io
+import json
+import math
+import random
+import sys
+import time
+from typing import Any
+
+from PIL import Image
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth import create_access_token
+from backend.bench.seed import BENCH_PREFIX
+from backend.database import async_session, engine
+from backend.domain.models import Task, User
+
+_SEARCH_TERMS = ("уравнение", "площадь трапеции", "вероятность", "логарифм")
+
+
+@dataclass
+class BenchContext:
+    task_ids: list[int]
+    tokens: list[str]
+    rng: random.Random = field(default_factory=random.Random)
+    image: bytes = b""
+
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+ScenarioFn = Callable[[httpx.AsyncClient, BenchContext], Awaitable[int]]
+
+
+async def _list_tasks(client: httpx.AsyncClient, ctx: BenchContext) -> int:
+    params: dict[str, Any] = {"page": ctx.rng.randint(1, 50), "per_page": 20}
+    roll = ctx.rng.random()
+    if roll < 0.3:
+        params["task_type"] = ctx.rng.randint(1, 19)
+    elif roll < 0.5:
+        params["search"] = ctx.rng.choice(_SEARCH_TERMS)
+    resp = await client.get("/api/tasks", params=params)
+    return resp.status_code
+
+
+async def _check_answer(client: httpx.AsyncClient, ctx: BenchContext) -> int:
+    resp = await client.post(
+        "/api/solutions/check",
+        json={
+            "task_id": ctx.rng.choice(ctx.task_ids),
+            "answer": str(ctx.rng.randint(-100, 1000)),
+        },
+        headers=ctx.headers(),
+    )
+    return resp.status_code
+
+
+async def _variants(client: httpx.AsyncClient, ctx: BenchContext) -> int:
+    resp = await client.get("/api/variants", headers=ctx.headers())
+    return resp.status_code
+
+
+async def _profile_stats(client: httpx.AsyncClient, ctx: BenchContext) -> int:
+    resp = await client.get("/api/profile/stats", headers=ctx.headers())
+    return resp.status_code
+
+
+async def _upload(client: httpx.AsyncClient, ctx: BenchContext) -> int:
+    headers = ctx.headers()
+    draft = await client.post(
+        "/api/solutions",
+        json={"task_id": ctx.rng.choice(ctx.task_ids), "content": []},
+        headers=headers,
+    )
+    if draft.status_code != 200:
+        return draft.status_code
+    resp = await client.post(
+        f"/api/solutions/upload/{draft.json()['id']}",
+        files={"file": ("bench.png", ctx.image, "image/png")},
+        headers=headers,
+    )
+    return resp.status_code
+
+
+# Веса приблизительно повторяют долю эндпоинтов в реальном трафике.
+SCENARIOS: dict[str, tuple[ScenarioFn, int]] = {
+    "tasks": (_list_tasks, 40),
+    "check": (_check_answer, 30),
+    "variants": (_variants, 10),
+    "profile_stats": (_profile_stats, 15),
+    "upload": (_upload, 5),
+}
+
+
+@dataclass
+class _Samples:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Процентиль по методу ближайшего ранга; values отсортирован."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(samples: _Samples, elapsed: float) -> dict[str, float]:
+    latencies = sorted(samples.latencies)
+    count = len(latencies)
+    return {
+        "count": count,
+        "errors": samples.errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / count * 1000, 2) if count else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    ctx: BenchContext,
+    scenarios: list[str],
+    concurrency: int = 20,
+    duration: float | None = 30.0,
+    requests: int | None = None,
+) -> dict[str, Any]:
+    """Гоняет сценарии из concurrency корутин до duration или requests."""
+    names = list(scenarios)
+    weights = [SCENARIOS[n][1] for n in names]
+    samples = {n: _Samples() for n in names}
+    deadline = time.perf_counter() + duration if duration else None
+    budget = [requests] if requests is not None else None
+
+    def more() -> bool:
+        if budget is not None:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+        return deadline is None or time.perf_counter() < deadline
+
+    async def worker() -> None:
+        while more():
+            name = ctx.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = await SCENARIOS[name][0](client, ctx)
+            except httpx.HTTPError:
+                status = 599
+            samples[name].latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                samples[name].errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = _Samples(
+        latencies=[x for s in samples.values() for x in s.latencies],
+        errors=sum(s.errors for s in samples.values()),
+    )
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "scenarios": {
+            n: summarize(s, elapsed) for n, s in samples.items() if s.latencies
+        },
+        "total": summarize(total, elapsed),
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """Возвращает регрессии p95/p99 и пропускной способности выше
+    threshold процентов."""
+    regressions = []
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if before[metric] and now[metric] > before[metric] * (
+                1 + threshold / 100
+            ):
+                regressions.append(
+                    f"{name}.{metric}: {before[metric]} -> {now[metric]}"
+                )
+        if before["rps"] and now["rps"] < before["rps"] * (
+            1 - threshold / 100
+        ):
+            regressions.append(f"{name}.rps: {before['rps']} -> {now['rps']}")
+    return regressions
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (1600, 1200), (200, 220, 240)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+async def load_context(
+    db: AsyncSession, users: int = 1000, seed: int = 1
+) -> BenchContext:
+    task_ids = list(
+        (
+            await db.execute(
+                select(Task.id).where(Task.fipi_id.startswith("BENCH-"))
+            )
+        ).scalars()
+    )
+    user_ids = list(
+        (
+            await db.execute(
+                select(User.id).where(
+                    User.username.startswith(
+                        f"{BENCH_PREFIX}_", autoescape=True
+                    )
+                )
+            )
+        ).scalars()
+    )
+    rng = random.Random(seed)
+    user_ids = rng.sample(user_ids, min(users, len(user_ids)))
+    if not task_ids or not user_ids:
+        raise SystemExit("Нет данных: сначала запустите backend.bench.seed")
+    return BenchContext(
+        task_ids=task_ids,
+        tokens=[create_access_token({"sub": uid}) for uid in user_ids],
+        rng=rng,
+        image=_png(),
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="через запятую"
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--output", default="bench-result.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="допуск, %%"
+    )
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = _parse_args()
+    try:
+        async with async_session() as db:
+            ctx = await load_context(db, users=args.users)
+    finally:
+        await engine.dispose()
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30.0
+    ) as client:
+        report = await run_load(
+            client,
+            ctx,
+            args.scenarios.split(","),
+            concurrency=args.concurrency,
+            duration=None if args.requests else args.duration,
+            requests=args.requests,
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report["total"], ensure_ascii=False))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,371 @@
+"""Наполнение БД синтетическими данными для нагрузочных прогонов.
+
+    python -m backend.bench.seed --tasks 30000 --users 100000 \
+        --solutions 3000000
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+import random
+import time
+from typing import Any, cast
+
+from sqlalchemy import Table, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.auth import hash_password
+from backend.database import Base, async_session, engine
+from backend.domain.models import (
+    ClassMember,
+    SchoolClass,
+    Solution,
+    Task,
+    User,
+    UserStats,
+    UserTaskProgress,
+    Variant,
+    VariantItem,
+)
+from backend.migrate import upgrade
+
+BENCH_PREFIX = "bench"
+BENCH_PASSWORD = "bench-password"
+
+_WORDS = (
+    "найдите значение выражения уравнение корень функции производная "
+    "интеграл вероятность треугольник окружность радиус площадь трапеции "
+    "логарифм синус косинус угол прямоугольник параллелограмм скорость "
+    "поезд бассейн прогрессия сумма членов наибольшее наименьшее отрезок "
+    "решите неравенство промежуток цилиндр конус объём куб призма"
+).split()
+
+
+@dataclass
+class SeedConfig:
+    tasks: int = 30_000
+    users: int = 100_000
+    solutions: int = 3_000_000
+    classes: int = 2_000
+    class_size: int = 30
+    variants: int = 5_000
+    variant_size: int = 20
+    teacher_share: float = 0.01
+    batch_size: int = 5_000
+    seed: int = 42
+
+
+@dataclass
+class SeedSummary:
+    tasks: int = 0
+    users: int = 0
+    solutions: int = 0
+    classes: int = 0
+    members: int = 0
+    variants: int = 0
+    variant_items: int = 0
+    elapsed: float = 0.0
+
+
+class _Writer:
+    """Копит строки и пишет их в таблицу пачками executemany."""
+
+    def __init__(self, db: AsyncSession, batch_size: int) -> None:
+        self._db = db
+        self._batch_size = batch_size
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+
+    async def add(self, model: type[Base], row: dict[str, Any]) -> None:
+        table = cast(Table, model.__table__)
+        rows = self._pending.setdefault(table.name, [])
+        rows.append(row)
+        if len(rows) >= self._batch_size:
+            await self._write(table)
+
+    async def _write(self, table: Table) -> None:
+        rows = self._pending.pop(table.name, [])
+        if rows:
+            await self._db.execute(insert(table), rows)
+
+    async def flush(self, *models: type[Base]) -> None:
+        for model in models:
+            await self._write(cast(Table, model.__table__))
+        await self._db.commit()
+
+
+async def _next_id(db: AsyncSession, model: type[Base]) -> int:
+    table = cast(Table, model.__table__)
+    return int(await db.scalar(select(func.max(table.c.id))) or 0) + 1
+
+
+def _task_text(rng: random.Random) -> str:
+    return " ".join(rng.choices(_WORDS, k=rng.randint(8, 30))).capitalize()
+
+
+def _attempts(
+    rng: random.Random, task_ids: list[int], per_user: int
+) -> Iterator[tuple[int, list[bool]]]:
+    """Для каждого выбранного задания — последовательность попыток."""
+    remaining = per_user
+    for task_id in rng.sample(task_ids, min(len(task_ids), per_user)):
+        if remaining <= 0:
+            return
+        tries = min(remaining, rng.choice((1, 1, 1, 2, 3)))
+        remaining -= tries
+        results = [rng.random() < 0.35 for _ in range(tries - 1)]
+        results.append(rng.random() < 0.6)
+        yield task_id, results
+
+
+async def _seed_tasks(
+    writer: _Writer, rng: random.Random, first_id: int, count: int
+) -> list[int]:
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        task_id = first_id + i
+        await writer.add(
+            Task,
+            {
+                "id": task_id,
+                "fipi_id": f"BENCH-{task_id:07}",
+                "guid": f"{BENCH_PREFIX}-{task_id}",
+                "task_type": rng.randint(1, 19),
+                "text": _task_text(rng),
+                "hint": "",
+                "answer": str(rng.randint(-100, 1000)),
+                "images": [],
+                "inline_images": [],
+                "tables": [],
+                "created_at": now,
+                "updated_at": now,
+            },
+        )
+    await writer.flush(Task)
+    return list(range(first_id, first_id + count))
+
+
+async def _seed_users(
+    writer: _Writer, config: SeedConfig, first_id: int
+) -> tuple[list[int], list[int]]:
+    hashed = hash_password(BENCH_PASSWORD)
+    teachers = max(1, int(config.users * config.teacher_share))
+    now = datetime.now(timezone.utc)
+    for i in range(config.users):
+        user_id = first_id + i
+        name = f"{BENCH_PREFIX}_{user_id}"
+        await writer.add(
+            User,
+            {
+                "id": user_id,
+                "username": name,
+                "email": f"{name}@bench.local",
+                "hashed_password": hashed,
+                "role": "teacher" if i < teachers else "student",
+                "token_version": 0,
+                "created_at": now,
+            },
+        )
+    await writer.flush(User)
+    ids = list(range(first_id, first_id + config.users))
+    return ids[:teachers], ids[teachers:]
+
+
+async def _seed_solutions(
+    writer: _Writer,
+    rng: random.Random,
+    user_ids: list[int],
+    task_ids: list[int],
+    total: int,
+) -> int:
+    per_user = max(1, total // max(1, len(user_ids)))
+    start = datetime.now(timezone.utc) - timedelta(days=180)
+    written = 0
+    for user_id in user_ids:
+        stats = {"attempts": 0, "correct": 0, "solved": 0, "streak": 0}
+        best = 0
+        moment = start + timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+        for task_id, results in _attempts(rng, task_ids, per_user):
+            solved_at = None
+            first_attempt_at = moment + timedelta(minutes=rng.randint(1, 600))
+            moment = first_attempt_at
+            for correct in results:
+                await writer.add(
+                    Solution,
+                    {
+                        "user_id": user_id,
+                        "task_id": task_id,
+                        "answer": "1",
+                        "is_correct": correct,
+                        "content": [],
+                        "created_at": moment,
+                        "updated_at": moment,
+                    },
+                )
+                stats["attempts"] += 1
+                stats["streak"] = stats["streak"] + 1 if correct else 0
+                best = max(best, stats["streak"])
+                if correct:
+                    stats["correct"] += 1
+                    if solved_at is None:
+                        solved_at = moment
+                        stats["solved"] += 1
+                moment += timedelta(minutes=rng.randint(1, 600))
+            await writer.add(
+                UserTaskProgress,
+                {
+                    "user_id": user_id,
+                    "task_id": task_id,
+                    "attempts": len(results),
+                    "first_attempt_at": first_attempt_at,
+                    "solved_at": solved_at,
+                },
+            )
+        written += stats["attempts"]
+        await writer.add(
+            UserStats,
+            {
+                "user_id": user_id,
+                "total_attempts": stats["attempts"],
+                "correct_attempts": stats["correct"],
+                "tasks_solved": stats["solved"],
+                "streak_current": stats["streak"],
+                "streak_max": best,
+                "last_activity": moment,
+                "stats_by_type": {},
+            },
+        )
+    await writer.flush(Solution, UserTaskProgress, UserStats)
+    return written
+
+
+async def _seed_classes(
+    db: AsyncSession,
+    writer: _Writer,
+    rng: random.Random,
+    config: SeedConfig,
+    teacher_ids: list[int],
+    student_ids: list[int],
+) -> tuple[list[int], int]:
+    first_id = await _next_id(db, SchoolClass)
+    members = 0
+    for i in range(config.classes):
+        class_id = first_id + i
+        teacher = rng.choice(teacher_ids)
+        await writer.add(
+            SchoolClass,
+            {
+                "id": class_id,
+                "name": f"{rng.randint(5, 11)}{rng.choice('АБВГ')}",
+                "created_by": teacher,
+                "created_at": datetime.now(timezone.utc),
+            },
+        )
+        await writer.add(
+            ClassMember,
+            {"class_id": class_id, "user_id": teacher, "role": "teacher"},
+        )
+        size = min(config.class_size, len(student_ids))
+        for student in rng.sample(student_ids, size):
+            await writer.add(
+                ClassMember,
+                {"class_id": class_id, "user_id": student, "role": "student"},
+            )
+        members += size + 1
+    await writer.flush(SchoolClass, ClassMember)
+    return list(range(first_id, first_id + config.classes)), members
+
+
+async def _seed_variants(
+    db: AsyncSession,
+    writer: _Writer,
+    rng: random.Random,
+    config: SeedConfig,
+    teacher_ids: list[int],
+    class_ids: list[int],
+    task_ids: list[int],
+) -> int:
+    first_id = await _next_id(db, Variant)
+    items = 0
+    for i in range(config.variants):
+        variant_id = first_id + i
+        await writer.add(
+            Variant,
+            {
+                "id": variant_id,
+                "title": f"Вариант {variant_id}",
+                "created_by": rng.choice(teacher_ids),
+                "class_id": rng.choice(class_ids) if class_ids else None,
+                "is_public": False,
+                "created_at": datetime.now(timezone.utc),
+            },
+        )
+        size = min(config.variant_size, len(task_ids))
+        for position, task_id in enumerate(rng.sample(task_ids, size)):
+            await writer.add(
+                VariantItem,
+                {
+                    "variant_id": variant_id,
+                    "task_id": task_id,
+                    "position": position,
+                },
+            )
+        items += size
+    await writer.flush(Variant, VariantItem)
+    return items
+
+
+async def seed(db: AsyncSession, config: SeedConfig) -> SeedSummary:
+    rng = random.Random(config.seed)
+    writer = _Writer(db, config.batch_size)
+    summary = SeedSummary()
+    started = time.perf_counter()
+
+    task_ids = await _seed_tasks(
+        writer, rng, await _next_id(db, Task), config.tasks
+    )
+    teacher_ids, student_ids = await _seed_users(
+        writer, config, await _next_id(db, User)
+    )
+    summary.solutions = await _seed_solutions(
+        writer, rng, student_ids, task_ids, config.solutions
+    )
+    class_ids, summary.members = await _seed_classes(
+        db, writer, rng, config, teacher_ids, student_ids
+    )
+    summary.variant_items = await _seed_variants(
+        db, writer, rng, config, teacher_ids, class_ids, task_ids
+    )
+
+    summary.tasks = len(task_ids)
+    summary.users = config.users
+    summary.classes = len(class_ids)
+    summary.variants = config.variants
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+def _parse_args() -> SeedConfig:
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description=__doc__)
+    for name, value in asdict(defaults).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(value), default=value
+        )
+    return SeedConfig(**vars(parser.parse_args()))
+
+
+async def main() -> None:
+    config = _parse_args()
+    try:
+        await asyncio.to_thread(upgrade)
+        async with async_session() as db:
+            summary = await seed(db, config)
+        print(summary)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,182 @@
+"""Микробенчмарки чистых функций горячих путей.
+
+Не входят в основной прогон тестов; запуск и сравнение с базовым
+прогоном — make bench-micro-baseline и make bench-micro (см. Makefile).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import io
+import random
+from typing import Any, cast
+
+from PIL import Image
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.bench.seed import _WORDS
+from backend.domain.models import ClassMember, SchoolClass, Task, User, Variant
+from backend.image_utils import (
+    _prepare_mode,
+    _resize_if_needed,
+    compress_image,
+)
+from backend.repositories.class_repo import ClassRepository
+from backend.repositories.solution_repo import SolutionRepository
+from backend.repositories.task_repo import TaskRepository
+from backend.repositories.user_repo import UserRepository
+from backend.repositories.variant_repo import VariantRepository
+from backend.schemas.task import TaskResponse
+from backend.services.class_service import ClassService
+from backend.services.solution_service import SolutionService
+from backend.services.variant_service import VariantService
+
+# Сервисам нужна только логика преобразования, сессия не используется.
+_NO_DB = cast(AsyncSession, None)
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+rng = random.Random(7)
+
+
+def _task(task_id: int) -> Task:
+    attempts = rng.randint(0, 5000)
+    return Task(
+        id=task_id,
+        fipi_id=f"BENCH-{task_id:07}",
+        guid=f"bench-{task_id}",
+        task_type=rng.randint(1, 19),
+        text=" ".join(rng.choices(_WORDS, k=rng.randint(8, 30))),
+        answer=str(rng.randint(-100, 1000)),
+        images=[
+            f"/static/{task_id}/{i}.png" for i in range(rng.randint(0, 2))
+        ],
+        inline_images=[],
+        tables=[],
+        likes=rng.randint(0, 100),
+        dislikes=rng.randint(0, 20),
+        total_attempts=attempts,
+        solved_count=rng.randint(0, attempts),
+    )
+
+
+TASKS = [_task(i) for i in range(1, 21)]
+
+ANSWERS = [
+    ("4", "4"),
+    ("-12,5", " -12.5 "),
+    ("0.25", "0,3"),
+    ("Нет", "нет"),
+    ("3600", "3 600"),
+    (None, "1"),
+]
+
+
+def _image(size: tuple[int, int], mode: str, fmt: str) -> bytes:
+    # Шум вместо заливки, иначе кодеки сжимают картинку мгновенно.
+    raw = rng.randbytes(size[0] * size[1] * len(mode))
+    buf = io.BytesIO()
+    Image.frombytes(mode, size, raw).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="module")
+def photo() -> bytes:
+    # Фото решения с телефона: больше MAX_WIDTH, поэтому уменьшается.
+    return _image((2400, 1800), "RGB", "JPEG")
+
+
+@pytest.fixture(scope="module")
+def screenshot() -> bytes:
+    return _image((1280, 800), "RGBA", "PNG")
+
+
+def test_is_answer_correct(benchmark: Any) -> None:
+    service = SolutionService(
+        SolutionRepository(_NO_DB),
+        TaskRepository(_NO_DB),
+        UserRepository(_NO_DB),
+    )
+
+    def check_all() -> int:
+        return sum(service._is_answer_correct(e, a) for e, a in ANSWERS)
+
+    assert benchmark(check_all) == 3
+
+
+def test_compress_photo(benchmark: Any, photo: bytes) -> None:
+    data, name = benchmark(compress_image, photo, "solution.jpg")
+    assert name == "solution.jpg"
+    assert len(data) < len(photo)
+
+
+def test_compress_screenshot(benchmark: Any, screenshot: bytes) -> None:
+    _, name = benchmark(compress_image, screenshot, "screen.png")
+    assert name == "screen.png"
+
+
+def test_prepare_mode_flattens_alpha(
+    benchmark: Any, screenshot: bytes
+) -> None:
+    img = Image.open(io.BytesIO(screenshot))
+    img.load()
+    assert benchmark(_prepare_mode, img, ".jpg").mode == "RGB"
+
+
+def test_resize_if_needed(benchmark: Any, photo: bytes) -> None:
+    img = Image.open(io.BytesIO(photo))
+    img.load()
+    assert max(benchmark(_resize_if_needed, img).size) == 1920
+
+
+def test_task_response(benchmark: Any) -> None:
+    def validate() -> list[dict[str, Any]]:
+        return [TaskResponse.model_validate(t).model_dump() for t in TASKS]
+
+    result = benchmark(validate)
+    assert len(result) == len(TASKS)
+    assert all(0 <= r["difficulty"] <= 100 for r in result)
+
+
+def test_variant_response(benchmark: Any) -> None:
+    service = VariantService(
+        VariantRepository(_NO_DB),
+        TaskRepository(_NO_DB),
+        SolutionRepository(_NO_DB),
+    )
+    variant = Variant(
+        id=1,
+        title="Пробный вариант",
+        description="20 заданий первой части",
+        created_by=1,
+        class_id=1,
+        is_public=False,
+        created_at=_NOW,
+    )
+
+    result = benchmark(service._to_response, variant, TASKS)
+    assert len(result.tasks) == len(TASKS)
+
+
+def test_class_response(benchmark: Any) -> None:
+    service = ClassService(ClassRepository(_NO_DB), UserRepository(_NO_DB))
+    members = []
+    for i in range(1, 32):
+        user = User(
+            id=i,
+            username=f"student_{i}",
+            email=f"student_{i}@example.com",
+        )
+        role = "teacher" if i == 1 else "student"
+        members.append(ClassMember(id=i, user_id=i, user=user, role=role))
+    sc = SchoolClass(
+        id=1,
+        name="11А",
+        description=None,
+        created_by=1,
+        created_at=_NOW,
+        members=members,
+    )
+
+    result = benchmark(service._to_response, sc)
+    assert len(result.members) == 31
@@ -0,0 +1,60 @@
+"""Заглушка Cloudflare siteverify для тестов и нагрузочных прогонов.
+
+    python -m backend.bench.turnstile_stub --port 8081 --delay 0.05
+
+и на сервере API: TURNSTILE_VERIFY_URL=http://127.0.0.1:8081/siteverify.
+Токен "fail" проверку не проходит, остальные проходят один раз, как у
+Cloudflare; delay имитирует задержку ответа.
+"""
+
+import argparse
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+import uvicorn
+
+FAILING_TOKEN = "fail"
+
+
+def create_app(delay: float = 0.0) -> Starlette:
+    used: set[str] = set()
+
+    async def siteverify(request: Request) -> JSONResponse:
+        form = await request.form()
+        if delay:
+            await asyncio.sleep(delay)
+        if not form.get("secret"):
+            return JSONResponse(
+                {"success": False, "error-codes": ["missing-input-secret"]}
+            )
+        token = str(form.get("response", ""))
+        if token == FAILING_TOKEN:
+            return JSONResponse(
+                {"success": False, "error-codes": ["invalid-input-response"]}
+            )
+        if token in used:
+            return JSONResponse(
+                {"success": False, "error-codes": ["timeout-or-duplicate"]}
+            )
+        used.add(token)
+        return JSONResponse({"success": True, "error-codes": []})
+
+    return Starlette(
+        routes=[Route("/siteverify", siteverify, methods=["POST"])]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.delay), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Фоновая задача, которая раз в interval секунд сбрасывает буфер."""
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[], Awaitable[Any]],
+        interval: float,
+        flush_on_stop: bool = True,
+    ) -> None:
+        self.name = name
+        self.interval = interval
+        self.flush_on_stop = flush_on_stop
+        self._flush = flush
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._flush()
+            except Exception:
+                logger.exception("Ошибка фоновой задачи %s", self.name)
+
+    async def flush(self) -> None:
+        await self._flush()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.flush_on_stop:
+            await self._flush()
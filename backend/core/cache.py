@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import time
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Процессный LRU-кэш с ограничением по времени жизни записей."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """LRU-кэш сериализованных ответов с лимитами на число записей и
+    суммарный объём.
+
+    Записи привязаны к версии данных: bump() делает все прежние ответы
+    недоступными, а ответ, собранный до bump(), в кэш уже не попадёт.
+    Правки из других процессов приходят через observe(): версия из БД
+    сверяется не чаще раза в sync_interval секунд.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: int,
+        ttl: float,
+        sync_interval: float = 0.0,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.version = 0
+        self.shared_version: int | None = None
+        self._synced_at = float("-inf")
+        self.size_bytes = 0
+        self._data: OrderedDict[Hashable, tuple[float, CachedBody]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> CachedBody | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, cached = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._data.move_to_end(key)
+        return cached
+
+    def put(self, key: Hashable, body: bytes, version: int) -> CachedBody:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        cached = CachedBody(body=body, etag=f'"{digest}"')
+        if version != self.version or len(body) > self.max_bytes:
+            return cached
+        self._remove(key)
+        self._data[key] = (time.monotonic() + self.ttl, cached)
+        self.size_bytes += len(body)
+        while len(self._data) > self.maxsize or (
+            self.size_bytes > self.max_bytes
+        ):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size_bytes -= len(evicted.body)
+        return cached
+
+    def discard(self, key: Hashable) -> None:
+        """Убирает одну запись. В отличие от bump() не отсекает ответ,
+        который собирается прямо сейчас: его устаревание ограничено ttl."""
+        self._remove(key)
+
+    def bump(self) -> None:
+        self.version += 1
+        self.clear()
+
+    def sync_due(self) -> bool:
+        return time.monotonic() - self._synced_at >= self.sync_interval
+
+    def observe(self, shared_version: int) -> None:
+        self._synced_at = time.monotonic()
+        if shared_version == self.shared_version:
+            return
+        if self.shared_version is not None:
+            self.bump()
+        self.shared_version = shared_version
+
+    def reset(self) -> None:
+        self.clear()
+        self.shared_version = None
+        self._synced_at = float("-inf")
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[1].body)
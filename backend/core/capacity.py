@@ -0,0 +1,67 @@
+import math
+import os
+from pathlib import Path
+
+# 0 — число воркеров выбирает backend.serve; воркеры получают итог через
+# ту же переменную окружения.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Соединений с БД на все воркеры вместе; у MariaDB по умолчанию
+# max_connections = 151, остаток — миграциям, импорту и консоли.
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", "120"))
+
+# Меньше этого воркеру не хватит соединений на обычную нагрузку.
+MIN_WORKER_CONNECTIONS = 10
+# Потолок на процесс: 25 + 50, как у единственного процесса раньше.
+MAX_WORKER_CONNECTIONS = 75
+
+
+def _cgroup_quota(root: Path) -> float | None:
+    """Лимит CPU контейнера в ядрах: cgroup v2, затем v1."""
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = (root / "cpu" / "cpu.cfs_quota_us").read_text().strip()
+        period = (root / "cpu" / "cpu.cfs_period_us").read_text().strip()
+    except OSError:
+        return None
+    if int(quota) <= 0:
+        return None
+    return int(quota) / int(period)
+
+
+def available_cpus(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    """Ядра, доступные процессу: os.cpu_count() видит все ядра хоста,
+    а не affinity и квоту контейнера."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_quota(Path(cgroup_root))
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def worker_count(cpus: int, budget: int) -> int:
+    """По воркеру на ядро, пока бюджет соединений это позволяет."""
+    return max(1, min(cpus, budget // MIN_WORKER_CONNECTIONS))
+
+
+def pool_limits(workers: int, budget: int) -> tuple[int, int]:
+    """pool_size и max_overflow одного воркера: треть соединений держится
+    открытыми, остальное — запас на пики."""
+    per_worker = min(budget // max(1, workers), MAX_WORKER_CONNECTIONS)
+    per_worker = max(2, per_worker)
+    pool_size = per_worker // 3 or 1
+    return pool_size, per_worker - pool_size
+
+
+def executor_workers(budget: int, workers: int, cap: int) -> int:
+    """Потоков или процессов пула на воркер: бюджет на все воркеры
+    делится поровну, но не больше cap и не меньше одного."""
+    return max(1, min(cap, budget // max(1, workers)))
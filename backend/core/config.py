@@ -1,5 +1,13 @@
+from ipaddress import ip_network
 import os
 import secrets
+import tempfile
+
+from backend.core.capacity import (
+    WEB_CONCURRENCY,
+    available_cpus,
+    executor_workers,
+)
 
 ENV = os.getenv("ENV", "production")
 IS_PROD = ENV == "production"
@@ -19,3 +27,103 @@ CORS_ORIGINS: list[str] = [
 ]
 
 UPLOAD_DIR = "uploads"
+
+# Другие воркеры узнают о смене роли или пароля не позже чем через TTL.
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "5"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+# PASSWORD_HASH_WORKERS и IMAGE_WORKERS — на все воркеры backend.serve
+# вместе, по умолчанию по числу доступных ядер; каждый воркер берёт долю.
+CPUS = available_cpus()
+PASSWORD_HASH_WORKERS = executor_workers(
+    int(os.getenv("PASSWORD_HASH_WORKERS", str(CPUS))),
+    WEB_CONCURRENCY or 1,
+    cap=4,
+)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+
+IMAGE_WORKERS = executor_workers(
+    int(os.getenv("IMAGE_WORKERS", str(CPUS))), WEB_CONCURRENCY or 1, cap=2
+)
+IMAGE_MAX_QUEUE = int(os.getenv("IMAGE_MAX_QUEUE", "32"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+SEARCH_REFRESH_INTERVAL = float(os.getenv("SEARCH_REFRESH_INTERVAL", "30"))
+
+TASK_TOTAL_CACHE_TTL = float(os.getenv("TASK_TOTAL_CACHE_TTL", "60"))
+# Правки заданий и импорт поднимают версию каталога в БД, и каждый
+# воркер сбрасывает кэш не позже чем через CATALOGUE_VERSION_POLL. Голоса
+# сбрасывают карточку задания только в своём воркере; в остальных, как
+# и счётчики попыток, которые обновляются фоном, — по TTL.
+TASK_RESPONSE_CACHE_TTL = float(os.getenv("TASK_RESPONSE_CACHE_TTL", "30"))
+CATALOGUE_VERSION_POLL = float(os.getenv("CATALOGUE_VERSION_POLL", "1"))
+TASK_RESPONSE_CACHE_SIZE = int(os.getenv("TASK_RESPONSE_CACHE_SIZE", "2048"))
+TASK_RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("TASK_RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+
+STATS_FLUSH_INTERVAL_MS = int(os.getenv("STATS_FLUSH_INTERVAL_MS", "500"))
+STATS_FLUSH_BATCH = int(os.getenv("STATS_FLUSH_BATCH", "1000"))
+
+VOTE_FLUSH_INTERVAL_MS = int(os.getenv("VOTE_FLUSH_INTERVAL_MS", "1000"))
+
+HISTORY_EXPORT_BATCH = int(os.getenv("HISTORY_EXPORT_BATCH", "1000"))
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+# 0 — бюджет не проверяется.
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "0"))
+SQL_STRICT = os.getenv("SQL_STRICT", "") == "1"
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+
+# Пустой токен — /api/metrics доступен без авторизации.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+# Любой URI хранилища библиотеки limits (redis://, memcached:// и т. п.).
+# По умолчанию — файл SQLite в памяти (/dev/shm), общий для воркеров
+# одной машины.
+_SHM = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+RATE_LIMIT_STORAGE = os.getenv(
+    "RATE_LIMIT_STORAGE", f"sqlite:///{_SHM}/exammath-ratelimit.db"
+)
+# Сюда воркеры backend.serve раз в METRICS_SNAPSHOT_INTERVAL секунд
+# выкладывают свои метрики, чтобы /api/metrics отдавал все процессы.
+METRICS_DIR = os.getenv("METRICS_DIR", f"{_SHM}/exammath-metrics")
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "5"))
+RATE_LIMIT_CHECK = os.getenv("RATE_LIMIT_CHECK", "60/minute")
+RATE_LIMIT_UPLOAD = os.getenv("RATE_LIMIT_UPLOAD", "20/minute")
+# Адреса, чьим X-Real-IP и X-Forwarded-For можно верить: nginx на хосте
+# приходит в контейнер с адреса шлюза docker-сети.
+TRUSTED_PROXIES = [
+    ip_network(net.strip())
+    for net in os.getenv(
+        "TRUSTED_PROXIES", "127.0.0.0/8,::1/128,172.16.0.0/12"
+    ).split(",")
+    if net.strip()
+]
+
+# Адрес можно подменить локальной заглушкой (backend.bench.turnstile_stub).
+TURNSTILE_VERIFY_URL = os.getenv(
+    "TURNSTILE_VERIFY_URL",
+    "https://challenges.cloudflare.com/turnstile/v0/siteverify",
+)
+TURNSTILE_CONNECT_TIMEOUT = float(os.getenv("TURNSTILE_CONNECT_TIMEOUT", "2"))
+TURNSTILE_READ_TIMEOUT = float(os.getenv("TURNSTILE_READ_TIMEOUT", "3"))
+# Что отвечать, когда Cloudflare недоступен: "closed" — отказ,
+# "open" — пропустить без капчи (лимиты запросов остаются).
+TURNSTILE_FAILURE_POLICY = os.getenv("TURNSTILE_FAILURE_POLICY", "closed")
+# Столько ошибок подряд размыкают предохранитель на COOLDOWN секунд.
+TURNSTILE_BREAKER_THRESHOLD = int(
+    os.getenv("TURNSTILE_BREAKER_THRESHOLD", "5")
+)
+TURNSTILE_BREAKER_COOLDOWN = float(
+    os.getenv("TURNSTILE_BREAKER_COOLDOWN", "30")
+)
+# Токен Turnstile живёт 300 секунд.
+TURNSTILE_VERDICT_TTL = float(os.getenv("TURNSTILE_VERDICT_TTL", "300"))
+TURNSTILE_VERDICT_CACHE_SIZE = int(
+    os.getenv("TURNSTILE_VERDICT_CACHE_SIZE", "10000")
+)
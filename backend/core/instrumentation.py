@@ -0,0 +1,186 @@
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+import logging
+import re
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.config import (
+    SQL_QUERY_BUDGET,
+    SQL_REPEAT_THRESHOLD,
+    SQL_STRICT,
+)
+
+logger = logging.getLogger(__name__)
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%s|__\[POSTCOMPILE_\w+\])\s*,?)+\)")
+_SPACES = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(statement: str) -> str:
+    """Нормализует SQL, чтобы одинаковые запросы с разными
+    параметрами совпадали."""
+    statement = _LITERAL.sub("?", statement)
+    statement = _IN_LIST.sub("(?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+@dataclass
+class QueryBudget:
+    limit: int
+    strict: bool
+
+    def exceeded(self, stats: "QueryStats") -> bool:
+        return bool(self.limit) and stats.count > self.limit
+
+
+query_budget = QueryBudget(limit=SQL_QUERY_BUDGET, strict=SQL_STRICT)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+    parent: "QueryStats | None" = None
+
+    def record(self, statement: str, duration: float) -> None:
+        sql = fingerprint(statement)
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.fingerprints[sql] += 1
+            stats = stats.parent
+
+    def repeated(
+        self, threshold: int = SQL_REPEAT_THRESHOLD
+    ) -> dict[str, int]:
+        return {
+            sql: n for sql, n in self.fingerprints.items() if n >= threshold
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(
+    conn: Connection, cursor: Any, statement: str, *args: Any
+) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(
+    conn: Connection, cursor: Any, statement: str, *args: Any
+) -> None:
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(context: Any) -> None:
+    started = (
+        context.connection.info.get("query_started")
+        if context.connection
+        else None
+    )
+    if started:
+        started.pop()
+
+
+@contextmanager
+def track_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    """Считает SQL-запросы внутри блока; budget ограничивает их число."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    if budget is not None and stats.count > budget:
+        raise QueryBudgetExceeded(
+            f"{stats.count} SQL-запросов при бюджете {budget}"
+        )
+
+
+class QueryStatsMiddleware:
+    """Собирает статистику SQL на запрос: заголовок Server-Timing и лог."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(parent=_current.get())
+        token = _current.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._check(scope, stats)
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, stats)
+
+    def _check(self, scope: Scope, stats: QueryStats) -> None:
+        if query_budget.strict and query_budget.exceeded(stats):
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {scope['path']}: {stats.count} "
+                f"SQL-запросов при бюджете {query_budget.limit}"
+            )
+
+    def _log(self, scope: Scope, stats: QueryStats) -> None:
+        repeated = stats.repeated()
+        warn = repeated or query_budget.exceeded(stats)
+        level = logging.WARNING if warn else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(
+            level,
+            json.dumps(
+                {
+                    "event": "sql_stats",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "queries": stats.count,
+                    "db_ms": round(stats.duration * 1000, 1),
+                    "repeated": repeated,
+                },
+                ensure_ascii=False,
+            ),
+        )
@@ -0,0 +1,344 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+import json
+import math
+import os
+from pathlib import Path
+import time
+from typing import TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Минимальная реализация текстового формата Prometheus без внешних
+# зависимостей. Метрики живут в памяти процесса.
+
+Labels = tuple[str, ...]
+Collector = Callable[[], dict[Labels, float]]
+# Сэмплы процесса по именам метрик.
+Snapshot = dict[str, list[str]]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_labels(names: Labels, values: Labels, **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _with_label(sample: str, name: str, value: str) -> str:
+    # Значение в конце строки без пробелов, а «}» в нём не бывает.
+    head, _, number = sample.rpartition(" ")
+    label = f'{name}="{value}"'
+    if head.endswith("}"):
+        head = f"{head[:-1]},{label}}}"
+    else:
+        head = f"{head}{{{label}}}"
+    return f"{head} {number}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]: ...
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> str:
+        return "\n".join([*self.header(), *self.samples()])
+
+
+class _Scalar(Metric):
+    """Значения задаются вручную или вычисляются collect при опросе."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels = (),
+        collect: Collector | None = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[Labels, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        values = self._collect() if self._collect else self._values
+        return values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        values = self._collect() if self._collect else self._values
+        for labels, value in sorted(values.items()):
+            yield (
+                f"{self.name}{_format_labels(self.labels, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Counter(_Scalar):
+    kind = "counter"
+
+
+class Gauge(_Scalar):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] = self._sums.get(labels, 0.0) + value
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def samples(self) -> Iterable[str]:
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            bounds = [*self.buckets, math.inf]
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = _format_labels(
+                    self.labels, labels, le=_format_value(bound)
+                )
+                yield f"{self.name}_bucket{le} {cumulative}"
+            suffix = _format_labels(self.labels, labels)
+            total = _format_value(self._sums[labels])
+            yield f"{self.name}_sum{suffix} {total}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Snapshot:
+        return {name: list(m.samples()) for name, m in self._metrics.items()}
+
+    def render(self, workers: Mapping[str, Snapshot] | None = None) -> str:
+        """workers — снимки процессов по id воркера: их сэмплы выводятся
+        с меткой worker. Без них — только этот процесс."""
+        if workers is None:
+            return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.extend(metric.header())
+            for worker, snapshot in sorted(workers.items()):
+                lines.extend(
+                    _with_label(sample, "worker", worker)
+                    for sample in snapshot.get(name, ())
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class WorkerSnapshots:
+    """Общий каталог снимков метрик воркеров backend.serve.
+
+    Реестр у каждого процесса свой, а запрос /api/metrics попадает в
+    любой воркер: каждый периодически пишет сюда свой снимок, а ответ
+    собирается из всех. Файлы завершившихся процессов удаляются.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f"{pid}.json"
+
+    def write(self, registry: Registry) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(os.getpid())
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(registry.snapshot()))
+        os.replace(tmp, path)
+
+    def collect(self, registry: Registry) -> dict[str, Snapshot]:
+        own = str(os.getpid())
+        workers = {own: registry.snapshot()}
+        for path in self.directory.glob("*.json"):
+            if path.stem == own or not path.stem.isdigit():
+                continue
+            if not _alive(int(path.stem)):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                workers[path.stem] = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+        return workers
+
+    def remove(self) -> None:
+        self._path(os.getpid()).unlink(missing_ok=True)
+
+
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "Запросы в обработке")
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Время обработки HTTP-запроса",
+        labels=("method", "route", "status"),
+    )
+)
+event_loop_lag = registry.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "Опоздание пробуждения event loop",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+)
+executor_task_duration = registry.register(
+    Histogram(
+        "executor_task_duration_seconds",
+        "Время выполнения задачи в пуле воркеров",
+        labels=("pool",),
+    )
+)
+answer_checks = registry.register(
+    Counter(
+        "answer_checks_total",
+        "Проверки ответов",
+        labels=("task_type", "result"),
+    )
+)
+turnstile_verifications = registry.register(
+    Counter(
+        "turnstile_verifications_total",
+        "Проверки капчи Turnstile",
+        labels=("result",),
+    )
+)
+
+
+class LoopLagProbe:
+    """Вызывается PeriodicTask: опоздание пробуждения и есть лаг loop."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._last: float | None = None
+
+    async def __call__(self) -> None:
+        now = time.monotonic()
+        if self._last is not None:
+            lag = now - self._last - self.interval
+            event_loop_lag.observe(max(lag, 0.0))
+        self._last = now
+
+
+class MetricsMiddleware:
+    """Считает запросы в обработке и длительность по шаблону маршрута."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            # Шаблон маршрута, а не сырой путь: иначе каждый id даёт
+            # отдельную серию.
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                path,
+                str(status),
+            )
@@ -0,0 +1,275 @@
+"""Лимиты запросов.
+
+Счётчики хранятся вне процесса, чтобы воркеры uvicorn делили их между
+собой. Алгоритм — sliding-window-counter: на ключ два счётчика (текущее
+и прошлое окно) вместо журнала всех попаданий.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from ipaddress import ip_address
+import logging
+from math import floor
+import os
+import sqlite3
+import time
+from typing import Any
+
+from jwt import InvalidTokenError, decode
+from limits.storage import Storage
+from limits.storage.base import (
+    SlidingWindowCounterSupport,
+    TimestampedSlidingWindow,
+)
+from slowapi import Limiter
+from starlette.requests import Request
+
+from backend.auth import ALGORITHM, SECRET_KEY
+from backend.core.config import RATE_LIMIT_STORAGE, TRUSTED_PROXIES
+
+logger = logging.getLogger(__name__)
+
+# Удалять просроченные счётчики раз в столько записей.
+PURGE_EVERY = 1000
+# Хранилище вызывается синхронно из event loop: дольше этого воркер не
+# ждёт блокировку файла, а пропускает запрос без учёта.
+BUSY_TIMEOUT = 0.02
+
+
+class SQLiteStorage(
+    Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow
+):
+    """Хранилище limits в файле SQLite: sqlite:///<путь>, sqlite:// —
+    в памяти процесса. Запись идёт под BEGIN IMMEDIATE, поэтому проверка
+    и увеличение счётчика атомарны и между процессами. Если файл занят
+    дольше BUSY_TIMEOUT, запрос пропускается (fail-open)."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        **options: Any,
+    ) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = (uri or "").partition("://")[2]
+        self.path = path.removeprefix("/") or ":memory:"
+        self.timeout = float(options.get("timeout", BUSY_TIMEOUT))
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+        self._writes = 0
+
+    @property
+    def base_exceptions(
+        self,
+    ) -> type[Exception] | tuple[type[Exception], ...]:
+        return sqlite3.Error
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Соединение не переживает fork: воркер открывает своё.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            # Счётчики не стоят fsync: после сбоя они просто обнулятся.
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _purge(self, db: sqlite3.Connection, now: float) -> None:
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            db.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+
+    def _incr(
+        self,
+        db: sqlite3.Connection,
+        key: str,
+        expiry: float,
+        amount: int,
+        now: float,
+    ) -> int:
+        self._purge(db, now)
+        row = db.execute(
+            "INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires_at > ? "
+            "THEN value + excluded.value ELSE excluded.value END, "
+            "expires_at = CASE WHEN expires_at > ? "
+            "THEN expires_at ELSE excluded.expires_at END "
+            "RETURNING value",
+            (key, amount, now + expiry, now, now),
+        ).fetchone()
+        return int(row[0])
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        with self._write() as db:
+            return self._incr(db, key, expiry, amount, time.time())
+
+    def decr(self, key: str, amount: int = 1) -> int:
+        with self._write() as db:
+            row = db.execute(
+                "UPDATE counters SET value = max(value - ?, 0) "
+                "WHERE key = ? AND expires_at > ? RETURNING value",
+                (amount, key, time.time()),
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def get(self, key: str) -> int:
+        row = self._db.execute(
+            "SELECT value FROM counters WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._db.execute(
+            "SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return float(row[0]) if row else now
+
+    def check(self) -> bool:
+        try:
+            self._db.execute("SELECT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self) -> int | None:
+        with self._write() as db:
+            return db.execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._write() as db:
+            db.execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def _window(
+        self,
+        db: sqlite3.Connection,
+        key: str,
+        expiry: int,
+        now: float,
+    ) -> tuple[int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        counts = dict(
+            db.execute(
+                "SELECT key, value FROM counters "
+                "WHERE key IN (?, ?) AND expires_at > ?",
+                (previous_key, current_key, now),
+            ).fetchall()
+        )
+        previous = int(counts.get(previous_key, 0))
+        current = int(counts.get(current_key, 0))
+        previous_ttl = 0.0
+        if previous:
+            previous_ttl = (1 - ((now - expiry) / expiry) % 1) * expiry
+        current_ttl = (1 - (now / expiry) % 1) * expiry + expiry
+        return previous, previous_ttl, current, current_ttl
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        try:
+            return self._acquire(key, limit, expiry, amount)
+        except sqlite3.OperationalError as e:
+            logger.warning("Лимит %s не проверен: %s", key, e)
+            return True
+
+    def _acquire(self, key: str, limit: int, expiry: int, amount: int) -> bool:
+        now = time.time()
+        with self._write() as db:
+            previous, previous_ttl, current, _ = self._window(
+                db, key, expiry, now
+            )
+            weighted = previous * previous_ttl / expiry + current
+            if floor(weighted) + amount > limit:
+                return False
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            # Счётчик окна нужен ещё одно окно как «прошлый».
+            self._incr(db, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> tuple[int, float, int, float]:
+        return self._window(self._db, key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        keys = self.sliding_window_keys(key, expiry, time.time())
+        with self._write() as db:
+            db.execute("DELETE FROM counters WHERE key IN (?, ?)", keys)
+
+
+def _trusted(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in net for net in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str:
+    """Адрес клиента за nginx. Заголовкам верим, только если запрос
+    пришёл от доверенного прокси, иначе их может подставить кто угодно."""
+    peer = request.client.host if request.client else "127.0.0.1"
+    if not _trusted(peer):
+        return peer
+    real_ip = request.headers.get("x-real-ip", "").strip()
+    if real_ip:
+        return real_ip
+    # Справа налево: первый адрес, добавленный не нашими прокси.
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed(forwarded.split(",")):
+        hop = hop.strip()
+        if hop and not _trusted(hop):
+            return hop
+    return peer
+
+
+def user_or_client_ip(request: Request) -> str:
+    """Ключ для эндпоинтов с авторизацией: пользователь из токена, чтобы
+    ученики одного класса за общим NAT не делили лимит. Токен уже
+    проверен зависимостью get_current_user, здесь он только читается."""
+    header = request.headers.get("authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = request.cookies.get("access_token", "")
+    try:
+        subject = decode(token, SECRET_KEY, algorithms=[ALGORITHM])["sub"]
+    except (InvalidTokenError, KeyError):
+        return client_ip(request)
+    return f"user:{subject}"
+
+
+limiter = Limiter(
+    key_func=client_ip,
+    storage_uri=RATE_LIMIT_STORAGE,
+    strategy="sliding-window-counter",
+)
@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+import time
+from typing import Any
+
+from fastapi import HTTPException
+
+from backend.core.metrics import executor_task_duration
+
+
+class BoundedExecutor:
+    """Пул воркеров с ограничением параллелизма и длины очереди."""
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queue: int,
+        use_processes: bool = False,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix=self.name
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(503, "Сервер перегружен, попробуйте позже")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            executor_task_duration.observe(
+                time.perf_counter() - started, self.name
+            )
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def warm_up(self) -> None:
+        """Поднимает потоки или процессы пула до первых запросов."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, int) for _ in range(self.workers))
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,14 +1,30 @@
 from backend.domain.models.class_ import ClassMember, SchoolClass
-from backend.domain.models.solution import Solution, SolutionFile
-from backend.domain.models.task import Task
-from backend.domain.models.user import User, UserStats
+from backend.domain.models.solution import (
+    AnswerEvent,
+    Solution,
+    SolutionFile,
+    UserTaskProgress,
+)
+from backend.domain.models.task import (
+    CatalogueVersion,
+    ImportManifest,
+    Task,
+    TaskImportHash,
+)
+from backend.domain.models.user import User, UserStats, UserTypeStats
 from backend.domain.models.variant import Variant, VariantItem
 
 __all__ = [
     "User",
     "UserStats",
+    "UserTypeStats",
     "Task",
+    "CatalogueVersion",
+    "TaskImportHash",
+    "ImportManifest",
     "Solution",
+    "AnswerEvent",
+    "UserTaskProgress",
     "SolutionFile",
     "Variant",
     "VariantItem",
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
@@ -28,9 +28,9 @@ class SchoolClass(Base):
     )
 
     members: Mapped[list[ClassMember]] = relationship(
-        "ClassMember", back_populates="school_class", lazy="selectin"
+        "ClassMember", back_populates="school_class", lazy="raise"
     )
-    creator: Mapped[User] = relationship("User", lazy="selectin")
+    creator: Mapped[User] = relationship("User", lazy="raise")
 
 
 class ClassMember(Base):
@@ -50,8 +50,14 @@ class ClassMember(Base):
     role: Mapped[str] = mapped_column(String(20), default="student")
 
     school_class: Mapped[SchoolClass] = relationship(
-        "SchoolClass", back_populates="members", lazy="selectin"
+        "SchoolClass", back_populates="members", lazy="raise"
     )
     user: Mapped[User] = relationship(
-        "User", back_populates="class_memberships", lazy="selectin"
+        "User", back_populates="class_memberships", lazy="raise"
+    )
+
+    __table_args__ = (
+        # get_user_class_ids читает только индекс.
+        Index("ix_class_members_user_class", "user_id", "class_id"),
+        Index("ix_class_members_class_role", "class_id", "role"),
     )
@@ -3,7 +3,15 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
@@ -15,12 +23,23 @@ if TYPE_CHECKING:
 
 class Solution(Base):
     __tablename__ = "solutions"
+    __table_args__ = (
+        Index(
+            "ix_solutions_user_task_created",
+            "user_id",
+            "task_id",
+            "created_at",
+        ),
+        # История решений: WHERE user_id ORDER BY created_at.
+        Index("ix_solutions_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
+    # Отдельный индекс по user_id не нужен: его покрывают составные.
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False, index=True
+        Integer, ForeignKey("users.id"), nullable=False
     )
     task_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("tasks.id"), nullable=False, index=True
@@ -38,13 +57,13 @@ class Solution(Base):
     )
 
     user: Mapped[User] = relationship(
-        "User", back_populates="solutions", lazy="selectin"
+        "User", back_populates="solutions", lazy="raise"
     )
     task: Mapped[Task] = relationship(
-        "Task", back_populates="solutions", lazy="selectin"
+        "Task", back_populates="solutions", lazy="raise"
     )
     files: Mapped[list[SolutionFile]] = relationship(
-        "SolutionFile", back_populates="solution", lazy="selectin"
+        "SolutionFile", back_populates="solution", lazy="raise"
     )
 
 
@@ -65,5 +84,42 @@ class SolutionFile(Base):
     )
 
     solution: Mapped[Solution] = relationship(
-        "Solution", back_populates="files", lazy="selectin"
+        "Solution", back_populates="files", lazy="raise"
+    )
+
+
+class UserTaskProgress(Base):
+    __tablename__ = "user_task_progress"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    task_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    first_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
+    solved_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+
+class AnswerEvent(Base):
+    __tablename__ = "answer_events"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    task_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    task_type: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    is_first_try: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    is_first_solve: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
     )
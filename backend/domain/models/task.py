@@ -7,6 +7,7 @@ from sqlalchemy import (
     JSON,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -30,7 +31,7 @@ class Task(Base):
         String(20), unique=True, index=True
     )
     guid: Mapped[str | None] = mapped_column(String(64))
-    task_type: Mapped[int] = mapped_column(Integer, default=0, index=True)
+    task_type: Mapped[int] = mapped_column(Integer, default=0)
     text: Mapped[str] = mapped_column(Text, nullable=False)
     hint: Mapped[str | None] = mapped_column(String(200))
     answer: Mapped[str | None] = mapped_column(String(100))
@@ -61,7 +62,30 @@ class Task(Base):
     )
 
     solutions: Mapped[list[Solution]] = relationship(
-        "Solution", back_populates="task", lazy="selectin"
+        "Solution", back_populates="task", lazy="raise"
+    )
+
+    __table_args__ = (
+        # Фильтр по типу и keyset-пагинация (task_type, id).
+        Index("ix_tasks_type_id", "task_type", "id"),
+        Index(
+            "ix_tasks_text_fulltext",
+            "text",
+            mysql_prefix="FULLTEXT",
+            mariadb_prefix="FULLTEXT",
+        ),
+    )
+
+
+class CatalogueVersion(Base):
+    """Одна строка: версия публичного каталога. Растёт в транзакциях,
+    меняющих задания, и по ней воркеры сбрасывают кэш ответов."""
+
+    __tablename__ = "catalogue_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
     )
 
 
@@ -88,3 +112,22 @@ class TaskVote(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "task_id", name="uq_task_vote_user_task"),
     )
+
+
+class TaskImportHash(Base):
+    __tablename__ = "task_import_hashes"
+
+    fipi_id: Mapped[str] = mapped_column(String(20), primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+
+class ImportManifest(Base):
+    __tablename__ = "import_manifests"
+
+    source: Mapped[str] = mapped_column(String(255), primary_key=True)
+    file_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    schema_revision: Mapped[str] = mapped_column(String(64), nullable=False)
+    imported_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc)
+    )
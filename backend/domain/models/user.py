@@ -33,13 +33,13 @@ class User(Base):
     )
 
     solutions: Mapped[list[Solution]] = relationship(
-        "Solution", back_populates="user", lazy="selectin"
+        "Solution", back_populates="user", lazy="raise"
     )
     stats: Mapped[UserStats | None] = relationship(
-        "UserStats", back_populates="user", uselist=False, lazy="selectin"
+        "UserStats", back_populates="user", uselist=False, lazy="raise"
     )
     class_memberships: Mapped[list[ClassMember]] = relationship(
-        "ClassMember", back_populates="user", lazy="selectin"
+        "ClassMember", back_populates="user", lazy="raise"
     )
 
 
@@ -58,8 +58,20 @@ class UserStats(Base):
     streak_current: Mapped[int] = mapped_column(Integer, default=0)
     streak_max: Mapped[int] = mapped_column(Integer, default=0)
     last_activity: Mapped[datetime | None] = mapped_column(DateTime)
+    # Больше не обновляется: статистика по типам живёт в user_type_stats.
     stats_by_type: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
 
     user: Mapped[User] = relationship(
-        "User", back_populates="stats", lazy="selectin"
+        "User", back_populates="stats", lazy="raise"
     )
+
+
+class UserTypeStats(Base):
+    __tablename__ = "user_type_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    task_type: Mapped[int] = mapped_column(Integer, primary_key=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    correct: Mapped[int] = mapped_column(Integer, default=0)
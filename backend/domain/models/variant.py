@@ -23,10 +23,10 @@ class Variant(Base):
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     created_by: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
+        Integer, ForeignKey("users.id"), nullable=False, index=True
     )
     class_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("school_classes.id"), nullable=True
+        Integer, ForeignKey("school_classes.id"), nullable=True, index=True
     )
     is_public: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -37,11 +37,11 @@ class Variant(Base):
         "VariantItem",
         back_populates="variant",
         order_by="VariantItem.position",
-        lazy="selectin",
+        lazy="raise",
     )
-    creator: Mapped[User] = relationship("User", lazy="selectin")
+    creator: Mapped[User] = relationship("User", lazy="raise")
     school_class: Mapped[SchoolClass | None] = relationship(
-        "SchoolClass", lazy="selectin"
+        "SchoolClass", lazy="raise"
     )
 
 
@@ -63,6 +63,6 @@ class VariantItem(Base):
     position: Mapped[int] = mapped_column(Integer, default=0)
 
     variant: Mapped[Variant] = relationship(
-        "Variant", back_populates="items", lazy="selectin"
+        "Variant", back_populates="items", lazy="raise"
     )
-    task: Mapped[Task] = relationship("Task", lazy="selectin")
+    task: Mapped[Task] = relationship("Task", lazy="raise")
@@ -27,8 +27,11 @@ async def wait_for_db():
 asyncio.run(wait_for_db())
 "
 
-echo "Инициализация БД и импорт данных..."
+echo "Миграции схемы БД..."
+python -m backend.migrate
+
+echo "Импорт данных (пропускается, если дамп не менялся)..."
 python -m backend.import_json /app/fipi_questions.json
 
 echo "Запуск сервера..."
-exec uvicorn backend.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python -m backend.serve --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -93,3 +93,15 @@ def compress_image(file_bytes: bytes, filename: str) -> tuple[bytes, str]:
     new_filename = os.path.splitext(filename)[0] + out_ext
 
     return result_bytes, new_filename
+
+
+def compress_image_file(src_path: str, dst_stem: str, filename: str) -> str:
+    with open(src_path, "rb") as f:
+        file_bytes = f.read()
+
+    result_bytes, new_filename = compress_image(file_bytes, filename)
+    dst_path = dst_stem + os.path.splitext(new_filename)[1]
+
+    with open(dst_path, "wb") as f:
+        f.write(result_bytes)
+    return dst_path
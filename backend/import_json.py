@@ -1,20 +1,73 @@
 import asyncio
+from collections.abc import Iterator
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
 import json
 import os
 import sys
+import time
+from typing import Any, cast
 
 if not os.getenv("DATABASE_URL"):
     from dotenv import load_dotenv
 
     load_dotenv()
 
-from sqlalchemy import select
+from sqlalchemy import Insert, Table, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.auth import hash_password
-from backend.database import Base, async_session, engine
-from backend.domain.models import Task, User, UserStats
+from backend.core.config import IMPORT_BATCH_SIZE
+from backend.database import async_session, engine
+from backend.domain.models import (
+    ImportManifest,
+    Task,
+    TaskImportHash,
+    User,
+    UserStats,
+)
+from backend.migrate import head_revision
+from backend.repositories.task_repo import bump_catalogue_version
+from backend.search import notify_tasks_imported
+
+# Поля задания, по которым считается хэш содержимого.
+_CONTENT_FIELDS = (
+    "guid",
+    "task_type",
+    "text",
+    "hint",
+    "answer",
+    "images",
+    "inline_images",
+    "tables",
+)
+
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged + self.skipped
+
+    def __str__(self) -> str:
+        rate = self.total / self.elapsed if self.elapsed else 0.0
+        return (
+            f"Новых заданий: {self.inserted}, обновлено: {self.updated}, "
+            f"без изменений: {self.unchanged}, пропущено: {self.skipped}; "
+            f"{self.total} записей за {self.elapsed:.1f} с "
+            f"({rate:.0f} записей/с)"
+        )
 
 
 @asynccontextmanager
@@ -26,67 +79,189 @@ async def _get_session(db_session: AsyncSession | None):
             yield session
 
 
-async def import_tasks(
-    json_path: str, db_session: AsyncSession | None = None
+def iter_json_array(
+    path: str, chunk_size: int = 1 << 16
+) -> Iterator[dict[str, Any]]:
+    """Читает JSON-массив поэлементно, не загружая файл целиком."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError("Ожидается JSON-массив заданий")
+        buf = buf[1:]
+        eof = False
+        while True:
+            buf = buf.lstrip()
+            if buf.startswith(","):
+                buf = buf[1:].lstrip()
+            if buf.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf += chunk
+                continue
+            yield item
+            buf = buf[end:]
+
+
+def _task_row(item: dict[str, Any]) -> dict[str, Any]:
+    row = {
+        "fipi_id": item["id"],
+        "guid": item.get("guid", ""),
+        "task_type": item.get("type", 0),
+        "text": item.get("text", ""),
+        "hint": item.get("hint", ""),
+        "answer": item.get("answer") or None,
+        "images": item.get("images", []),
+        "inline_images": item.get("inline_images", []),
+        "tables": item.get("tables", []),
+    }
+    content = json.dumps(
+        [row[f] for f in _CONTENT_FIELDS], ensure_ascii=False, sort_keys=True
+    )
+    row["content_hash"] = hashlib.sha256(content.encode()).hexdigest()
+    return row
+
+
+def _upsert(
+    dialect: str, table: Table, key: str, update_columns: list[str]
+) -> Insert:
+    stmt: Any
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(table)
+        new = stmt.inserted
+        values = {c: new[c] for c in update_columns}
+        if "answer" in values:
+            values["answer"] = func.coalesce(new.answer, table.c.answer)
+        return cast(Insert, stmt.on_duplicate_key_update(**values))
+
+    stmt = sqlite_insert(table)
+    new = stmt.excluded
+    values = {c: new[c] for c in update_columns}
+    if "answer" in values:
+        values["answer"] = func.coalesce(new.answer, table.c.answer)
+    return cast(
+        Insert, stmt.on_conflict_do_update(index_elements=[key], set_=values)
+    )
+
+
+async def _load_hashes(db: AsyncSession) -> dict[str, str]:
+    # Хэш хранится отдельно от задания: удалённое администратором задание
+    # при следующем импорте создаётся заново, а задание без хэша обновляется.
+    result = await db.execute(
+        select(Task.fipi_id, TaskImportHash.content_hash).outerjoin(
+            TaskImportHash, TaskImportHash.fipi_id == Task.fipi_id
+        )
+    )
+    return {
+        fipi_id: h or "" for fipi_id, h in result.tuples().all() if fipi_id
+    }
+
+
+# guid существующего задания импорт не трогает.
+_TASK_UPDATE_COLUMNS = [
+    "task_type",
+    "text",
+    "hint",
+    "answer",
+    "images",
+    "inline_images",
+    "tables",
+    "updated_at",
+]
+
+
+async def _write_batch(
+    db: AsyncSession, dialect: str, rows: list[dict[str, Any]]
 ) -> None:
-    if db_session is None:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    now = datetime.now(timezone.utc)
+    task_rows = []
+    for row in rows:
+        task_row = {k: v for k, v in row.items() if k != "content_hash"}
+        task_row["created_at"] = task_row["updated_at"] = now
+        task_rows.append(task_row)
+
+    tasks = cast(Table, Task.__table__)
+    await db.execute(
+        _upsert(dialect, tasks, "fipi_id", _TASK_UPDATE_COLUMNS), task_rows
+    )
+    hashes = cast(Table, TaskImportHash.__table__)
+    await db.execute(
+        _upsert(dialect, hashes, "fipi_id", ["content_hash"]),
+        [
+            {"fipi_id": r["fipi_id"], "content_hash": r["content_hash"]}
+            for r in rows
+        ],
+    )
+
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def _classify(
+    item: dict[str, Any], known: dict[str, str], report: ImportReport
+) -> dict[str, Any] | None:
+    if not item.get("id"):
+        report.skipped += 1
+        return None
+
+    row = _task_row(item)
+    previous = known.get(row["fipi_id"])
+    if previous == row["content_hash"]:
+        report.unchanged += 1
+        return None
+
+    if previous is None:
+        report.inserted += 1
+    else:
+        report.updated += 1
+    known[row["fipi_id"]] = row["content_hash"]
+    return row
 
-    imported = 0
-    updated = 0
+
+async def import_tasks(
+    json_path: str,
+    db_session: AsyncSession | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    report = ImportReport()
+    started = time.perf_counter()
 
     async with _get_session(db_session) as db:
-        for item in data:
-            fipi_id = item.get("id", "")
-            if not fipi_id:
-                continue
+        dialect = db.get_bind().dialect.name
+        known = await _load_hashes(db)
+        batch: list[dict[str, Any]] = []
 
-            result = await db.execute(
-                select(Task).where(Task.fipi_id == fipi_id)
-            )
-            existing_task = result.scalar_one_or_none()
-
-            if existing_task:
-                existing_task.text = item.get("text", "")
-                existing_task.images = item.get("images", [])
-                existing_task.inline_images = item.get("inline_images", [])
-                existing_task.tables = item.get("tables", [])
-                existing_task.task_type = item.get("type", 0)
-                existing_task.hint = item.get("hint", "")
-                if item.get("answer"):
-                    existing_task.answer = item.get("answer")
-                updated += 1
-            else:
-                task = Task(
-                    fipi_id=fipi_id,
-                    guid=item.get("guid", ""),
-                    task_type=item.get("type", 0),
-                    text=item.get("text", ""),
-                    hint=item.get("hint", ""),
-                    answer=item.get("answer"),
-                    images=item.get("images", []),
-                    inline_images=item.get("inline_images", []),
-                    tables=item.get("tables", []),
-                )
-                db.add(task)
-                imported += 1
-
-        await db.flush()
+        for item in iter_json_array(json_path):
+            row = _classify(item, known, report)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await _write_batch(db, dialect, batch)
+                if db_session is None:
+                    await db.commit()
+                batch.clear()
 
+        if batch:
+            await _write_batch(db, dialect, batch)
+        # Импорт идёт отдельным процессом: кэш API сбрасывается через
+        # версию каталога в БД.
+        if report.inserted or report.updated:
+            await bump_catalogue_version(db)
         if db_session is None:
             await db.commit()
 
-    print(f"Новых заданий: {imported}, обновлено: {updated}")
+    report.elapsed = time.perf_counter() - started
+    if report.inserted or report.updated:
+        notify_tasks_imported()
+    print(report)
+    return report
 
 
 async def create_admin() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
     username = os.getenv("ADMIN_USERNAME", "admin")
     email = os.getenv("ADMIN_EMAIL", "admin@exammath.local")
     password = os.getenv("ADMIN_PASSWORD", "admin123")
@@ -113,11 +288,66 @@ async def create_admin() -> None:
         await db.commit()
 
 
-async def main() -> None:
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+async def _load_manifest(
+    db: AsyncSession, source: str
+) -> ImportManifest | None:
     try:
+        return await db.get(ImportManifest, source)
+    except DBAPIError:
+        # Первый запуск: таблиц ещё нет.
+        await db.rollback()
+        return None
+
+
+async def import_if_changed(
+    json_path: str, db_session: AsyncSession | None = None
+) -> ImportReport | None:
+    """Импортирует дамп, только если он или схема БД изменились."""
+    source = os.path.basename(json_path)
+    file_hash = _file_hash(json_path)
+    # Схема меняется только миграциями: достаточно их головной ревизии.
+    revision = head_revision() or ""
+
+    async with _get_session(db_session) as db:
+        manifest = await _load_manifest(db, source)
+    if (
+        manifest is not None
+        and manifest.file_hash == file_hash
+        and manifest.schema_revision == revision
+    ):
+        print(f"{source} не изменился, импорт пропущен")
+        return None
+
+    if db_session is None:
         await create_admin()
+    report = await import_tasks(json_path, db_session)
+
+    async with _get_session(db_session) as db:
+        await db.merge(
+            ImportManifest(
+                source=source,
+                file_hash=file_hash,
+                row_count=report.total,
+                schema_revision=revision,
+                imported_at=datetime.now(timezone.utc),
+            )
+        )
+        if db_session is None:
+            await db.commit()
+        else:
+            await db.flush()
+    return report
+
+
+async def main() -> None:
+    try:
         path = sys.argv[1] if len(sys.argv) > 1 else "../fipi_questions.json"
-        await import_tasks(path)
+        await import_if_changed(path)
     finally:
         await engine.dispose()
 
@@ -10,24 +10,59 @@ from backend.api.routers import (
     admin,
     auth,
     classes,
+    metrics,
     profile,
     solutions,
     tasks,
     teacher,
     variants,
 )
-from backend.core.config import CORS_ORIGINS, UPLOAD_DIR
-from backend.database import init_db
+from backend.auth import password_hasher
+from backend.core.background import PeriodicTask
+from backend.core.config import CORS_ORIGINS, LOOP_LAG_INTERVAL, UPLOAD_DIR
+from backend.core.instrumentation import QueryStatsMiddleware
+from backend.core.metrics import LoopLagProbe, MetricsMiddleware
+from backend.database import engine
+from backend.migrate import check_schema
+from backend.services.answer_stats import answer_stats_flusher
+from backend.services.solution_service import image_executor
+from backend.services.vote_counters import vote_flusher
+from backend.services.warmup import warm_up
+from backend.turnstile import turnstile_verifier
+
+loop_lag_monitor = PeriodicTask(
+    "loop-lag", LoopLagProbe(LOOP_LAG_INTERVAL), LOOP_LAG_INTERVAL
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    await init_db()
+    await check_schema()
+    await warm_up()
+    turnstile_verifier.start()
+    answer_stats_flusher.start()
+    vote_flusher.start()
+    loop_lag_monitor.start()
+    if metrics.MULTI_WORKER:
+        metrics.metrics_publisher.start()
     yield
+    # uvicorn вызывает это после SIGTERM, когда текущие запросы завершены:
+    # буферы счётчиков сбрасываются в БД до выхода процесса.
+    await metrics.metrics_publisher.stop()
+    metrics.worker_snapshots.remove()
+    await loop_lag_monitor.stop()
+    await vote_flusher.stop()
+    await answer_stats_flusher.stop()
+    password_hasher.shutdown()
+    image_executor.shutdown()
+    await turnstile_verifier.close()
+    await engine.dispose()
 
 
 app = FastAPI(title="ExamMath API", lifespan=lifespan)
 
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
@@ -48,6 +83,7 @@ for router in [
     profile.router,
     classes.router,
     teacher.router,
+    metrics.router,
 ]:
     app.include_router(router)
 
@@ -0,0 +1,130 @@
+"""Миграции схемы БД.
+
+    python -m backend.migrate           # обновить до последней ревизии
+    python -m backend.migrate --check   # код 1, если схема отстаёт
+
+Базы, созданные раньше через create_all, не знают о ревизиях: они
+помечаются исходной ревизией и дальше обновляются как обычно. После
+миграций заполняются производные таблицы, если они пусты, и счётчики
+голосов сверяются с task_votes: воркеры ещё не запущены, поэтому
+несброшенных приращений нет ни у кого.
+"""
+
+import argparse
+import asyncio
+from functools import lru_cache
+from pathlib import Path
+import sys
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from backend.database import async_session, engine
+from backend.repositories.solution_repo import SolutionRepository
+from backend.services.answer_stats import backfill_type_stats
+from backend.services.vote_counters import reconcile_vote_counts
+
+ALEMBIC_INI = Path(__file__).with_name("alembic.ini")
+BASELINE = "0001"
+
+
+class SchemaOutdated(RuntimeError):
+    pass
+
+
+def alembic_config(url: str | None = None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    if url is not None:
+        config.attributes["db_url"] = url
+    return config
+
+
+@lru_cache
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _state(conn: Connection) -> tuple[str | None, bool]:
+    """Текущая ревизия и признак базы, созданной через create_all."""
+    current = MigrationContext.configure(conn).get_current_revision()
+    legacy = current is None and inspect(conn).has_table("tasks")
+    return current, legacy
+
+
+async def schema_state(db_engine: AsyncEngine) -> tuple[str | None, bool]:
+    async with db_engine.connect() as conn:
+        return await conn.run_sync(_state)
+
+
+async def check_schema(db_engine: AsyncEngine = engine) -> None:
+    """Быстрая проверка при старте вместо create_all: одна ревизия из
+    alembic_version против головы в migrations/versions."""
+    current, _ = await schema_state(db_engine)
+    head = head_revision()
+    if current != head:
+        raise SchemaOutdated(
+            f"Схема БД на ревизии {current}, код ждёт {head}: "
+            "выполните python -m backend.migrate"
+        )
+
+
+def upgrade(url: str | None = None) -> None:
+    """Доводит схему до последней ревизии. Вызывается вне event loop:
+    env.py сам запускает asyncio.run."""
+    url = url or engine.url.render_as_string(hide_password=False)
+
+    async def state() -> tuple[str | None, bool]:
+        db_engine = create_async_engine(url)
+        try:
+            return await schema_state(db_engine)
+        finally:
+            await db_engine.dispose()
+
+    config = alembic_config(url)
+    _, legacy = asyncio.run(state())
+    if legacy:
+        command.stamp(config, BASELINE)
+    command.upgrade(config, "head")
+
+
+async def backfill() -> None:
+    """Разовое заполнение производных таблиц из solutions и сверка
+    голосов. Выполняется здесь, а не при старте воркеров, чтобы они не
+    делали это наперегонки."""
+    try:
+        async with async_session() as db:
+            await SolutionRepository(db).backfill_progress()
+            await backfill_type_stats(db)
+            await reconcile_vote_counts(db)
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+    if not args.check:
+        upgrade()
+        asyncio.run(backfill())
+        return 0
+
+    async def check() -> int:
+        try:
+            await check_schema()
+        except SchemaOutdated as e:
+            print(e)
+            return 1
+        finally:
+            await engine.dispose()
+        return 0
+
+    return asyncio.run(check())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,24 +7,28 @@ from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
-from backend.database import Base
+from backend.database import DATABASE_URL, Base
 from backend.domain.models import *
 from backend.domain.models import audit
 
 config = context.config
 
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 target_metadata = Base.metadata
 
 
 def get_url() -> str:
+    # backend.migrate передаёт адрес через attributes.
+    if "db_url" in config.attributes:
+        return str(config.attributes["db_url"])
+
     x_args = context.get_x_argument(as_dictionary=True)
     if "db_url" in x_args:
         return str(x_args["db_url"])
 
-    url = os.getenv("DATABASE_URL")
+    url = os.getenv("DATABASE_URL") or DATABASE_URL
     if url:
         return str(url)
 
@@ -49,7 +53,13 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # DDL в MySQL не транзакционна: каждая ревизия фиксируется отдельно,
+    # чтобы после сбоя повторный запуск начинал с упавшей ревизии.
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
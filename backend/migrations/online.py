@@ -0,0 +1,62 @@
+"""Операции с индексами, не блокирующие запись в MySQL/MariaDB.
+
+Обычный CREATE INDEX в InnoDB тоже строится на месте, но сервер может
+выбрать блокировку таблицы; явные ALGORITHM=INPLACE и LOCK=NONE
+гарантируют, что запись в таблицу не остановится, а если так нельзя,
+миграция упадёт сразу, а не повиснет на живой базе.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+_ONLINE = "ALGORITHM=INPLACE LOCK=NONE"
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name in ("mysql", "mariadb")
+
+
+def existing_tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def existing_indexes(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    return {str(ix["name"]) for ix in inspector.get_indexes(table)}
+
+
+def create_index(name: str, table: str, columns: list[str]) -> None:
+    """Создаёт индекс, если его ещё нет."""
+    if name in existing_indexes(table):
+        return
+    if _is_mysql():
+        op.execute(
+            f"CREATE INDEX {name} ON {table} ({', '.join(columns)}) {_ONLINE}"
+        )
+    else:
+        op.create_index(name, table, columns)
+
+
+def create_fulltext_index(name: str, table: str, column: str) -> None:
+    """FULLTEXT-индекс в MySQL/MariaDB, в остальных СУБД — обычный, как
+    его создаёт модель. Первый FULLTEXT перестраивает таблицу, и без
+    блокировки записи InnoDB так не умеет: LOCK=SHARED оставляет чтение."""
+    if name in existing_indexes(table):
+        return
+    if _is_mysql():
+        op.execute(
+            f"CREATE FULLTEXT INDEX {name} ON {table} ({column}) "
+            "ALGORITHM=INPLACE LOCK=SHARED"
+        )
+    else:
+        op.create_index(name, table, [column])
+
+
+def drop_index(name: str, table: str) -> None:
+    """Удаляет индекс, если он есть."""
+    if name not in existing_indexes(table):
+        return
+    if _is_mysql():
+        op.execute(f"DROP INDEX {name} ON {table} {_ONLINE}")
+    else:
+        op.drop_index(name, table_name=table)
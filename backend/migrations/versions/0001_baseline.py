@@ -0,0 +1,259 @@
+"""Исходная схема, которую создавал create_all.
+
+Таблицы и индексы, появившиеся позже, создают следующие ревизии:
+базы без alembic_version помечаются этой ревизией и должны совпадать
+с ней в точности.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 02:45:46.042641
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("fipi_id", sa.String(length=20), nullable=True),
+        sa.Column("guid", sa.String(length=64), nullable=True),
+        sa.Column("task_type", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("hint", sa.String(length=200), nullable=True),
+        sa.Column("answer", sa.String(length=100), nullable=True),
+        sa.Column("images", sa.JSON(), nullable=False),
+        sa.Column("inline_images", sa.JSON(), nullable=False),
+        sa.Column("tables", sa.JSON(), nullable=False),
+        sa.Column("likes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "dislikes", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "total_attempts", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column(
+            "solved_count", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_tasks_fipi_id"), "tasks", ["fipi_id"], unique=True
+    )
+    op.create_index(
+        op.f("ix_tasks_task_type"), "tasks", ["task_type"], unique=False
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.Column("token_version", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_index(
+        op.f("ix_users_username"), "users", ["username"], unique=True
+    )
+    op.create_table(
+        "school_classes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["created_by"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "solutions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("answer", sa.String(length=255), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=True),
+        sa.Column("content", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["task_id"],
+            ["tasks.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_solutions_task_id"), "solutions", ["task_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_solutions_user_id"), "solutions", ["user_id"], unique=False
+    )
+    op.create_table(
+        "task_votes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("vote_type", sa.String(length=10), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "task_id", name="uq_task_vote_user_task"
+        ),
+    )
+    op.create_index(
+        op.f("ix_task_votes_task_id"), "task_votes", ["task_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_task_votes_user_id"), "task_votes", ["user_id"], unique=False
+    )
+    op.create_table(
+        "user_stats",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_attempts", sa.Integer(), nullable=False),
+        sa.Column("correct_attempts", sa.Integer(), nullable=False),
+        sa.Column("tasks_solved", sa.Integer(), nullable=False),
+        sa.Column("streak_current", sa.Integer(), nullable=False),
+        sa.Column("streak_max", sa.Integer(), nullable=False),
+        sa.Column("last_activity", sa.DateTime(), nullable=True),
+        sa.Column("stats_by_type", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "class_members",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("class_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["class_id"], ["school_classes.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "solution_files",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("solution_id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("filepath", sa.String(length=500), nullable=False),
+        sa.Column("file_type", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["solution_id"],
+            ["solutions.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_solution_files_solution_id"),
+        "solution_files",
+        ["solution_id"],
+        unique=False,
+    )
+    op.create_table(
+        "variants",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("class_id", sa.Integer(), nullable=True),
+        sa.Column("is_public", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["class_id"],
+            ["school_classes.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "variant_items",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("variant_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["task_id"],
+            ["tasks.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["variant_id"], ["variants.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_variant_items_task_id"),
+        "variant_items",
+        ["task_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_variant_items_variant_id"),
+        "variant_items",
+        ["variant_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_variant_items_variant_id"), table_name="variant_items"
+    )
+    op.drop_index(op.f("ix_variant_items_task_id"), table_name="variant_items")
+    op.drop_table("variant_items")
+    op.drop_table("variants")
+    op.drop_index(
+        op.f("ix_solution_files_solution_id"), table_name="solution_files"
+    )
+    op.drop_table("solution_files")
+    op.drop_table("class_members")
+    op.drop_table("user_stats")
+    op.drop_index(op.f("ix_task_votes_user_id"), table_name="task_votes")
+    op.drop_index(op.f("ix_task_votes_task_id"), table_name="task_votes")
+    op.drop_table("task_votes")
+    op.drop_index(op.f("ix_solutions_user_id"), table_name="solutions")
+    op.drop_index(op.f("ix_solutions_task_id"), table_name="solutions")
+    op.drop_table("solutions")
+    op.drop_table("school_classes")
+    op.drop_index(op.f("ix_users_username"), table_name="users")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_table("users")
+    op.drop_index(op.f("ix_tasks_task_type"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_fipi_id"), table_name="tasks")
+    op.drop_table("tasks")
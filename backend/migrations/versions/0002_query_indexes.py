@@ -0,0 +1,62 @@
+"""Индексы под запросы репозиториев.
+
+Базы, созданные create_all после появления индексов в моделях, уже
+содержат часть из них, поэтому ревизия создаёт и удаляет только то,
+чего в базе нет или что осталось лишним.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 03:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from backend.migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # get_user_class_ids на каждом /api/variants: покрывающий.
+    ("class_members", "ix_class_members_user_class", ["user_id", "class_id"]),
+    # Ученики класса: get_students_in_class, матрица варианта.
+    ("class_members", "ix_class_members_class_role", ["class_id", "role"]),
+    ("variants", "ix_variants_class_id", ["class_id"]),
+    ("variants", "ix_variants_created_by", ["created_by"]),
+    # Последнее решение по заданию и сводка по варианту.
+    (
+        "solutions",
+        "ix_solutions_user_task_created",
+        ["user_id", "task_id", "created_at"],
+    ),
+    # История решений ученика.
+    ("solutions", "ix_solutions_user_created", ["user_id", "created_at"]),
+    # Фильтр по типу и keyset-пагинация каталога.
+    ("tasks", "ix_tasks_type_id", ["task_type", "id"]),
+]
+
+# Префиксы составных индексов выше.
+REDUNDANT = [
+    ("solutions", "ix_solutions_user_id", ["user_id"]),
+    ("tasks", "ix_tasks_task_type", ["task_type"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, name, columns in INDEXES:
+        online.create_index(name, table, columns)
+    for table, name, _ in REDUNDANT:
+        online.drop_index(name, table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, name, columns in REDUNDANT:
+        online.create_index(name, table, columns)
+    for table, name, _ in reversed(INDEXES):
+        online.drop_index(name, table)
@@ -0,0 +1,27 @@
+"""FULLTEXT-индекс по условиям заданий для поиска.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from backend.migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    online.create_fulltext_index("ix_tasks_text_fulltext", "tasks", "text")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    online.drop_index("ix_tasks_text_fulltext", "tasks")
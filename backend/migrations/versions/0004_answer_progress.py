@@ -0,0 +1,82 @@
+"""Журнал проверок ответов, прогресс по заданиям и статистика по типам.
+
+Таблицы могут уже существовать в базах, созданных create_all, поэтому
+создаются только недостающие.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:21:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = online.existing_tables()
+    if "answer_events" not in existing:
+        op.create_table(
+            "answer_events",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("task_id", sa.Integer(), nullable=False),
+            sa.Column("task_type", sa.Integer(), nullable=False),
+            sa.Column("is_correct", sa.Boolean(), nullable=False),
+            sa.Column("is_first_try", sa.Boolean(), nullable=False),
+            sa.Column("is_first_solve", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["task_id"], ["tasks.id"], ondelete="CASCADE"
+            ),
+            sa.ForeignKeyConstraint(
+                ["user_id"], ["users.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    if "user_task_progress" not in existing:
+        op.create_table(
+            "user_task_progress",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("task_id", sa.Integer(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("first_attempt_at", sa.DateTime(), nullable=False),
+            sa.Column("solved_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["task_id"], ["tasks.id"], ondelete="CASCADE"
+            ),
+            sa.ForeignKeyConstraint(
+                ["user_id"], ["users.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("user_id", "task_id"),
+        )
+    if "user_type_stats" not in existing:
+        op.create_table(
+            "user_type_stats",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("task_type", sa.Integer(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("correct", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(
+                ["user_id"], ["users.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("user_id", "task_type"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_type_stats")
+    op.drop_table("user_task_progress")
+    op.drop_table("answer_events")
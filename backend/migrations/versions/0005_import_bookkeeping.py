@@ -0,0 +1,51 @@
+"""Хэши импортированных заданий и манифест последнего импорта.
+
+Таблицы могут уже существовать в базах, созданных create_all, поэтому
+создаются только недостающие.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 12:22:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = online.existing_tables()
+    if "task_import_hashes" not in existing:
+        op.create_table(
+            "task_import_hashes",
+            sa.Column("fipi_id", sa.String(length=20), nullable=False),
+            sa.Column("content_hash", sa.String(length=64), nullable=False),
+            sa.PrimaryKeyConstraint("fipi_id"),
+        )
+    if "import_manifests" not in existing:
+        op.create_table(
+            "import_manifests",
+            sa.Column("source", sa.String(length=255), nullable=False),
+            sa.Column("file_hash", sa.String(length=64), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("schema_revision", sa.String(length=64), nullable=False),
+            sa.Column("imported_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("source"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("import_manifests")
+    op.drop_table("task_import_hashes")
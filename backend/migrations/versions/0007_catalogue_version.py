@@ -0,0 +1,49 @@
+"""Версия каталога заданий для кэша ответов всех воркеров.
+
+Таблицу может создать create_all; строка с версией добавляется, только
+если её нет.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.migrations import online
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "catalogue_version" not in online.existing_tables():
+        op.create_table(
+            "catalogue_version",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column(
+                "version", sa.Integer(), server_default="0", nullable=False
+            ),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    table = sa.table(
+        "catalogue_version",
+        sa.column("id", sa.Integer()),
+        sa.column("version", sa.Integer()),
+    )
+    row = op.get_bind().execute(sa.select(table.c.id).where(table.c.id == 1))
+    if row.first() is None:
+        op.bulk_insert(table, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("catalogue_version")
@@ -3,25 +3,33 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.domain.models.class_ import ClassMember, SchoolClass
 from backend.domain.models.user import User
+from backend.repositories.load_plans import BASE, LoadPlan
 
 
 class ClassRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def get_by_id(self, class_id: int) -> SchoolClass | None:
+    async def get_by_id(
+        self, class_id: int, plan: LoadPlan = BASE
+    ) -> SchoolClass | None:
         result = await self._db.execute(
-            select(SchoolClass).where(SchoolClass.id == class_id)
+            select(SchoolClass)
+            .options(*plan)
+            .where(SchoolClass.id == class_id)
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self) -> list[SchoolClass]:
-        result = await self._db.execute(select(SchoolClass))
+    async def get_all(self, plan: LoadPlan = BASE) -> list[SchoolClass]:
+        result = await self._db.execute(select(SchoolClass).options(*plan))
         return list(result.scalars().all())
 
-    async def get_for_teacher(self, user_id: int) -> list[SchoolClass]:
+    async def get_for_teacher(
+        self, user_id: int, plan: LoadPlan = BASE
+    ) -> list[SchoolClass]:
         result = await self._db.execute(
             select(SchoolClass)
+            .options(*plan)
             .join(ClassMember)
             .where(
                 ClassMember.user_id == user_id, ClassMember.role == "teacher"
@@ -29,9 +37,12 @@ class ClassRepository:
         )
         return list(result.scalars().all())
 
-    async def get_for_user(self, user_id: int) -> list[SchoolClass]:
+    async def get_for_user(
+        self, user_id: int, plan: LoadPlan = BASE
+    ) -> list[SchoolClass]:
         result = await self._db.execute(
             select(SchoolClass)
+            .options(*plan)
             .join(ClassMember)
             .where(ClassMember.user_id == user_id)
         )
@@ -72,7 +83,7 @@ class ClassRepository:
         )
         self._db.add(sc)
         await self._db.commit()
-        await self._db.refresh(sc)
+        await self._db.refresh(sc, attribute_names=["members"])
         return sc
 
     async def add_member(
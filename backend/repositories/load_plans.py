@@ -0,0 +1,46 @@
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from backend.domain.models.class_ import ClassMember, SchoolClass
+from backend.domain.models.solution import Solution
+from backend.domain.models.task import Task
+from backend.domain.models.user import User
+from backend.domain.models.variant import Variant
+
+# Все связи моделей объявлены с lazy="raise": каждый метод репозитория
+# явно указывает, что ему нужно загрузить, через один из планов ниже.
+LoadPlan = tuple[LoaderOption, ...]
+
+BASE: LoadPlan = ()
+
+TASK_PUBLIC: LoadPlan = (
+    load_only(
+        Task.id,
+        Task.fipi_id,
+        Task.guid,
+        Task.task_type,
+        Task.text,
+        Task.images,
+        Task.inline_images,
+        Task.tables,
+        Task.likes,
+        Task.dislikes,
+        Task.total_attempts,
+        Task.solved_count,
+        raiseload=True,
+    ),
+)
+
+SOLUTION_RESPONSE: LoadPlan = (
+    selectinload(Solution.files),
+    joinedload(Solution.user).load_only(User.id, User.username),
+)
+SOLUTION_FILES: LoadPlan = (selectinload(Solution.files),)
+
+CLASS_WITH_MEMBERS: LoadPlan = (
+    selectinload(SchoolClass.members)
+    .joinedload(ClassMember.user)
+    .load_only(User.id, User.username, User.email),
+)
+
+VARIANT_ITEMS: LoadPlan = (selectinload(Variant.items),)
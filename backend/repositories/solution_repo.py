@@ -1,26 +1,145 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Insert,
+    RowMapping,
+    Select,
+    String,
+    Subquery,
+    and_,
+    case,
+    cast,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
+
+from backend.core.config import HISTORY_EXPORT_BATCH
+from backend.domain.models.class_ import ClassMember
+from backend.domain.models.solution import (
+    Solution,
+    SolutionFile,
+    UserTaskProgress,
+)
+from backend.domain.models.task import Task
+from backend.domain.models.user import User
+from backend.repositories.load_plans import BASE, LoadPlan
+from backend.schemas.stats import HistoryFilter
+
+
+def _attempt_upsert(dialect: str) -> Insert:
+    """INSERT первой попытки; если строка уже есть — attempts + 1."""
+    if dialect in ("mysql", "mariadb"):
+        return mysql_insert(UserTaskProgress).on_duplicate_key_update(
+            attempts=UserTaskProgress.attempts + 1
+        )
+    return sqlite_insert(UserTaskProgress).on_conflict_do_update(
+        index_elements=[UserTaskProgress.user_id, UserTaskProgress.task_id],
+        set_={"attempts": UserTaskProgress.attempts + 1},
+    )
+
+
+def _history_query(user_id: int, filters: HistoryFilter) -> Select[Any]:
+    # Только колонки: история не тянет ORM-объекты и их связи.
+    q = (
+        select(
+            Solution.id,
+            Solution.task_id,
+            Task.task_type,
+            Solution.answer,
+            Solution.is_correct,
+            Solution.created_at,
+        )
+        .join(Task, Task.id == Solution.task_id)
+        .where(Solution.user_id == user_id)
+    )
+    if filters.task_type is not None:
+        q = q.where(Task.task_type == filters.task_type)
+    if filters.is_correct is not None:
+        q = q.where(Solution.is_correct.is_(filters.is_correct))
+    if filters.date_from is not None:
+        start = datetime.combine(filters.date_from, time.min)
+        q = q.where(Solution.created_at >= start)
+    if filters.date_to is not None:
+        end = datetime.combine(filters.date_to + timedelta(days=1), time.min)
+        q = q.where(Solution.created_at < end)
+    return q.order_by(Solution.created_at.desc(), Solution.id.desc())
+
+
+@dataclass
+class LatestSolution:
+    """Сводное последнее решение ученика по заданию."""
+
+    task_id: int
+    answer: str | None = None
+    is_correct: bool | None = None
+    content: list[Any] = field(default_factory=list)
+    files: list[SolutionFile] = field(default_factory=list)
+
 
-from backend.domain.models.solution import Solution, SolutionFile
+def _newest_id(condition: ColumnElement[bool]) -> ColumnElement[int]:
+    return func.max(case((condition, Solution.id)))
+
+
+def _latest_ids(user_id: int, task_ids: list[int]) -> Subquery:
+    # id растут вместе с created_at, поэтому «самое новое решение, где поле
+    # заполнено» — это max(id) по условию; индекс (user_id, task_id, ...)
+    # сужает выборку до попыток одного ученика.
+    has_content = and_(
+        Solution.content.is_not(None),
+        cast(Solution.content, String).not_in(["[]", "null"]),
+    )
+    return (
+        select(
+            Solution.task_id,
+            _newest_id(Solution.answer.is_not(None)).label("answer_id"),
+            _newest_id(Solution.is_correct.is_not(None)).label("correct_id"),
+            _newest_id(has_content).label("content_id"),
+            _newest_id(SolutionFile.id.is_not(None)).label("files_id"),
+        )
+        .outerjoin(SolutionFile, SolutionFile.solution_id == Solution.id)
+        .where(Solution.user_id == user_id, Solution.task_id.in_(task_ids))
+        .group_by(Solution.task_id)
+        .subquery()
+    )
 
 
 class SolutionRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def get_by_id(self, solution_id: int) -> Solution | None:
+    async def get_by_id(
+        self, solution_id: int, plan: LoadPlan = BASE
+    ) -> Solution | None:
         result = await self._db.execute(
-            select(Solution).where(Solution.id == solution_id)
+            select(Solution).options(*plan).where(Solution.id == solution_id)
         )
         return result.scalar_one_or_none()
 
     async def get_latest_for_user_task(
-        self, user_id: int, task_id: int, is_correct: bool | None = None
+        self,
+        user_id: int,
+        task_id: int,
+        is_correct: bool | None = None,
+        plan: LoadPlan = BASE,
     ) -> Solution | None:
-        q = select(Solution).where(
-            Solution.user_id == user_id,
-            Solution.task_id == task_id,
+        q = (
+            select(Solution)
+            .options(*plan)
+            .where(
+                Solution.user_id == user_id,
+                Solution.task_id == task_id,
+            )
         )
         if is_correct is None:
             q = q.where(Solution.is_correct.is_(None))
@@ -33,18 +152,22 @@ class SolutionRepository:
         return result.scalar_one_or_none()
 
     async def get_user_task_solutions(
-        self, user_id: int, task_id: int
+        self, user_id: int, task_id: int, plan: LoadPlan = BASE
     ) -> list[Solution]:
         result = await self._db.execute(
             select(Solution)
+            .options(*plan)
             .where(Solution.user_id == user_id, Solution.task_id == task_id)
             .order_by(Solution.created_at.desc())
         )
         return list(result.scalars().all())
 
-    async def get_all_for_task(self, task_id: int) -> list[Solution]:
+    async def get_all_for_task(
+        self, task_id: int, plan: LoadPlan = BASE
+    ) -> list[Solution]:
         result = await self._db.execute(
             select(Solution)
+            .options(*plan)
             .where(Solution.task_id == task_id)
             .order_by(Solution.created_at.desc())
         )
@@ -52,31 +175,209 @@ class SolutionRepository:
 
     async def get_latest_for_tasks(
         self, user_id: int, task_ids: list[int]
-    ) -> dict[int, Solution]:
+    ) -> dict[int, LatestSolution]:
+        """Одна строка на задание: каждое поле берётся из самого нового
+        решения, где оно заполнено."""
+        answer, correct, content = (aliased(Solution) for _ in range(3))
+        latest = _latest_ids(user_id, task_ids)
         result = await self._db.execute(
-            select(Solution)
-            .options(selectinload(Solution.files))
-            .where(Solution.user_id == user_id, Solution.task_id.in_(task_ids))
-            .order_by(Solution.created_at.desc())
+            select(
+                latest.c.task_id,
+                answer.answer,
+                correct.is_correct,
+                content.content,
+                latest.c.files_id,
+            )
+            .outerjoin(answer, answer.id == latest.c.answer_id)
+            .outerjoin(correct, correct.id == latest.c.correct_id)
+            .outerjoin(content, content.id == latest.c.content_id)
         )
+        rows = result.tuples().all()
 
-        solutions: dict[int, Solution] = {}
-        for s in result.scalars().all():
-            if s.task_id not in solutions:
-                solutions[s.task_id] = s
-            else:
-                existing = solutions[s.task_id]
-                if existing.answer is None and s.answer is not None:
-                    existing.answer = s.answer
-                if existing.is_correct is None and s.is_correct is not None:
-                    existing.is_correct = s.is_correct
-                if not existing.content and s.content:
-                    existing.content = s.content
-                if not existing.files and s.files:
-                    existing.files = s.files
+        files: dict[int, list[SolutionFile]] = {}
+        files_ids = [row[4] for row in rows if row[4] is not None]
+        if files_ids:
+            files_result = await self._db.execute(
+                select(SolutionFile)
+                .where(SolutionFile.solution_id.in_(files_ids))
+                .order_by(SolutionFile.id)
+            )
+            for f in files_result.scalars().all():
+                files.setdefault(f.solution_id, []).append(f)
 
+        solutions: dict[int, LatestSolution] = {}
+        for task_id, answer_value, is_correct, content_value, files_id in rows:
+            solutions[task_id] = LatestSolution(
+                task_id=task_id,
+                answer=answer_value,
+                is_correct=is_correct,
+                content=content_value or [],
+                files=files.get(files_id, []) if files_id else [],
+            )
         return solutions
 
+    async def _bump_progress(
+        self, user_id: int, task_id: int, solved_at: datetime | None
+    ) -> None:
+        await self._db.execute(
+            _attempt_upsert(self._db.get_bind().dialect.name).values(
+                user_id=user_id,
+                task_id=task_id,
+                attempts=1,
+                first_attempt_at=datetime.now(timezone.utc),
+                solved_at=solved_at,
+            )
+        )
+
+    async def record_upload(self, user_id: int, task_id: int) -> None:
+        """Новое решение без проверки (текст, фото) тоже попытка:
+        следующая проверка этого задания уже не первая."""
+        await self._bump_progress(user_id, task_id, None)
+
+    async def record_attempt(
+        self, user_id: int, task_id: int, correct: bool
+    ) -> tuple[bool, bool]:
+        """Учитывает попытку; возвращает (первая попытка, первое решение).
+
+        Upsert держит блокировку строки до конца транзакции, поэтому
+        параллельные проверки того же задания (двойная отправка, две
+        вкладки) идут по очереди, а не падают на вставке."""
+        now = datetime.now(timezone.utc)
+        await self._bump_progress(user_id, task_id, now if correct else None)
+        key = (
+            UserTaskProgress.user_id == user_id,
+            UserTaskProgress.task_id == task_id,
+        )
+        result = await self._db.execute(
+            select(UserTaskProgress.attempts, UserTaskProgress.solved_at)
+            .where(*key)
+            .with_for_update()
+        )
+        attempts, solved_at = result.one()
+        if attempts == 1:
+            # Строку вставили только что, solved_at уже заполнен.
+            return True, correct
+        is_first_solve = correct and solved_at is None
+        if is_first_solve:
+            await self._db.execute(
+                update(UserTaskProgress)
+                .where(*key)
+                .values(solved_at=now)
+                .execution_options(synchronize_session=False)
+            )
+        return False, is_first_solve
+
+    async def get_progress(
+        self, user_id: int, task_ids: list[int]
+    ) -> list[UserTaskProgress]:
+        result = await self._db.execute(
+            select(UserTaskProgress).where(
+                UserTaskProgress.user_id == user_id,
+                UserTaskProgress.task_id.in_(task_ids),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def backfill_progress(self) -> None:
+        if await self._db.scalar(select(UserTaskProgress.user_id).limit(1)):
+            return
+
+        await self._db.execute(
+            insert(UserTaskProgress).from_select(
+                [
+                    "user_id",
+                    "task_id",
+                    "attempts",
+                    "first_attempt_at",
+                    "solved_at",
+                ],
+                select(
+                    Solution.user_id,
+                    Solution.task_id,
+                    func.count(Solution.id),
+                    func.min(Solution.created_at),
+                    func.min(
+                        case(
+                            (
+                                Solution.is_correct.is_(True),
+                                Solution.created_at,
+                            )
+                        )
+                    ),
+                ).group_by(Solution.user_id, Solution.task_id),
+            )
+        )
+        await self._db.commit()
+
+    async def get_history_page(
+        self,
+        user_id: int,
+        filters: HistoryFilter,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[RowMapping]:
+        q = _history_query(user_id, filters)
+        if after is not None:
+            created_at, solution_id = after
+            q = q.where(
+                or_(
+                    Solution.created_at < created_at,
+                    and_(
+                        Solution.created_at == created_at,
+                        Solution.id < solution_id,
+                    ),
+                )
+            )
+        result = await self._db.execute(q.limit(limit))
+        return list(result.mappings().all())
+
+    async def stream_history(
+        self, user_id: int, filters: HistoryFilter
+    ) -> AsyncIterator[RowMapping]:
+        result = await self._db.stream(
+            _history_query(user_id, filters).execution_options(
+                yield_per=HISTORY_EXPORT_BATCH
+            )
+        )
+        async for row in result.mappings():
+            yield row
+
+    async def get_class_matrix(
+        self, class_id: int, task_ids: list[int]
+    ) -> list[tuple[int, str, int | None, int, int, int]]:
+        """Строки (user_id, username, task_id, попытки, верных, без
+        проверки) по ученикам класса; ученик без решений даёт одну строку
+        с task_id = None."""
+        result = await self._db.execute(
+            select(
+                ClassMember.user_id,
+                User.username,
+                Solution.task_id,
+                func.count(Solution.id),
+                func.coalesce(
+                    func.sum(case((Solution.is_correct.is_(True), 1))), 0
+                ),
+                func.coalesce(
+                    func.sum(case((Solution.is_correct.is_(None), 1))), 0
+                ),
+            )
+            .join(User, User.id == ClassMember.user_id)
+            .outerjoin(
+                Solution,
+                and_(
+                    Solution.user_id == ClassMember.user_id,
+                    Solution.task_id.in_(task_ids),
+                ),
+            )
+            .where(
+                ClassMember.class_id == class_id,
+                ClassMember.role == "student",
+            )
+            .group_by(ClassMember.user_id, User.username, Solution.task_id)
+            .order_by(User.username)
+        )
+        return [tuple(row) for row in result.tuples().all()]
+
     async def create(self, **kwargs: object) -> Solution:
         solution = Solution(**kwargs)
         self._db.add(solution)
@@ -84,6 +385,12 @@ class SolutionRepository:
         await self._db.refresh(solution)
         return solution
 
+    async def load(self, solution: Solution, plan: LoadPlan) -> Solution:
+        await self._db.execute(
+            select(Solution).options(*plan).where(Solution.id == solution.id)
+        )
+        return solution
+
     async def save(self, solution: Solution) -> Solution:
         await self._db.commit()
         await self._db.refresh(solution)
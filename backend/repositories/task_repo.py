@@ -1,26 +1,168 @@
-from sqlalchemy import and_, func, not_, or_, select
+import base64
+import hashlib
+import json
+from typing import Any, cast
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    and_,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.domain.models.task import Task
+from backend.core.cache import ResponseCache, TTLCache
+from backend.core.config import (
+    CATALOGUE_VERSION_POLL,
+    TASK_RESPONSE_CACHE_MAX_BYTES,
+    TASK_RESPONSE_CACHE_SIZE,
+    TASK_RESPONSE_CACHE_TTL,
+    TASK_TOTAL_CACHE_TTL,
+)
+from backend.domain.models.task import CatalogueVersion, Task
+from backend.repositories.load_plans import BASE, TASK_PUBLIC, LoadPlan
 from backend.schemas.task import (
+    TaskAdminCursorResponse,
     TaskAdminListResponse,
     TaskAdminResponse,
+    TaskCursorResponse,
     TaskListResponse,
     TaskResponse,
 )
+from backend.search import get_search_backend, notify_task_changed
+
+task_total_cache: TTLCache[tuple[int | None, str | None], int] = TTLCache(
+    maxsize=256, ttl=TASK_TOTAL_CACHE_TTL
+)
+# Готовый JSON публичных страниц каталога и карточек заданий.
+task_response_cache = ResponseCache(
+    maxsize=TASK_RESPONSE_CACHE_SIZE,
+    max_bytes=TASK_RESPONSE_CACHE_MAX_BYTES,
+    ttl=TASK_RESPONSE_CACHE_TTL,
+    sync_interval=CATALOGUE_VERSION_POLL,
+)
+
+
+async def bump_catalogue_version(db: AsyncSession) -> None:
+    """Поднимает версию каталога в текущей транзакции: после коммита
+    все воркеры сбросят task_response_cache при очередной сверке."""
+    result = cast(
+        CursorResult[Any],
+        await db.execute(
+            update(CatalogueVersion)
+            .where(CatalogueVersion.id == 1)
+            .values(version=CatalogueVersion.version + 1)
+        ),
+    )
+    if not result.rowcount:
+        db.add(CatalogueVersion(id=1, version=1))
+
+
+async def sync_catalogue_version(db: AsyncSession) -> None:
+    if not task_response_cache.sync_due():
+        return
+    version = await db.scalar(
+        select(CatalogueVersion.version).where(CatalogueVersion.id == 1)
+    )
+    task_response_cache.observe(version or 0)
+
+
+def _cursor_scope(
+    task_type: int | None, search: str | None, filter: str | None
+) -> str:
+    raw = json.dumps([task_type, search, filter], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _encode_cursor(scope: str, field: str, value: Any) -> str:
+    position = {"q": scope, field: value}
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_key(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) == 2
+        and all(type(v) is int for v in value)
+    )
+
+
+def _valid_offset(value: Any) -> bool:
+    return type(value) is int and value >= 0
+
+
+# k — (task_type, id) последнего задания страницы, o — смещение в выдаче
+# поиска.
+_CURSOR_FIELDS = {"k": _valid_key, "o": _valid_offset}
+
+
+def _decode_cursor(cursor: str, scope: str, field: str) -> Any:
+    """Позиция из курсора. Курсор действует только для тех же типа,
+    фильтра и поиска, с которыми выдан."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except ValueError:
+        raise HTTPException(400, "Некорректный курсор")
+
+    if (
+        not isinstance(position, dict)
+        or set(position) != {"q", field}
+        or position["q"] != scope
+        or not _CURSOR_FIELDS[field](position[field])
+    ):
+        raise HTTPException(400, "Некорректный курсор")
+    return position[field]
+
+
+def _filter_conditions(
+    task_type: int | None, filter: str | None
+) -> list[ColumnElement[bool]]:
+    conds: list[ColumnElement[bool]] = []
+    if task_type is not None:
+        conds.append(Task.task_type == task_type)
+
+    if filter == "untyped":
+        conds.append(
+            or_(Task.task_type == 0, not_(Task.task_type.between(1, 19)))
+        )
+    elif filter == "no_answer":
+        conds.append(
+            and_(
+                Task.task_type.between(1, 12),
+                or_(Task.answer.is_(None), Task.answer == ""),
+            )
+        )
+    return conds
 
 
 class TaskRepository:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def get_by_id(self, task_id: int) -> Task | None:
-        result = await self._db.execute(select(Task).where(Task.id == task_id))
+    async def get_by_id(
+        self, task_id: int, plan: LoadPlan = BASE
+    ) -> Task | None:
+        result = await self._db.execute(
+            select(Task).options(*plan).where(Task.id == task_id)
+        )
         return result.scalar_one_or_none()
 
-    async def get_many_by_ids(self, task_ids: list[int]) -> dict[int, Task]:
+    async def get_many_by_ids(
+        self, task_ids: list[int], plan: LoadPlan = TASK_PUBLIC
+    ) -> dict[int, Task]:
         result = await self._db.execute(
-            select(Task).where(Task.id.in_(task_ids))
+            select(Task).options(*plan).where(Task.id.in_(task_ids))
         )
         return {t.id: t for t in result.scalars().all()}
 
@@ -33,40 +175,19 @@ class TaskRepository:
         filter: str | None = None,
         is_admin: bool = False,
     ) -> TaskListResponse | TaskAdminListResponse:
-        q = select(Task)
-        count_q = select(func.count(Task.id))
-
-        if task_type is not None:
-            q = q.where(Task.task_type == task_type)
-            count_q = count_q.where(Task.task_type == task_type)
+        conds = _filter_conditions(task_type, filter)
+        plan = BASE if is_admin else TASK_PUBLIC
 
-        if filter == "untyped":
-            cond = or_(
-                Task.task_type == 0, not_(Task.task_type.between(1, 19))
+        if search:
+            total, db_tasks = await self._search_page(
+                search, conds, page, per_page, plan
             )
-            q = q.where(cond)
-            count_q = count_q.where(cond)
-        elif filter == "no_answer":
-            cond = and_(
-                Task.task_type.between(1, 12),
-                or_(Task.answer.is_(None), Task.answer == ""),
+        else:
+            total, db_tasks = await self._filter_page(
+                conds, page, per_page, plan
             )
-            q = q.where(cond)
-            count_q = count_q.where(cond)
-
-        if search:
-            cond = Task.text.ilike(f"%{search}%")
-            q = q.where(cond)
-            count_q = count_q.where(cond)
-
-        total = (await self._db.execute(count_q)).scalar_one()
         pages = max(1, (total + per_page - 1) // per_page)
 
-        result = await self._db.execute(
-            q.offset((page - 1) * per_page).limit(per_page)
-        )
-        db_tasks = result.scalars().all()
-
         if is_admin:
             tasks_admin = [
                 TaskAdminResponse.model_validate(t) for t in db_tasks
@@ -80,10 +201,146 @@ class TaskRepository:
             tasks=tasks, total=total, page=page, pages=pages
         )
 
+    async def _filter_page(
+        self,
+        conds: list[ColumnElement[bool]],
+        page: int,
+        per_page: int,
+        plan: LoadPlan,
+    ) -> tuple[int, list[Task]]:
+        total = (
+            await self._db.execute(select(func.count(Task.id)).where(*conds))
+        ).scalar_one()
+        result = await self._db.execute(
+            select(Task)
+            .options(*plan)
+            .where(*conds)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+        )
+        return total, list(result.scalars().all())
+
+    async def _load_in_order(
+        self, task_ids: list[int], plan: LoadPlan
+    ) -> list[Task]:
+        if not task_ids:
+            return []
+        result = await self._db.execute(
+            select(Task).options(*plan).where(Task.id.in_(task_ids))
+        )
+        by_id = {t.id: t for t in result.scalars().all()}
+        return [by_id[i] for i in task_ids if i in by_id]
+
+    async def _search_page(
+        self,
+        search: str,
+        conds: list[ColumnElement[bool]],
+        page: int,
+        per_page: int,
+        plan: LoadPlan,
+    ) -> tuple[int, list[Task]]:
+        found = await get_search_backend(self._db).search(
+            self._db, search, conds, (page - 1) * per_page, per_page
+        )
+        return found.total, await self._load_in_order(found.ids, plan)
+
+    async def get_cursor_page(
+        self,
+        cursor: str,
+        per_page: int,
+        task_type: int | None = None,
+        search: str | None = None,
+        filter: str | None = None,
+        is_admin: bool = False,
+        with_total: bool = False,
+    ) -> TaskCursorResponse | TaskAdminCursorResponse:
+        conds = _filter_conditions(task_type, filter)
+        plan = BASE if is_admin else TASK_PUBLIC
+        scope = _cursor_scope(task_type, search, filter)
+
+        total: int | None = None
+        if search:
+            offset = _decode_cursor(cursor, scope, "o") or 0
+            found = await get_search_backend(self._db).search(
+                self._db, search, conds, offset, per_page
+            )
+            db_tasks = await self._load_in_order(found.ids, plan)
+            next_cursor = None
+            if offset + per_page < found.total:
+                next_cursor = _encode_cursor(scope, "o", offset + per_page)
+            if with_total:
+                total = found.total
+        else:
+            db_tasks, next_cursor = await self._keyset_page(
+                conds,
+                _decode_cursor(cursor, scope, "k"),
+                per_page,
+                plan,
+                scope,
+            )
+            if with_total:
+                total = await self._approximate_total(task_type, filter)
+
+        if is_admin:
+            return TaskAdminCursorResponse(
+                tasks=[TaskAdminResponse.model_validate(t) for t in db_tasks],
+                next_cursor=next_cursor,
+                total=total,
+            )
+        return TaskCursorResponse(
+            tasks=[TaskResponse.model_validate(t) for t in db_tasks],
+            next_cursor=next_cursor,
+            total=total,
+        )
+
+    async def _keyset_page(
+        self,
+        conds: list[ColumnElement[bool]],
+        after: list[int] | None,
+        per_page: int,
+        plan: LoadPlan,
+        scope: str,
+    ) -> tuple[list[Task], str | None]:
+        q = select(Task).options(*plan).where(*conds)
+        if after is not None:
+            q = q.where(
+                tuple_(Task.task_type, Task.id)
+                > tuple_(literal(after[0]), literal(after[1]))
+            )
+
+        result = await self._db.execute(
+            q.order_by(Task.task_type, Task.id).limit(per_page + 1)
+        )
+        db_tasks = list(result.scalars().all())
+        if len(db_tasks) <= per_page:
+            return db_tasks, None
+
+        db_tasks = db_tasks[:per_page]
+        last = db_tasks[-1]
+        return db_tasks, _encode_cursor(scope, "k", [last.task_type, last.id])
+
+    async def _approximate_total(
+        self, task_type: int | None, filter: str | None
+    ) -> int:
+        key = (task_type, filter)
+        total = task_total_cache.get(key)
+        if total is None:
+            conds = _filter_conditions(task_type, filter)
+            total = (
+                await self._db.execute(
+                    select(func.count(Task.id)).where(*conds)
+                )
+            ).scalar_one()
+            task_total_cache.set(key, total)
+        return total
+
     async def update(self, task: Task, **fields: object) -> Task:
         for key, value in fields.items():
             if value is not None:
                 setattr(task, key, value)
+        await bump_catalogue_version(self._db)
         await self._db.commit()
         await self._db.refresh(task)
+        notify_task_changed(task.id, task.text)
+        task_response_cache.bump()
         return task
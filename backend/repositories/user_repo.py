@@ -1,7 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.domain.models.user import User, UserStats
+from backend.domain.models.user import User, UserStats, UserTypeStats
 
 
 class UserRepository:
@@ -64,6 +64,41 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_stats_with_types(
+        self, user_id: int
+    ) -> tuple[UserStats | None, list[tuple[int, int, int]]]:
+        """Общая статистика и разбивка по типам одним запросом."""
+        result = await self._db.execute(
+            select(
+                UserStats,
+                UserTypeStats.task_type,
+                UserTypeStats.attempts,
+                UserTypeStats.correct,
+            )
+            .outerjoin(
+                UserTypeStats, UserTypeStats.user_id == UserStats.user_id
+            )
+            .where(UserStats.user_id == user_id)
+            .order_by(UserTypeStats.task_type)
+        )
+        rows = result.tuples().all()
+        if not rows:
+            return None, []
+        by_type = [
+            (task_type, attempts, correct)
+            for _, task_type, attempts, correct in rows
+            if task_type is not None
+        ]
+        return rows[0][0], by_type
+
+    async def get_type_stats(self, user_id: int) -> list[UserTypeStats]:
+        result = await self._db.execute(
+            select(UserTypeStats)
+            .where(UserTypeStats.user_id == user_id)
+            .order_by(UserTypeStats.task_type)
+        )
+        return list(result.scalars().all())
+
     async def create_stats(self, user_id: int) -> UserStats:
         stats = UserStats(user_id=user_id)
         self._db.add(stats)
@@ -1,8 +1,8 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from backend.domain.models.variant import Variant, VariantItem
+from backend.repositories.load_plans import VARIANT_ITEMS
 
 
 class VariantRepository:
@@ -12,33 +12,21 @@ class VariantRepository:
     async def get_by_id(self, variant_id: int) -> Variant | None:
         result = await self._db.execute(
             select(Variant)
-            .options(
-                selectinload(Variant.items).selectinload(VariantItem.task),
-                selectinload(Variant.creator),
-                selectinload(Variant.school_class),
-            )
+            .options(*VARIANT_ITEMS)
             .where(Variant.id == variant_id)
         )
         return result.scalar_one_or_none()
 
     async def get_all(self) -> list[Variant]:
         result = await self._db.execute(
-            select(Variant).options(
-                selectinload(Variant.items),
-                selectinload(Variant.creator),
-                selectinload(Variant.school_class),
-            )
+            select(Variant).options(*VARIANT_ITEMS)
         )
         return list(result.scalars().all())
 
     async def get_by_creator(self, user_id: int) -> list[Variant]:
         result = await self._db.execute(
             select(Variant)
-            .options(
-                selectinload(Variant.items),
-                selectinload(Variant.creator),
-                selectinload(Variant.school_class),
-            )
+            .options(*VARIANT_ITEMS)
             .where(Variant.created_by == user_id)
         )
         return list(result.scalars().all())
@@ -46,11 +34,7 @@ class VariantRepository:
     async def get_by_class_ids(self, class_ids: list[int]) -> list[Variant]:
         result = await self._db.execute(
             select(Variant)
-            .options(
-                selectinload(Variant.items),
-                selectinload(Variant.creator),
-                selectinload(Variant.school_class),
-            )
+            .options(*VARIANT_ITEMS)
             .where(Variant.class_id.in_(class_ids))
         )
         return list(result.scalars().all())
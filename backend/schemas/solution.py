@@ -49,3 +49,12 @@ class CheckAnswerRequest(BaseModel):
 class CheckAnswerResponse(BaseModel):
     correct: bool
     correct_answer: Optional[str] = None
+
+
+class TaskProgressResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    task_id: int
+    attempts: int
+    first_attempt_at: datetime
+    solved_at: Optional[datetime] = None
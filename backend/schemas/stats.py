@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field
@@ -20,3 +20,24 @@ class TypeStatItem(BaseModel):
     attempts: int
     correct: int
     success_rate: float
+
+
+class HistoryFilter(BaseModel):
+    task_type: Optional[int] = None
+    is_correct: Optional[bool] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+
+class HistoryItem(BaseModel):
+    id: int
+    task_id: int
+    task_type: int
+    answer: Optional[str] = None
+    is_correct: Optional[bool] = None
+    created_at: datetime
+
+
+class HistoryPageResponse(BaseModel):
+    items: list[HistoryItem]
+    next_cursor: Optional[str] = None
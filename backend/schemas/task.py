@@ -53,6 +53,18 @@ class TaskAdminListResponse(BaseModel):
     pages: int
 
 
+class TaskCursorResponse(BaseModel):
+    tasks: list[TaskResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+class TaskAdminCursorResponse(BaseModel):
+    tasks: list[TaskAdminResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
 class TaskSearchQuery(BaseModel):
     search: Optional[str] = Field(None, max_length=100)
     task_type: Optional[int] = None
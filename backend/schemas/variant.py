@@ -35,3 +35,19 @@ class VariantStudentSolutionResponse(BaseModel):
     is_correct: Optional[bool] = None
     content: list[Any] = Field(default_factory=list)
     files: list[SolutionFileResponse] = Field(default_factory=list)
+
+
+class VariantClassMatrixResponse(BaseModel):
+    """Сетка ученик × задание по столбцам.
+
+    status[i][j] для student_ids[i] и task_ids[j]: 0 — не приступал,
+    1 — только неверные ответы, 2 — решено, 3 — решение без автопроверки.
+    """
+
+    variant_id: int
+    class_id: int
+    task_ids: list[int]
+    student_ids: list[int]
+    usernames: list[str]
+    status: list[list[int]]
+    attempts: list[list[int]]
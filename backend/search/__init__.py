@@ -0,0 +1,53 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import SEARCH_BACKEND
+from backend.search.backends import (
+    FulltextSearchBackend,
+    InMemorySearchBackend,
+    LikeSearchBackend,
+    SearchBackend,
+    SearchPage,
+    fulltext_backend,
+    like_backend,
+    search_index,
+)
+from backend.search.stemmer import stem, tokenize
+
+_BACKENDS: dict[str, SearchBackend] = {
+    "fulltext": fulltext_backend,
+    "memory": search_index,
+    "like": like_backend,
+}
+
+
+def get_search_backend(db: AsyncSession) -> SearchBackend:
+    if SEARCH_BACKEND in _BACKENDS:
+        return _BACKENDS[SEARCH_BACKEND]
+    if db.get_bind().dialect.name in ("mysql", "mariadb"):
+        return fulltext_backend
+    return search_index
+
+
+def notify_task_changed(task_id: int, text: str) -> None:
+    for backend in _BACKENDS.values():
+        backend.index_task(task_id, text)
+
+
+def notify_tasks_imported() -> None:
+    for backend in _BACKENDS.values():
+        backend.invalidate()
+
+
+__all__ = [
+    "FulltextSearchBackend",
+    "InMemorySearchBackend",
+    "LikeSearchBackend",
+    "SearchBackend",
+    "SearchPage",
+    "get_search_backend",
+    "notify_task_changed",
+    "notify_tasks_imported",
+    "search_index",
+    "stem",
+    "tokenize",
+]
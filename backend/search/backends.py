@@ -0,0 +1,256 @@
+import asyncio
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+import math
+import time
+from typing import Any, Protocol
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import SEARCH_REFRESH_INTERVAL
+from backend.domain.models.task import Task
+from backend.search.stemmer import tokenize
+
+# Стемы короче этого не попадают в FULLTEXT-индекс MariaDB (innodb).
+FULLTEXT_MIN_TOKEN = 3
+
+
+Conditions = Sequence[ColumnElement[bool]]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPage:
+    """ids — страница выдачи по рангу, total — все совпадения с учётом
+    фильтров."""
+
+    ids: list[int]
+    total: int
+
+
+class SearchBackend(Protocol):
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        conds: Conditions = (),
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> SearchPage: ...
+
+    def index_task(self, task_id: int, text: str) -> None: ...
+
+    def invalidate(self) -> None: ...
+
+
+async def _sql_page(
+    db: AsyncSession,
+    ranked: Select[tuple[int]],
+    offset: int,
+    limit: int | None,
+) -> SearchPage:
+    total = (
+        await db.execute(select(func.count()).select_from(ranked.subquery()))
+    ).scalar_one()
+    result = await db.execute(ranked.offset(offset).limit(limit))
+    return SearchPage(list(result.scalars().all()), total)
+
+
+class LikeSearchBackend:
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        conds: Conditions = (),
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> SearchPage:
+        ranked = (
+            select(Task.id)
+            .where(Task.text.ilike(f"%{query}%"), *conds)
+            .order_by(Task.id)
+        )
+        return await _sql_page(db, ranked, offset, limit)
+
+    def index_task(self, task_id: int, text: str) -> None:
+        pass
+
+    def invalidate(self) -> None:
+        pass
+
+
+class FulltextSearchBackend:
+    def __init__(self, fallback: SearchBackend) -> None:
+        self._fallback = fallback
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        conds: Conditions = (),
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> SearchPage:
+        terms = [t for t in tokenize(query) if len(t) >= FULLTEXT_MIN_TOKEN]
+        if not terms:
+            return await self._fallback.search(db, query, conds, offset, limit)
+
+        against = " ".join(f"+{t}*" for t in terms)
+        score = match(Task.text, against=against).in_boolean_mode()
+        ranked = (
+            select(Task.id)
+            .where(score, *conds)
+            .order_by(score.desc(), Task.id)
+        )
+        return await _sql_page(db, ranked, offset, limit)
+
+    def index_task(self, task_id: int, text: str) -> None:
+        pass
+
+    def invalidate(self) -> None:
+        pass
+
+
+class InMemorySearchBackend:
+    """Инвертированный индекс по стемам Task.text внутри процесса."""
+
+    def __init__(self, refresh_interval: float) -> None:
+        self.refresh_interval = refresh_interval
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, tuple[str, ...]] = {}
+        self._vocabulary: list[str] | None = None
+        self._marker: tuple[int, Any] | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def reset(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._vocabulary = None
+        self._marker = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        self._checked_at = 0.0
+
+    def index_task(self, task_id: int, text: str) -> None:
+        self._remove(task_id)
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[task_id] = tf
+        self._doc_terms[task_id] = tuple(counts)
+        self._vocabulary = None
+
+    def _remove(self, task_id: int) -> None:
+        for term in self._doc_terms.pop(task_id, ()):
+            docs = self._postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(task_id, None)
+            if not docs:
+                del self._postings[term]
+                self._vocabulary = None
+
+    async def warm_up(self, db: AsyncSession) -> None:
+        await self._refresh(db)
+
+    async def _rebuild(self, db: AsyncSession) -> None:
+        rows = await db.execute(select(Task.id, Task.text))
+        self.reset()
+        for task_id, text in rows.all():
+            self.index_task(task_id, text)
+
+    async def _catch_up(self, db: AsyncSession, since: Any) -> None:
+        rows = await db.execute(
+            select(Task.id, Task.text).where(Task.updated_at >= since)
+        )
+        for task_id, text in rows.all():
+            self.index_task(task_id, text)
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_interval:
+            return
+
+        async with self._lock:
+            marker_row = await db.execute(
+                select(func.count(Task.id), func.max(Task.updated_at))
+            )
+            count, latest = marker_row.one()
+            if self._marker is None:
+                await self._rebuild(db)
+            elif latest != self._marker[1]:
+                await self._catch_up(db, self._marker[1])
+            if len(self._doc_terms) != count:
+                await self._rebuild(db)
+            self._marker = (count, latest)
+            self._checked_at = now
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        terms = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            terms.append(vocabulary[i])
+            i += 1
+        return terms
+
+    def _term_scores(self, terms: list[str]) -> dict[int, float]:
+        total_docs = max(1, len(self._doc_terms))
+        scores: dict[int, float] = {}
+        for term in terms:
+            docs = self._postings.get(term, {})
+            idf = math.log(1 + total_docs / (1 + len(docs)))
+            for task_id, tf in docs.items():
+                scores[task_id] = max(scores.get(task_id, 0.0), tf * idf)
+        return scores
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        conds: Conditions = (),
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> SearchPage:
+        await self._refresh(db)
+
+        terms = tokenize(query)
+        if not terms:
+            return SearchPage([], 0)
+
+        # Последнее слово может быть недописанным: ищем его по префиксу.
+        groups = [[t] for t in terms[:-1]]
+        groups.append(self._expand_prefix(terms[-1]))
+
+        ranked = self._term_scores(groups[0])
+        for group in groups[1:]:
+            scores = self._term_scores(group)
+            ranked = {
+                task_id: score + scores[task_id]
+                for task_id, score in ranked.items()
+                if task_id in scores
+            }
+
+        # Фильтры применяются до пагинации, иначе total и страницы
+        # разошлись бы с выдачей.
+        if conds and ranked:
+            allowed = await db.execute(select(Task.id).where(*conds))
+            allowed_ids = set(allowed.scalars().all())
+            ranked = {i: v for i, v in ranked.items() if i in allowed_ids}
+
+        ordered = sorted(ranked.items(), key=lambda item: (-item[1], item[0]))
+        end = None if limit is None else offset + limit
+        return SearchPage(
+            [task_id for task_id, _ in ordered[offset:end]], len(ordered)
+        )
+
+
+like_backend = LikeSearchBackend()
+fulltext_backend = FulltextSearchBackend(fallback=like_backend)
+search_index = InMemorySearchBackend(refresh_interval=SEARCH_REFRESH_INTERVAL)
@@ -0,0 +1,52 @@
+"""Запуск API в несколько процессов uvicorn на одном порту.
+
+    python -m backend.serve --host 0.0.0.0 --port 8000 [--workers N]
+
+Без --workers и WEB_CONCURRENCY воркеров столько, сколько ядер доступно
+процессу (affinity и квота cgroup), но не больше, чем позволяет
+DB_CONNECTION_BUDGET. Процессы ничего не делят: у каждого свои кэши,
+буферы счётчиков, пулы соединений и потоков — бюджеты соединений и
+потоков делятся между воркерами. Запросы воркер
+начинает принимать после прогрева в lifespan; по SIGTERM дожидается
+текущих запросов (до GRACEFUL_TIMEOUT секунд) и сбрасывает буферы.
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from backend.core.capacity import (
+    DB_CONNECTION_BUDGET,
+    WEB_CONCURRENCY,
+    available_cpus,
+    worker_count,
+)
+
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "20"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    args = parser.parse_args()
+
+    workers = args.workers or worker_count(
+        available_cpus(), DB_CONNECTION_BUDGET
+    )
+    # Воркеры запускаются заново и по этой переменной делят бюджет
+    # соединений (см. database.py).
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "backend.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
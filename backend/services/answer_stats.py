@@ -0,0 +1,316 @@
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import (
+    CursorResult,
+    Insert,
+    Integer,
+    Table,
+    Update,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.background import PeriodicTask
+from backend.core.config import STATS_FLUSH_BATCH, STATS_FLUSH_INTERVAL_MS
+from backend.database import async_session, engine
+from backend.domain.models.solution import AnswerEvent, Solution
+from backend.domain.models.task import Task
+from backend.domain.models.user import UserStats, UserTypeStats
+
+# Счётчики задач и пользователей обновляются не в запросе /check, а
+# пачками из журнала answer_events. Применение пачки и удаление её событий
+# происходят в одной транзакции, поэтому после рестарта ничего не теряется
+# и не применяется дважды.
+
+
+@dataclass
+class _UserDelta:
+    attempts: int = 0
+    correct: int = 0
+    solved: int = 0
+    lead: int = 0
+    run: int = 0
+    best_inner: int = 0
+    has_wrong: bool = False
+    last_activity: datetime | None = None
+    by_type: dict[int, list[int]] = field(default_factory=dict)
+
+    def add(self, event: AnswerEvent) -> None:
+        self.attempts += 1
+        self.last_activity = event.created_at
+        type_stats = self.by_type.setdefault(event.task_type, [0, 0])
+        type_stats[0] += 1
+
+        if not event.is_correct:
+            self.has_wrong = True
+            self.run = 0
+            return
+
+        self.correct += 1
+        type_stats[1] += 1
+        if event.is_first_solve:
+            self.solved += 1
+        if self.has_wrong:
+            self.run += 1
+            self.best_inner = max(self.best_inner, self.run)
+        else:
+            self.lead += 1
+
+
+def _increment_upsert(dialect: str, table: Table) -> Insert:
+    """INSERT, который при конфликте ключа прибавляет attempts/correct."""
+    stmt: Any
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql_insert(table)
+        new = stmt.inserted
+        return cast(
+            Insert,
+            stmt.on_duplicate_key_update(
+                attempts=table.c.attempts + new.attempts,
+                correct=table.c.correct + new.correct,
+            ),
+        )
+
+    stmt = sqlite_insert(table)
+    new = stmt.excluded
+    return cast(
+        Insert,
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.task_type],
+            set_={
+                "attempts": table.c.attempts + new.attempts,
+                "correct": table.c.correct + new.correct,
+            },
+        ),
+    )
+
+
+async def _apply_type_deltas(
+    db: AsyncSession, deltas: dict[int, _UserDelta]
+) -> None:
+    table = cast(Table, UserTypeStats.__table__)
+    await db.execute(
+        _increment_upsert(db.get_bind().dialect.name, table),
+        [
+            {
+                "user_id": user_id,
+                "task_type": task_type,
+                "attempts": attempts,
+                "correct": correct,
+            }
+            for user_id, d in deltas.items()
+            for task_type, (attempts, correct) in d.by_type.items()
+        ],
+    )
+
+
+async def _apply_task_deltas(
+    db: AsyncSession, events: Sequence[AnswerEvent]
+) -> None:
+    deltas: dict[int, list[int]] = {}
+    for e in events:
+        delta = deltas.setdefault(e.task_id, [0, 0])
+        delta[0] += int(e.is_first_try)
+        delta[1] += int(e.is_first_solve)
+
+    # Строки задач блокируются в порядке id: два сброса не сцепятся
+    # в deadlock, даже если пойдут параллельно.
+    params = [
+        {"b_id": task_id, "b_attempts": attempts, "b_solved": solved}
+        for task_id, (attempts, solved) in sorted(deltas.items())
+        if attempts or solved
+    ]
+    if not params:
+        return
+
+    table = cast(Table, Task.__table__)
+    await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            total_attempts=table.c.total_attempts + bindparam("b_attempts"),
+            solved_count=table.c.solved_count + bindparam("b_solved"),
+        ),
+        params,
+    )
+
+
+def _user_stats_update() -> Update:
+    table = cast(Table, UserStats.__table__)
+    c = table.c
+    lead = bindparam("b_lead", type_=Integer)
+    best_inner = bindparam("b_best_inner", type_=Integer)
+    candidate = c.streak_current + lead
+    best = case((candidate > best_inner, candidate), else_=best_inner)
+    # streak_max стоит первым: MySQL вычисляет SET слева направо.
+    return (
+        update(table)
+        .where(c.user_id == bindparam("b_user_id"))
+        .ordered_values(
+            (
+                c.streak_max,
+                case((c.streak_max > best, c.streak_max), else_=best),
+            ),
+            (
+                c.streak_current,
+                case(
+                    (bindparam("b_has_wrong"), bindparam("b_run")),
+                    else_=c.streak_current + lead,
+                ),
+            ),
+            (c.total_attempts, c.total_attempts + bindparam("b_attempts")),
+            (c.correct_attempts, c.correct_attempts + bindparam("b_correct")),
+            (c.tasks_solved, c.tasks_solved + bindparam("b_solved")),
+            (c.last_activity, bindparam("b_last_activity")),
+        )
+    )
+
+
+async def _apply_user_deltas(
+    db: AsyncSession, events: Sequence[AnswerEvent]
+) -> None:
+    deltas: dict[int, _UserDelta] = {}
+    for e in events:
+        deltas.setdefault(e.user_id, _UserDelta()).add(e)
+
+    params = [
+        {
+            "b_user_id": user_id,
+            "b_lead": d.lead,
+            "b_best_inner": d.best_inner,
+            "b_has_wrong": d.has_wrong,
+            "b_run": d.run,
+            "b_attempts": d.attempts,
+            "b_correct": d.correct,
+            "b_solved": d.solved,
+            "b_last_activity": d.last_activity,
+        }
+        for user_id, d in sorted(deltas.items())
+    ]
+    stmt = _user_stats_update()
+    result = cast(CursorResult[Any], await db.execute(stmt, params))
+
+    # Строка user_stats обычно уже есть, поэтому сначала UPDATE, а
+    # недостающие строки создаются, только если он задел не всех.
+    if result.rowcount < len(params) or not (
+        db.get_bind().dialect.supports_sane_multi_rowcount
+    ):
+        existing = await db.execute(
+            select(UserStats.user_id).where(UserStats.user_id.in_(deltas))
+        )
+        missing = deltas.keys() - set(existing.scalars())
+        if missing:
+            db.add_all(
+                UserStats(user_id=user_id, stats_by_type={})
+                for user_id in missing
+            )
+            await db.flush()
+            await db.execute(
+                stmt, [p for p in params if p["b_user_id"] in missing]
+            )
+
+    await _apply_type_deltas(db, deltas)
+
+
+async def apply_answer_events(
+    db: AsyncSession, limit: int = STATS_FLUSH_BATCH
+) -> int:
+    # Без skip_locked: сброс из другого воркера ждёт, пока этот
+    # закоммитит, и берёт следующие события. С пропуском заблокированных
+    # строк два сброса брали бы вперемешку события одного пользователя, и
+    # серии правильных ответов складывались бы не в том порядке.
+    result = await db.execute(
+        select(AnswerEvent)
+        .order_by(AnswerEvent.id)
+        .limit(limit)
+        .with_for_update()
+    )
+    events = result.scalars().all()
+    if not events:
+        return 0
+
+    task_ids = {e.task_id for e in events}
+    user_ids = {e.user_id for e in events}
+    await _apply_task_deltas(db, events)
+    await _apply_user_deltas(db, events)
+    await db.execute(
+        delete(AnswerEvent).where(AnswerEvent.id.in_([e.id for e in events]))
+    )
+    await db.commit()
+
+    # UPDATE по таблице идёт мимо identity map: обновляем загруженные
+    # копии затронутых строк.
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, Task) and obj.id in task_ids:
+            await db.refresh(obj, ["total_attempts", "solved_count"])
+        elif isinstance(obj, UserStats) and obj.user_id in user_ids:
+            await db.refresh(obj)
+    return len(events)
+
+
+async def flush_answer_events() -> None:
+    async with async_session() as db:
+        while await apply_answer_events(db) == STATS_FLUSH_BATCH:
+            pass
+
+
+answer_stats_flusher = PeriodicTask(
+    "answer-stats", flush_answer_events, STATS_FLUSH_INTERVAL_MS / 1000
+)
+
+
+async def rebuild_type_stats(db: AsyncSession) -> int:
+    """Пересобирает user_type_stats из solutions; возвращает число строк."""
+    # Иначе события из журнала будут учтены второй раз при сбросе.
+    while await apply_answer_events(db) == STATS_FLUSH_BATCH:
+        pass
+
+    await db.execute(delete(UserTypeStats))
+    await db.execute(
+        insert(UserTypeStats).from_select(
+            ["user_id", "task_type", "attempts", "correct"],
+            select(
+                Solution.user_id,
+                Task.task_type,
+                func.count(Solution.id),
+                func.sum(case((Solution.is_correct.is_(True), 1), else_=0)),
+            )
+            .join(Task, Task.id == Solution.task_id)
+            .where(Solution.is_correct.is_not(None))
+            .group_by(Solution.user_id, Task.task_type),
+        )
+    )
+    await db.commit()
+    return int(
+        await db.scalar(select(func.count()).select_from(UserTypeStats)) or 0
+    )
+
+
+async def backfill_type_stats(db: AsyncSession) -> None:
+    if not await db.scalar(select(UserTypeStats.user_id).limit(1)):
+        await rebuild_type_stats(db)
+
+
+async def main() -> None:
+    try:
+        async with async_session() as db:
+            rows = await rebuild_type_stats(db)
+        print(f"user_type_stats: {rows} строк")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
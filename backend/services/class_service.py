@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 
+from backend.auth import invalidate_principal
 from backend.repositories.class_repo import ClassRepository
+from backend.repositories.load_plans import CLASS_WITH_MEMBERS
 from backend.repositories.user_repo import UserRepository
 from backend.schemas.class_ import (
     ClassAddMember,
@@ -27,15 +29,19 @@ class ClassService:
 
     async def get_list(self, user_id: int, role: str) -> list[ClassResponse]:
         if role == "admin":
-            classes = await self._classes.get_all()
+            classes = await self._classes.get_all(CLASS_WITH_MEMBERS)
         elif role == "teacher":
-            classes = await self._classes.get_for_teacher(user_id)
+            classes = await self._classes.get_for_teacher(
+                user_id, CLASS_WITH_MEMBERS
+            )
         else:
-            classes = await self._classes.get_for_user(user_id)
+            classes = await self._classes.get_for_user(
+                user_id, CLASS_WITH_MEMBERS
+            )
         return [self._to_response(c) for c in classes]
 
     async def get_one(self, class_id: int) -> ClassResponse:
-        sc = await self._classes.get_by_id(class_id)
+        sc = await self._classes.get_by_id(class_id, CLASS_WITH_MEMBERS)
         if not sc:
             raise HTTPException(404, "Класс не найден")
         return self._to_response(sc)
@@ -58,6 +64,7 @@ class ClassService:
         member = await self._classes.add_member(
             class_id, data.user_id, data.role
         )
+        invalidate_principal(data.user_id)
         return ClassMemberResponse(
             id=member.id,
             user_id=user.id,
@@ -71,12 +78,15 @@ class ClassService:
         if not member:
             raise HTTPException(404, "Участник не найден")
         await self._classes.remove_member(member)
+        invalidate_principal(user_id)
 
     async def delete(self, class_id: int) -> None:
-        sc = await self._classes.get_by_id(class_id)
+        sc = await self._classes.get_by_id(class_id, CLASS_WITH_MEMBERS)
         if not sc:
             raise HTTPException(404, "Класс не найден")
+        member_ids = [m.user_id for m in sc.members]
         await self._classes.delete(sc)
+        invalidate_principal(*member_ids)
 
     def _to_response(self, sc) -> ClassResponse:
         members = [
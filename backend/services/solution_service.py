@@ -2,10 +2,22 @@ from datetime import datetime, timezone
 import os
 import uuid
 
+import aiofiles
+import aiofiles.os
+import aiofiles.tempfile
 from fastapi import HTTPException, UploadFile
 
-from backend.core.config import UPLOAD_DIR
-from backend.image_utils import compress_image
+from backend.core.config import (
+    IMAGE_MAX_QUEUE,
+    IMAGE_WORKERS,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_DIR,
+)
+from backend.core.metrics import answer_checks
+from backend.core.workers import BoundedExecutor
+from backend.domain.models.solution import AnswerEvent
+from backend.image_utils import MAX_FILE_SIZE_MB, compress_image_file
+from backend.repositories.load_plans import SOLUTION_FILES, SOLUTION_RESPONSE
 from backend.repositories.solution_repo import SolutionRepository
 from backend.repositories.task_repo import TaskRepository
 from backend.repositories.user_repo import UserRepository
@@ -14,9 +26,34 @@ from backend.schemas.solution import (
     SolutionCreate,
     SolutionFileResponse,
     SolutionResponse,
+    TaskProgressResponse,
+)
+from backend.services.answer_stats import (
+    answer_stats_flusher,
+    apply_answer_events,
+)
+
+image_executor = BoundedExecutor(
+    "images", IMAGE_WORKERS, IMAGE_MAX_QUEUE, use_processes=True
 )
 
 
+async def _spool_upload(file: UploadFile) -> str:
+    max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    size = 0
+    async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False) as tmp:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(413, "Файл слишком большой")
+                await tmp.write(chunk)
+        except BaseException:
+            await aiofiles.os.remove(str(tmp.name))
+            raise
+    return str(tmp.name)
+
+
 class SolutionService:
     def __init__(
         self,
@@ -36,47 +73,6 @@ class SolutionService:
             == expected.strip().replace(",", ".").lower()
         )
 
-    async def _update_task_stats(
-        self, task, correct: bool, is_first_try: bool, has_solved_before: bool
-    ) -> None:
-        if is_first_try:
-            task.total_attempts += 1
-
-        if correct and not has_solved_before:
-            task.solved_count += 1
-
-    async def _update_user_stats(
-        self,
-        user_id: int,
-        correct: bool,
-        has_solved_before: bool,
-        task_type: int,
-    ) -> None:
-        stats = await self._users.get_stats(user_id)
-        if not stats:
-            stats = await self._users.create_stats(user_id)
-
-        stats.total_attempts += 1
-        stats.last_activity = datetime.now(timezone.utc)
-
-        if correct:
-            stats.correct_attempts += 1
-            stats.streak_current += 1
-            if stats.streak_current > stats.streak_max:
-                stats.streak_max = stats.streak_current
-            if not has_solved_before:
-                stats.tasks_solved += 1
-        else:
-            stats.streak_current = 0
-
-        type_key = str(task_type)
-        by_type = dict(stats.stats_by_type) if stats.stats_by_type else {}
-        by_type.setdefault(type_key, {"attempts": 0, "correct": 0})
-        by_type[type_key]["attempts"] += 1
-        if correct:
-            by_type[type_key]["correct"] += 1
-        stats.stats_by_type = by_type
-
     async def check_answer(
         self, task_id: int, answer: str, user_id: int
     ) -> CheckAnswerResponse:
@@ -85,33 +81,35 @@ class SolutionService:
             raise HTTPException(404, "Задание не найдено")
 
         correct = self._is_answer_correct(task.answer, answer)
-
-        existing_solutions = await self._solutions.get_user_task_solutions(
-            user_id, task_id
+        answer_checks.inc(
+            str(task.task_type), "correct" if correct else "wrong"
         )
-        is_first_try = len(existing_solutions) == 0
-        has_solved_before = any(s.is_correct for s in existing_solutions)
 
-        # Выполняем обновления статистики в сессии
-        await self._update_task_stats(
-            task, correct, is_first_try, has_solved_before
+        is_first_try, is_first_solve = await self._solutions.record_attempt(
+            user_id, task_id, correct
         )
-        await self._update_user_stats(
-            user_id, correct, has_solved_before, task.task_type
+        self._tasks._db.add(
+            AnswerEvent(
+                user_id=user_id,
+                task_id=task_id,
+                task_type=task.task_type,
+                is_correct=correct,
+                is_first_try=is_first_try,
+                is_first_solve=is_first_solve,
+            )
         )
-
-        # Создаем решение (без финального коммита)
         await self._solutions.create(
             user_id=user_id, task_id=task_id, answer=answer, is_correct=correct
         )
 
-        # ДЕЛАЕМ ЕДИНСТВЕННЫЙ COMMIT ДЛЯ ВСЕХ ОПЕРАЦИЙ
-        await self._tasks._db.commit()
-
-        return CheckAnswerResponse(
+        response = CheckAnswerResponse(
             correct=correct,
             correct_answer=task.answer if not correct else None,
         )
+        # Без фонового агрегатора (тесты, скрипты) применяем журнал сразу.
+        if not answer_stats_flusher.running:
+            await apply_answer_events(self._tasks._db)
+        return response
 
     async def upsert(
         self, data: SolutionCreate, user_id: int
@@ -121,7 +119,7 @@ class SolutionService:
             raise HTTPException(404, "Задание не найдено")
 
         existing = await self._solutions.get_latest_for_user_task(
-            user_id, data.task_id
+            user_id, data.task_id, plan=SOLUTION_RESPONSE
         )
         if existing:
             existing.content = data.content
@@ -129,24 +127,34 @@ class SolutionService:
             existing.updated_at = datetime.now(timezone.utc)
             solution = await self._solutions.save(existing)
         else:
+            await self._solutions.record_upload(user_id, data.task_id)
             solution = await self._solutions.create(
                 user_id=user_id,
                 task_id=data.task_id,
                 content=data.content,
                 answer=data.answer,
             )
+            await self._solutions.load(solution, SOLUTION_RESPONSE)
         return self._to_response(solution)
 
     async def get_my_solutions(
         self, user_id: int, task_id: int
     ) -> list[SolutionResponse]:
         solutions = await self._solutions.get_user_task_solutions(
-            user_id, task_id
+            user_id, task_id, plan=SOLUTION_RESPONSE
         )
         return [self._to_response(s) for s in solutions]
 
+    async def get_progress(
+        self, user_id: int, task_ids: list[int]
+    ) -> list[TaskProgressResponse]:
+        progress = await self._solutions.get_progress(user_id, task_ids)
+        return [TaskProgressResponse.model_validate(p) for p in progress]
+
     async def get_all_for_task(self, task_id: int) -> list[SolutionResponse]:
-        solutions = await self._solutions.get_all_for_task(task_id)
+        solutions = await self._solutions.get_all_for_task(
+            task_id, plan=SOLUTION_RESPONSE
+        )
         return [self._to_response(s) for s in solutions]
 
     async def upload_file(
@@ -156,22 +164,21 @@ class SolutionService:
         if not solution or solution.user_id != user_id:
             raise HTTPException(404, "Решение не найдено")
 
-        raw_bytes = await file.read()
         original_name = file.filename or "upload.jpg"
-
+        tmp_path = await _spool_upload(file)
         try:
-            compressed_bytes, compressed_name = compress_image(
-                raw_bytes, original_name
+            filepath = await image_executor.run(
+                compress_image_file,
+                tmp_path,
+                os.path.join(UPLOAD_DIR, str(uuid.uuid4())),
+                original_name,
             )
         except ValueError as e:
             raise HTTPException(413, str(e))
+        finally:
+            await aiofiles.os.remove(tmp_path)
 
-        ext = os.path.splitext(compressed_name)[1]
-        unique_name = f"{uuid.uuid4()}{ext}"
-        filepath = os.path.join(UPLOAD_DIR, unique_name)
-
-        with open(filepath, "wb") as f:
-            f.write(compressed_bytes)
+        unique_name = os.path.basename(filepath)
 
         sf = await self._solutions.add_file(
             solution_id=solution_id,
@@ -210,7 +217,9 @@ class SolutionService:
         )
 
     async def delete(self, solution_id: int, user_id: int) -> None:
-        solution = await self._solutions.get_by_id(solution_id)
+        solution = await self._solutions.get_by_id(
+            solution_id, plan=SOLUTION_FILES
+        )
         if not solution:
             raise HTTPException(404, "Решение не найдено")
         if solution.user_id != user_id:
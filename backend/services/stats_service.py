@@ -1,16 +1,51 @@
-from sqlalchemy import select
+import base64
+from collections.abc import AsyncIterator
+from datetime import datetime
+import json
 
-from backend.domain.models.solution import Solution
+from fastapi import HTTPException
+
+from backend.core.config import HISTORY_EXPORT_BATCH
+from backend.repositories.solution_repo import SolutionRepository
 from backend.repositories.user_repo import UserRepository
-from backend.schemas.stats import TypeStatItem, UserStatsResponse
+from backend.schemas.stats import (
+    HistoryFilter,
+    HistoryItem,
+    HistoryPageResponse,
+    TypeStatItem,
+    UserStatsResponse,
+)
+
+HISTORY_LIMIT = 50
+
+
+def _encode_cursor(created_at: datetime, solution_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), solution_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, solution_id = json.loads(raw)
+        if not isinstance(solution_id, int):
+            raise ValueError
+        return datetime.fromisoformat(created_at), solution_id
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Некорректный курсор")
 
 
 class StatsService:
-    def __init__(self, user_repo: UserRepository) -> None:
+    def __init__(
+        self, user_repo: UserRepository, solution_repo: SolutionRepository
+    ) -> None:
         self._users = user_repo
+        self._solutions = solution_repo
 
     async def get_user_stats(self, user_id: int) -> UserStatsResponse:
-        stats = await self._users.get_stats(user_id)
+        stats, by_type = await self._users.get_stats_with_types(user_id)
         if not stats:
             return UserStatsResponse()
 
@@ -28,45 +63,62 @@ class StatsService:
             streak_current=stats.streak_current,
             streak_max=stats.streak_max,
             last_activity=stats.last_activity,
-            stats_by_type=stats.stats_by_type or {},
+            stats_by_type={
+                str(task_type): {"attempts": attempts, "correct": correct}
+                for task_type, attempts, correct in by_type
+            },
         )
 
     async def get_type_stats(self, user_id: int) -> list[TypeStatItem]:
-        stats = await self._users.get_stats(user_id)
-        if not stats or not stats.stats_by_type:
-            return []
-
-        items: list[TypeStatItem] = []
-        for key, val in stats.stats_by_type.items():
-            attempts = val.get("attempts", 0)
-            correct = val.get("correct", 0)
-            success_rate = (
-                round(correct / attempts * 100, 1) if attempts > 0 else 0.0
-            )
-            items.append(
-                TypeStatItem(
-                    task_type=int(key),
-                    attempts=attempts,
-                    correct=correct,
-                    success_rate=success_rate,
-                )
-            )
-        return sorted(items, key=lambda x: x.task_type)
-
-    async def get_history(self, user_id: int) -> list[dict]:
-        result = await self._users._db.execute(
-            select(Solution)
-            .where(Solution.user_id == user_id)
-            .order_by(Solution.created_at.desc())
-            .limit(50)
-        )
         return [
-            {
-                "id": s.id,
-                "task_id": s.task_id,
-                "answer": s.answer,
-                "is_correct": s.is_correct,
-                "created_at": s.created_at.isoformat(),
-            }
-            for s in result.scalars().all()
+            TypeStatItem(
+                task_type=row.task_type,
+                attempts=row.attempts,
+                correct=row.correct,
+                success_rate=(
+                    round(row.correct / row.attempts * 100, 1)
+                    if row.attempts > 0
+                    else 0.0
+                ),
+            )
+            for row in await self._users.get_type_stats(user_id)
         ]
+
+    async def get_history(
+        self,
+        user_id: int,
+        filters: HistoryFilter,
+        limit: int = HISTORY_LIMIT,
+    ) -> list[HistoryItem]:
+        rows = await self._solutions.get_history_page(user_id, filters, limit)
+        return [HistoryItem.model_validate(dict(r)) for r in rows]
+
+    async def get_history_page(
+        self, user_id: int, filters: HistoryFilter, cursor: str, limit: int
+    ) -> HistoryPageResponse:
+        rows = await self._solutions.get_history_page(
+            user_id, filters, limit + 1, _decode_cursor(cursor)
+        )
+        items = [HistoryItem.model_validate(dict(r)) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = _encode_cursor(last.created_at, last.id)
+        return HistoryPageResponse(items=items, next_cursor=next_cursor)
+
+    async def export_history(
+        self, user_id: int, filters: HistoryFilter
+    ) -> AsyncIterator[bytes]:
+        """NDJSON: по строке на ответ, отдаётся пачками."""
+        lines: list[bytes] = []
+        async for row in self._solutions.stream_history(user_id, filters):
+            lines.append(
+                HistoryItem.model_validate(dict(row))
+                .model_dump_json()
+                .encode()
+            )
+            if len(lines) >= HISTORY_EXPORT_BATCH:
+                yield b"\n".join(lines) + b"\n"
+                lines.clear()
+        if lines:
+            yield b"\n".join(lines) + b"\n"
@@ -6,6 +6,7 @@ from backend.repositories.variant_repo import VariantRepository
 from backend.schemas.solution import SolutionFileResponse
 from backend.schemas.task import TaskResponse
 from backend.schemas.variant import (
+    VariantClassMatrixResponse,
     VariantCreate,
     VariantResponse,
     VariantStudentSolutionResponse,
@@ -105,7 +106,7 @@ class VariantService:
                         filepath=f.filepath,
                         file_type=f.file_type,
                     )
-                    for f in (solution.files or [])
+                    for f in solution.files
                 ]
                 responses.append(
                     VariantStudentSolutionResponse(
@@ -113,7 +114,7 @@ class VariantService:
                         task_type=task.task_type,
                         answer=solution.answer,
                         is_correct=solution.is_correct,
-                        content=solution.content or [],
+                        content=solution.content,
                         files=files,
                     )
                 )
@@ -125,6 +126,48 @@ class VariantService:
                 )
         return responses
 
+    async def get_class_matrix(
+        self, variant_id: int, class_id: int
+    ) -> VariantClassMatrixResponse:
+        variant = await self._variants.get_by_id(variant_id)
+        if not variant:
+            raise HTTPException(404, "Вариант не найден")
+
+        task_ids = [item.task_id for item in variant.items]
+        column = {task_id: j for j, task_id in enumerate(task_ids)}
+        rows = await self._solutions.get_class_matrix(class_id, task_ids)
+
+        student_ids: list[int] = []
+        usernames: list[str] = []
+        status: list[list[int]] = []
+        attempts: list[list[int]] = []
+        for user_id, username, task_id, count, correct, unchecked in rows:
+            if not student_ids or student_ids[-1] != user_id:
+                student_ids.append(user_id)
+                usernames.append(username)
+                status.append([0] * len(task_ids))
+                attempts.append([0] * len(task_ids))
+            if task_id is None:
+                continue
+            j = column[task_id]
+            attempts[-1][j] = count
+            if correct:
+                status[-1][j] = 2
+            elif count > unchecked:
+                status[-1][j] = 1
+            else:
+                status[-1][j] = 3
+
+        return VariantClassMatrixResponse(
+            variant_id=variant_id,
+            class_id=class_id,
+            task_ids=task_ids,
+            student_ids=student_ids,
+            usernames=usernames,
+            status=status,
+            attempts=attempts,
+        )
+
     async def delete(self, variant_id: int) -> None:
         variant = await self._variants.get_by_id(variant_id)
         if not variant:
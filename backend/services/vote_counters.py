@@ -0,0 +1,150 @@
+import logging
+from typing import Any, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    Integer,
+    ScalarSelect,
+    Table,
+    bindparam,
+    case,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.background import PeriodicTask
+from backend.core.config import VOTE_FLUSH_INTERVAL_MS
+from backend.database import async_session
+from backend.domain.models.task import Task, TaskVote
+from backend.repositories.task_repo import (
+    bump_catalogue_version,
+    task_response_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Голоса пишутся в task_votes сразу, а счётчики tasks.likes/dislikes
+# обновляются пачкой: приращения копятся в памяти процесса. Если процесс
+# упадёт до сброса, счётчики поправит сверка с task_votes при следующем
+# запуске (python -m backend.migrate). В работающих воркерах сверка
+# не идёт: голоса из чужих буферов она посчитала бы дважды.
+
+
+class VoteBuffer:
+    """Несброшенные приращения likes/dislikes по заданиям."""
+
+    def __init__(self) -> None:
+        self._deltas: dict[int, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def add(self, task_id: int, likes: int, dislikes: int) -> None:
+        old_likes, old_dislikes = self._deltas.get(task_id, (0, 0))
+        self._deltas[task_id] = (old_likes + likes, old_dislikes + dislikes)
+
+    def pending(self, task_id: int) -> tuple[int, int]:
+        return self._deltas.get(task_id, (0, 0))
+
+    def task_ids(self) -> list[int]:
+        return list(self._deltas)
+
+    def drain(self) -> dict[int, tuple[int, int]]:
+        deltas, self._deltas = self._deltas, {}
+        return deltas
+
+    def restore(self, deltas: dict[int, tuple[int, int]]) -> None:
+        for task_id, (likes, dislikes) in deltas.items():
+            self.add(task_id, likes, dislikes)
+
+
+vote_buffer = VoteBuffer()
+
+
+def _clamped(column: ColumnElement[int], delta: str) -> ColumnElement[int]:
+    value = column + bindparam(delta, type_=Integer)
+    return case((value < 0, 0), else_=value)
+
+
+async def apply_vote_deltas(db: AsyncSession) -> int:
+    deltas = {k: v for k, v in vote_buffer.drain().items() if any(v)}
+    if not deltas:
+        return 0
+
+    table = cast(Table, Task.__table__)
+    try:
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                likes=_clamped(table.c.likes, "b_likes"),
+                dislikes=_clamped(table.c.dislikes, "b_dislikes"),
+            ),
+            [
+                {"b_id": task_id, "b_likes": likes, "b_dislikes": dislikes}
+                for task_id, (likes, dislikes) in deltas.items()
+            ],
+        )
+        await db.commit()
+    except Exception:
+        vote_buffer.restore(deltas)
+        raise
+    # Меняются только счётчики этих заданий: списки обновятся по TTL.
+    for task_id in deltas:
+        task_response_cache.discard(("task", task_id))
+
+    # UPDATE по таблице идёт мимо identity map: обновляем загруженные копии.
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, Task) and obj.id in deltas:
+            await db.refresh(obj, ["likes", "dislikes"])
+    return len(deltas)
+
+
+async def flush_vote_deltas() -> None:
+    if vote_buffer:
+        async with async_session() as db:
+            await apply_vote_deltas(db)
+
+
+async def reconcile_vote_counts(db: AsyncSession) -> int:
+    """Пересчитывает likes/dislikes из task_votes; возвращает число
+    исправленных заданий. Задания с несброшенными приращениями этого
+    процесса пропускаются."""
+    await apply_vote_deltas(db)
+    pending = vote_buffer.task_ids()
+
+    def counted(vote_type: str) -> ScalarSelect[int]:
+        return (
+            select(func.count(TaskVote.id))
+            .where(
+                TaskVote.task_id == Task.id, TaskVote.vote_type == vote_type
+            )
+            .scalar_subquery()
+        )
+
+    likes, dislikes = counted("like"), counted("dislike")
+    stmt = (
+        update(Task)
+        .where(or_(Task.likes != likes, Task.dislikes != dislikes))
+        .values(likes=likes, dislikes=dislikes)
+        .execution_options(synchronize_session=False)
+    )
+    if pending:
+        stmt = stmt.where(Task.id.not_in(pending))
+    result = cast(CursorResult[Any], await db.execute(stmt))
+    fixed = result.rowcount
+    if fixed:
+        await bump_catalogue_version(db)
+    await db.commit()
+    if fixed:
+        logger.warning("Сверка голосов исправила %d заданий", fixed)
+    return fixed
+
+
+vote_flusher = PeriodicTask(
+    "vote-counters", flush_vote_deltas, VOTE_FLUSH_INTERVAL_MS / 1000
+)
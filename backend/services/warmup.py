@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.auth import password_hasher
+from backend.database import POOL_SIZE, async_session, engine
+from backend.domain.models.task import Task
+from backend.repositories.task_repo import task_total_cache
+from backend.search import get_search_backend, search_index
+from backend.services.solution_service import image_executor
+
+logger = logging.getLogger(__name__)
+
+# uvicorn принимает соединения воркера только после startup в lifespan,
+# поэтому всё, что здесь прогрето, первые запросы уже не ждут.
+
+
+async def open_connections(db_engine: AsyncEngine, count: int) -> None:
+    """Открывает count соединений пула заранее."""
+
+    async def ping() -> None:
+        async with db_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(count)))
+
+
+async def warm_task_totals(db: AsyncSession) -> None:
+    """Счётчики каталога для всех типов одним запросом."""
+    rows = await db.execute(
+        select(Task.task_type, func.count(Task.id)).group_by(Task.task_type)
+    )
+    counts = dict(rows.tuples().all())
+    task_total_cache.set((None, None), sum(counts.values()))
+    for task_type, count in counts.items():
+        task_total_cache.set((task_type, None), count)
+
+
+async def warm_up() -> None:
+    started = time.perf_counter()
+    await open_connections(engine, POOL_SIZE)
+    async with async_session() as db:
+        await warm_task_totals(db)
+        if get_search_backend(db) is search_index:
+            await search_index.warm_up(db)
+    await password_hasher.warm_up()
+    await image_executor.warm_up()
+    logger.info("Прогрев воркера: %.2f с", time.perf_counter() - started)
@@ -0,0 +1,6 @@
+import os
+
+# Пакет импортируется раньше conftest и backend.core.config: лимиты тестов
+# считаются в памяти процесса, а не в общем файле в /dev/shm, который
+# читает и локально запущенный сервер.
+os.environ["RATE_LIMIT_STORAGE"] = "sqlite://"
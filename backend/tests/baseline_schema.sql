@@ -0,0 +1,149 @@
+-- Схема SQLite, которую create_all строил до перехода на миграции.
+-- Не менять: по ней проверяется пометка ревизией 0001.
+
+CREATE TABLE tasks (
+	id INTEGER NOT NULL,
+	fipi_id VARCHAR(20),
+	guid VARCHAR(64),
+	task_type INTEGER NOT NULL,
+	text TEXT NOT NULL,
+	hint VARCHAR(200),
+	answer VARCHAR(100),
+	images JSON NOT NULL,
+	inline_images JSON NOT NULL,
+	tables JSON NOT NULL,
+	likes INTEGER DEFAULT '0' NOT NULL,
+	dislikes INTEGER DEFAULT '0' NOT NULL,
+	total_attempts INTEGER DEFAULT '0' NOT NULL,
+	solved_count INTEGER DEFAULT '0' NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_tasks_fipi_id ON tasks (fipi_id);
+
+CREATE INDEX ix_tasks_task_type ON tasks (task_type);
+
+CREATE TABLE users (
+	id INTEGER NOT NULL,
+	username VARCHAR(50) NOT NULL,
+	email VARCHAR(100) NOT NULL,
+	hashed_password VARCHAR(255) NOT NULL,
+	role VARCHAR(20) NOT NULL,
+	token_version INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+
+CREATE UNIQUE INDEX ix_users_username ON users (username);
+
+CREATE TABLE school_classes (
+	id INTEGER NOT NULL,
+	name VARCHAR(100) NOT NULL,
+	description TEXT,
+	created_by INTEGER NOT NULL,
+	created_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(created_by) REFERENCES users (id)
+);
+
+CREATE TABLE solutions (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	task_id INTEGER NOT NULL,
+	answer VARCHAR(255),
+	is_correct BOOLEAN,
+	content JSON NOT NULL,
+	created_at DATETIME NOT NULL,
+	updated_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(task_id) REFERENCES tasks (id)
+);
+
+CREATE INDEX ix_solutions_user_id ON solutions (user_id);
+
+CREATE INDEX ix_solutions_task_id ON solutions (task_id);
+
+CREATE TABLE task_votes (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	task_id INTEGER NOT NULL,
+	vote_type VARCHAR(10) NOT NULL,
+	PRIMARY KEY (id),
+	CONSTRAINT uq_task_vote_user_task UNIQUE (user_id, task_id),
+	FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE,
+	FOREIGN KEY(task_id) REFERENCES tasks (id) ON DELETE CASCADE
+);
+
+CREATE INDEX ix_task_votes_task_id ON task_votes (task_id);
+
+CREATE INDEX ix_task_votes_user_id ON task_votes (user_id);
+
+CREATE TABLE user_stats (
+	id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	total_attempts INTEGER NOT NULL,
+	correct_attempts INTEGER NOT NULL,
+	tasks_solved INTEGER NOT NULL,
+	streak_current INTEGER NOT NULL,
+	streak_max INTEGER NOT NULL,
+	last_activity DATETIME,
+	stats_by_type JSON NOT NULL,
+	PRIMARY KEY (id),
+	UNIQUE (user_id),
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE class_members (
+	id INTEGER NOT NULL,
+	class_id INTEGER NOT NULL,
+	user_id INTEGER NOT NULL,
+	role VARCHAR(20) NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(class_id) REFERENCES school_classes (id) ON DELETE CASCADE,
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE solution_files (
+	id INTEGER NOT NULL,
+	solution_id INTEGER NOT NULL,
+	filename VARCHAR(255) NOT NULL,
+	filepath VARCHAR(500) NOT NULL,
+	file_type VARCHAR(50),
+	created_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(solution_id) REFERENCES solutions (id)
+);
+
+CREATE INDEX ix_solution_files_solution_id ON solution_files (solution_id);
+
+CREATE TABLE variants (
+	id INTEGER NOT NULL,
+	title VARCHAR(200) NOT NULL,
+	description TEXT,
+	created_by INTEGER NOT NULL,
+	class_id INTEGER,
+	is_public BOOLEAN NOT NULL,
+	created_at DATETIME NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(created_by) REFERENCES users (id),
+	FOREIGN KEY(class_id) REFERENCES school_classes (id)
+);
+
+CREATE TABLE variant_items (
+	id INTEGER NOT NULL,
+	variant_id INTEGER NOT NULL,
+	task_id INTEGER NOT NULL,
+	position INTEGER NOT NULL,
+	PRIMARY KEY (id),
+	FOREIGN KEY(variant_id) REFERENCES variants (id) ON DELETE CASCADE,
+	FOREIGN KEY(task_id) REFERENCES tasks (id)
+);
+
+CREATE INDEX ix_variant_items_variant_id ON variant_items (variant_id);
+
+CREATE INDEX ix_variant_items_task_id ON variant_items (task_id);
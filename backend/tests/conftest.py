@@ -14,15 +14,23 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from backend.api.routers.auth import limiter
-from backend.auth import create_access_token, hash_password
+from backend.auth import create_access_token, hash_password, principal_cache
+from backend.core.instrumentation import query_budget
+from backend.core.ratelimit import limiter
 from backend.database import Base, get_db
 from backend.domain.models import Task, User, UserStats
 from backend.main import app
+from backend.repositories.task_repo import (
+    task_response_cache,
+    task_total_cache,
+)
+from backend.search import search_index
 
 fake = Faker("ru_RU")
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Запрос, выполнивший больше SQL-запросов, роняет тест.
+QUERY_BUDGET = 15
 
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 TestSession = async_sessionmaker(
@@ -154,3 +162,22 @@ def auth_headers(token: str) -> dict[str, str]:
 def reset_rate_limiter():
     """Сбрасывает счетчики slowapi перед каждым тестом."""
     limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """Id пользователей переиспользуются между тестами после rollback."""
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_search_index():
+    search_index.reset()
+    task_total_cache.clear()
+    task_response_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(monkeypatch):
+    monkeypatch.setattr(query_budget, "limit", QUERY_BUDGET)
+    monkeypatch.setattr(query_budget, "strict", True)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.core.instrumentation import track_queries
+from backend.domain.models.solution import AnswerEvent, Solution
+from backend.domain.models.user import UserStats, UserTypeStats
+from backend.services.answer_stats import (
+    apply_answer_events,
+    rebuild_type_stats,
+)
+from backend.tests.conftest import _make_user, make_task
+
+pytestmark = pytest.mark.asyncio
+
+
+def _event(user, task, correct, first_try=False, first_solve=False):
+    return AnswerEvent(
+        user_id=user.id,
+        task_id=task.id,
+        task_type=task.task_type,
+        is_correct=correct,
+        is_first_try=first_try,
+        is_first_solve=first_solve,
+    )
+
+
+async def _stats(db, user_id):
+    result = await db.execute(
+        select(UserStats).where(UserStats.user_id == user_id)
+    )
+    return result.scalar_one()
+
+
+async def _type_stats(db, user_id):
+    result = await db.execute(
+        select(
+            UserTypeStats.task_type,
+            UserTypeStats.attempts,
+            UserTypeStats.correct,
+        ).where(UserTypeStats.user_id == user_id)
+    )
+    return {t: (a, c) for t, a, c in result.tuples()}
+
+
+class TestApplyAnswerEvents:
+    async def test_batch_streak_matches_sequential(self, db_session):
+        user, _ = await _make_user(db_session)
+        stats = await _stats(db_session, user.id)
+        stats.streak_current, stats.streak_max = 2, 3
+        task = await make_task(db_session)
+        db_session.add_all(
+            [
+                _event(user, task, True),
+                _event(user, task, True),
+                _event(user, task, False),
+                _event(user, task, True),
+            ]
+        )
+        await db_session.flush()
+
+        assert await apply_answer_events(db_session) == 4
+
+        stats = await _stats(db_session, user.id)
+        assert stats.streak_max == 4
+        assert stats.streak_current == 1
+        assert stats.total_attempts == 4
+        assert stats.correct_attempts == 3
+        assert await _type_stats(db_session, user.id) == {
+            task.task_type: (4, 3)
+        }
+
+    async def test_unbroken_batch_extends_streak(self, db_session):
+        user, _ = await _make_user(db_session)
+        stats = await _stats(db_session, user.id)
+        stats.streak_current, stats.streak_max = 5, 5
+        task = await make_task(db_session)
+        db_session.add_all([_event(user, task, True) for _ in range(3)])
+        await db_session.flush()
+
+        await apply_answer_events(db_session)
+
+        stats = await _stats(db_session, user.id)
+        assert (stats.streak_current, stats.streak_max) == (8, 8)
+
+    async def test_task_counters_and_log_consumed(self, db_session):
+        first, _ = await _make_user(db_session)
+        second, _ = await _make_user(db_session)
+        task = await make_task(db_session)
+        db_session.add_all(
+            [
+                _event(first, task, False, first_try=True),
+                _event(first, task, True, first_solve=True),
+                _event(second, task, True, first_try=True, first_solve=True),
+            ]
+        )
+        await db_session.flush()
+
+        await apply_answer_events(db_session)
+
+        await db_session.refresh(task)
+        assert task.total_attempts == 2
+        assert task.solved_count == 2
+        left = await db_session.scalar(select(func.count(AnswerEvent.id)))
+        assert left == 0
+        assert await apply_answer_events(db_session) == 0
+
+    async def test_refreshes_only_rows_in_batch(self, db_session):
+        user, _ = await _make_user(db_session)
+        task = await make_task(db_session)
+        # Ссылки держим: identity map хранит объекты слабо.
+        others = [await make_task(db_session) for _ in range(3)]
+        db_session.add(_event(user, task, True, first_try=True))
+        await db_session.flush()
+
+        with track_queries() as stats:
+            await apply_answer_events(db_session)
+
+        selects = sum(
+            n
+            for sql, n in stats.fingerprints.items()
+            if sql.startswith("SELECT")
+        )
+        # Выборка событий и по одной строке на задачу и пользователя из
+        # пачки; остальные задачи в сессии не перечитываются.
+        assert selects <= 3
+        assert task.total_attempts == 1
+        assert all(t.total_attempts == 0 for t in others)
+
+    async def test_creates_missing_user_stats(self, db_session):
+        user, _ = await _make_user(db_session)
+        await db_session.delete(await _stats(db_session, user.id))
+        task = await make_task(db_session)
+        db_session.add(_event(user, task, True, first_solve=True))
+        await db_session.flush()
+
+        await apply_answer_events(db_session)
+
+        stats = await _stats(db_session, user.id)
+        assert stats.tasks_solved == 1
+        assert stats.streak_current == 1
+
+
+class TestTypeStats:
+    async def test_batches_increment_existing_rows(self, db_session):
+        user, _ = await _make_user(db_session)
+        task = await make_task(db_session, task_type=5)
+        db_session.add(_event(user, task, True))
+        await db_session.flush()
+        await apply_answer_events(db_session)
+
+        db_session.add_all([_event(user, task, False) for _ in range(2)])
+        await db_session.flush()
+        await apply_answer_events(db_session)
+
+        assert await _type_stats(db_session, user.id) == {5: (3, 1)}
+
+    async def test_rebuild_from_solutions(self, db_session):
+        user, _ = await _make_user(db_session)
+        task = await make_task(db_session, task_type=8)
+        db_session.add_all(
+            [
+                Solution(user_id=user.id, task_id=task.id, is_correct=False),
+                Solution(user_id=user.id, task_id=task.id, is_correct=True),
+                Solution(user_id=user.id, task_id=task.id, content=[]),
+            ]
+        )
+        db_session.add(UserTypeStats(user_id=user.id, task_type=8))
+        await db_session.flush()
+
+        assert await rebuild_type_stats(db_session) >= 1
+        assert await _type_stats(db_session, user.id) == {8: (2, 1)}
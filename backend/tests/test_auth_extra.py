@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
+from fastapi import HTTPException
 import jwt
 import pytest
 
-from backend.auth import ALGORITHM, SECRET_KEY, create_access_token
+from backend.auth import (
+    ALGORITHM,
+    SECRET_KEY,
+    PasswordHasher,
+    create_access_token,
+)
 from backend.tests.conftest import auth_headers, fake
 
 pytestmark = pytest.mark.asyncio
@@ -105,3 +112,30 @@ class TestTokenFormat:
         token = jwt.encode(payload, "wrong-secret", algorithm=ALGORITHM)
         resp = await client.get("/api/auth/me", headers=auth_headers(token))
         assert resp.status_code == 401
+
+
+class TestPasswordHasher:
+    async def test_hash_and_verify_roundtrip(self):
+        hasher = PasswordHasher("bcrypt", workers=2, max_queue=4)
+        try:
+            hashed = await hasher.hash("secretpass")
+            assert await hasher.verify("secretpass", hashed)
+            assert not await hasher.verify("wrongpass", hashed)
+            assert hasher.stats()["completed"] == 3
+        finally:
+            hasher.shutdown()
+
+    async def test_rejects_when_queue_full(self):
+        hasher = PasswordHasher("bcrypt", workers=1, max_queue=1)
+        try:
+            results = await asyncio.gather(
+                *(hasher.hash("secretpass") for _ in range(4)),
+                return_exceptions=True,
+            )
+            rejected = [r for r in results if isinstance(r, HTTPException)]
+            assert rejected
+            assert all(r.status_code == 503 for r in rejected)
+            assert hasher.stats()["rejected"] == len(rejected)
+            assert hasher.stats()["in_flight"] == 0
+        finally:
+            hasher.shutdown()
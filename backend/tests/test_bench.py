@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.bench.explain import full_scans, run_explain
+from backend.bench.load import compare, load_context, percentile, run_load
+from backend.bench.seed import SeedConfig, seed
+
+
+class TestReport:
+    def test_nearest_rank_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0
+
+    def test_compare_flags_only_regressions(self):
+        base = {
+            "scenarios": {
+                "tasks": {"p95_ms": 10, "p99_ms": 20, "rps": 100},
+                "check": {"p95_ms": 10, "p99_ms": 20, "rps": 100},
+            }
+        }
+        current = {
+            "scenarios": {
+                "tasks": {"p95_ms": 10.5, "p99_ms": 21, "rps": 98},
+                "check": {"p95_ms": 15, "p99_ms": 20, "rps": 70},
+            }
+        }
+        assert compare(base, current, threshold=10) == [
+            "check.p95_ms: 10 -> 15",
+            "check.rps: 100 -> 70",
+        ]
+
+
+class TestFullScans:
+    def test_sqlite_plan(self):
+        plan = [
+            {"detail": "SCAN tasks"},
+            {"detail": "SCAN anon_1"},
+            {"detail": "SCAN class_members USING COVERING INDEX ix_x"},
+            {"detail": "SEARCH solutions USING INDEX ix_y (user_id=?)"},
+        ]
+        assert full_scans("sqlite", plan) == ["tasks"]
+
+    def test_mysql_plan_respects_min_rows(self):
+        plan = [
+            {"table": "tasks", "type": "ALL", "rows": 30000},
+            {"table": "users", "type": "ALL", "rows": 12},
+            {"table": "solutions", "type": "ref", "rows": 40},
+        ]
+        assert full_scans("mysql", plan, min_rows=1000) == ["tasks"]
+
+
+_SMALL = SeedConfig(
+    tasks=50,
+    users=20,
+    solutions=200,
+    classes=3,
+    class_size=5,
+    variants=4,
+    variant_size=5,
+    teacher_share=0.1,
+    batch_size=64,
+)
+
+
+@pytest.mark.asyncio
+class TestExplain:
+    async def test_hot_lookups_use_indexes(self, db_session):
+        await seed(db_session, _SMALL)
+        items = await run_explain(db_session)
+        assert items and all(item.plan for item in items)
+
+        scanned = {table for item in items for table in item.full_scans}
+        assert scanned <= {"tasks"}
+
+
+@pytest.mark.asyncio
+class TestSmokeRun:
+    async def test_seed_and_drive_hot_endpoints(self, client, db_session):
+        summary = await seed(db_session, _SMALL)
+        assert summary.tasks == 50
+        assert summary.solutions > 0
+
+        ctx = await load_context(db_session, users=10)
+        report = await run_load(
+            client,
+            ctx,
+            ["tasks", "check", "variants", "profile_stats"],
+            concurrency=1,
+            duration=None,
+            requests=40,
+        )
+        assert report["total"]["count"] == 40
+        assert report["total"]["errors"] == 0
+        assert report["total"]["p99_ms"] >= report["total"]["p50_ms"]
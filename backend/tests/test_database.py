@@ -1,12 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+from pathlib import Path
+import sqlite3
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from backend.database import Base
+from backend.migrate import (
+    SchemaOutdated,
+    check_schema,
+    head_revision,
+    schema_state,
+    upgrade,
+)
 
 pytestmark = pytest.mark.asyncio
 
+BASELINE_SCHEMA = Path(__file__).with_name("baseline_schema.sql")
+
+
+async def _model_diff(url: str) -> list:
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        diff = await conn.run_sync(
+            lambda c: compare_metadata(
+                MigrationContext.configure(c), Base.metadata
+            )
+        )
+    await engine.dispose()
+    return diff
+
 
 class TestMigrations:
     async def test_create_all_on_clean_db(self):
@@ -23,6 +50,45 @@ class TestMigrations:
             await conn.run_sync(Base.metadata.create_all)
         await engine.dispose()
 
+    async def test_upgrade_matches_models(self, tmp_path):
+        url = f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}"
+        await asyncio.to_thread(upgrade, url)
+
+        engine = create_async_engine(url)
+        await check_schema(engine)
+        await engine.dispose()
+        assert await _model_diff(url) == []
+
+    async def test_baseline_db_is_upgraded_to_models(self, tmp_path):
+        path = tmp_path / "baseline.db"
+        with sqlite3.connect(path) as conn:
+            conn.executescript(BASELINE_SCHEMA.read_text())
+        url = f"sqlite+aiosqlite:///{path}"
+
+        await asyncio.to_thread(upgrade, url)
+
+        engine = create_async_engine(url)
+        assert await schema_state(engine) == (head_revision(), False)
+        await engine.dispose()
+        assert await _model_diff(url) == []
+
+    async def test_create_all_db_is_stamped_and_upgraded(self, tmp_path):
+        url = f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}"
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        assert await schema_state(engine) == (None, True)
+
+        await asyncio.to_thread(upgrade, url)
+        assert await schema_state(engine) == (head_revision(), False)
+        await engine.dispose()
+
+    async def test_check_schema_rejects_unmigrated_db(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        with pytest.raises(SchemaOutdated):
+            await check_schema(engine)
+        await engine.dispose()
+
 
 class TestDatabaseSession:
     async def test_session_closes_properly(self):
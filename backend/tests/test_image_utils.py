@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import io
+import os
 
 from PIL import Image
 import pytest
@@ -10,6 +11,7 @@ from backend.image_utils import (
     MAX_HEIGHT,
     MAX_WIDTH,
     compress_image,
+    compress_image_file,
 )
 
 
@@ -60,3 +62,13 @@ class TestImageUtils:
         raw = b"\xff\xd8\xff\x00" + b"\x00" * 100
         result, name = compress_image(raw, "broken.jpg")
         assert result == raw
+
+    def test_compress_image_file_writes_result(self, tmp_path):
+        raw, name = self._make_image("PNG", (3000, 100), mode="RGB")
+        src = tmp_path / "upload.tmp"
+        src.write_bytes(raw)
+
+        dst = compress_image_file(str(src), str(tmp_path / "out"), name)
+        assert os.path.basename(dst) == "out.png"
+        img = Image.open(dst)
+        assert img.width <= MAX_WIDTH
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.core.instrumentation import (
+    QueryBudgetExceeded,
+    fingerprint,
+    query_budget,
+    track_queries,
+)
+from backend.tests.conftest import _make_user, auth_headers, make_task
+
+
+class TestFingerprint:
+    def test_literals_and_in_lists_collapse(self):
+        a = fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 'a'")
+        b = fingerprint("SELECT *  FROM t\nWHERE id IN (?) AND x = 'bb'")
+        assert a == b
+
+
+@pytest.mark.asyncio
+class TestQueryStats:
+    async def test_server_timing_header(self, client):
+        resp = await client.get("/api/tasks")
+        assert resp.headers["server-timing"].startswith("db;dur=")
+
+    async def test_strict_mode_fails_over_budget(
+        self, client, db_session, monkeypatch
+    ):
+        await make_task(db_session)
+        monkeypatch.setattr(query_budget, "limit", 1)
+        with pytest.raises(QueryBudgetExceeded):
+            await client.get("/api/tasks")
+
+    async def _count(self, client, url, token):
+        with track_queries() as stats:
+            resp = await client.get(url, headers=auth_headers(token))
+        assert resp.status_code == 200
+        return stats.count
+
+    async def test_variant_list_has_no_n_plus_one(
+        self, client, admin, db_session
+    ):
+        _, token = admin
+        task = await make_task(db_session)
+
+        async def add_variant():
+            await client.post(
+                "/api/variants",
+                json={"title": "Вариант", "task_ids": [task.id]},
+                headers=auth_headers(token),
+            )
+
+        await add_variant()
+        one = await self._count(client, "/api/variants", token)
+        for _ in range(4):
+            await add_variant()
+        assert await self._count(client, "/api/variants", token) == one
+
+    async def test_class_list_has_no_n_plus_one(
+        self, client, admin, db_session
+    ):
+        _, token = admin
+
+        async def add_class():
+            resp = await client.post(
+                "/api/classes",
+                json={"name": "10А"},
+                headers=auth_headers(token),
+            )
+            student, _ = await _make_user(db_session)
+            await client.post(
+                f"/api/classes/{resp.json()['id']}/members",
+                json={"user_id": student.id, "role": "student"},
+                headers=auth_headers(token),
+            )
+
+        await add_class()
+        one = await self._count(client, "/api/classes", token)
+        for _ in range(4):
+            await add_class()
+        assert await self._count(client, "/api/classes", token) == one
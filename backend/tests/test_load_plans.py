@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from backend.repositories.load_plans import SOLUTION_RESPONSE, TASK_PUBLIC
+from backend.repositories.solution_repo import SolutionRepository
+from backend.repositories.task_repo import TaskRepository
+from backend.tests.conftest import auth_headers, make_task
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestLoadPlans:
+    async def test_task_relationships_are_not_loaded(self, db_session):
+        task = await make_task(db_session)
+        loaded = await TaskRepository(db_session).get_by_id(
+            task.id, plan=TASK_PUBLIC
+        )
+        assert loaded is not None
+        with pytest.raises(InvalidRequestError):
+            _ = loaded.solutions
+
+    async def test_solution_response_plan(self, client, student, db_session):
+        user, token = student
+        task = await make_task(db_session)
+        resp = await client.post(
+            "/api/solutions",
+            json={"task_id": task.id, "answer": "4"},
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 200
+        assert resp.json()["username"] == user.username
+
+        solutions = await SolutionRepository(
+            db_session
+        ).get_user_task_solutions(user.id, task.id, plan=SOLUTION_RESPONSE)
+        assert solutions[0].files == []
+        assert solutions[0].user.username == user.username
+
+    async def test_class_members_loaded(self, client, admin, student):
+        _, token = admin
+        stud, _ = student
+        resp = await client.post(
+            "/api/classes",
+            json={"name": "10А"},
+            headers=auth_headers(token),
+        )
+        class_id = resp.json()["id"]
+        await client.post(
+            f"/api/classes/{class_id}/members",
+            json={"user_id": stud.id},
+            headers=auth_headers(token),
+        )
+
+        resp = await client.get(
+            f"/api/classes/{class_id}", headers=auth_headers(token)
+        )
+        assert resp.status_code == 200
+        assert resp.json()["members"][0]["username"] == stud.username
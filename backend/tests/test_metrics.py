@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.api.routers import metrics as metrics_router
+from backend.core.metrics import (
+    Counter,
+    Histogram,
+    Metric,
+    Registry,
+    WorkerSnapshots,
+    answer_checks,
+)
+from backend.tests.conftest import auth_headers, make_task
+
+
+class TestExposition:
+    def test_counter_labels_escaped(self):
+        counter = Counter("c_total", "Тест", labels=("name",))
+        counter.inc('a"b')
+        assert 'c_total{name="a\\"b"} 1' in counter.render()
+
+    def test_histogram_buckets_cumulative(self):
+        hist = Histogram("h_seconds", "Тест", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value)
+        lines = hist.render().splitlines()
+        assert 'h_seconds_bucket{le="0.1"} 2' in lines
+        assert 'h_seconds_bucket{le="1"} 3' in lines
+        assert 'h_seconds_bucket{le="+Inf"} 4' in lines
+        assert "h_seconds_count 4" in lines
+
+    def test_metric_requires_samples(self):
+        with pytest.raises(TypeError):
+            Metric("m", "Тест")  # type: ignore[abstract]
+
+
+class TestWorkerSnapshots:
+    def test_merges_live_workers_with_label(self, tmp_path):
+        reg = Registry()
+        reg.register(Counter("c_total", "Тест", labels=("name",))).inc("a")
+        reg.register(Counter("plain_total", "Тест")).inc()
+        other = os.getppid()
+        (tmp_path / f"{other}.json").write_text(
+            json.dumps({"c_total": ['c_total{name="a"} 5']})
+        )
+        dead = subprocess.Popen([sys.executable, "-c", ""])
+        dead.wait()
+        stale = tmp_path / f"{dead.pid}.json"
+        stale.write_text(json.dumps({"c_total": ['c_total{name="a"} 9']}))
+
+        body = reg.render(WorkerSnapshots(str(tmp_path)).collect(reg))
+        lines = body.splitlines()
+        pid = os.getpid()
+        assert lines.count("# TYPE c_total counter") == 1
+        assert f'c_total{{name="a",worker="{pid}"}} 1' in lines
+        assert f'c_total{{name="a",worker="{other}"}} 5' in lines
+        assert f'plain_total{{worker="{pid}"}} 1' in lines
+        assert f'worker="{dead.pid}"' not in body
+        assert not stale.exists()
+
+    def test_write_and_remove(self, tmp_path):
+        reg = Registry()
+        reg.register(Counter("c_total", "Тест")).inc()
+        snapshots = WorkerSnapshots(str(tmp_path / "m"))
+        snapshots.write(reg)
+        path = tmp_path / "m" / f"{os.getpid()}.json"
+        assert json.loads(path.read_text()) == {"c_total": ["c_total 1"]}
+        snapshots.remove()
+        assert not path.exists()
+
+
+@pytest.mark.asyncio
+class TestMetricsEndpoint:
+    async def test_exports_route_templates(self, client, db_session):
+        task = await make_task(db_session)
+        await client.get(f"/api/tasks/{task.id}")
+
+        resp = await client.get("/api/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        body = resp.text
+        assert 'route="/api/tasks/{task_id}"' in body
+        assert "db_pool_connections" in body
+        assert 'executor_tasks{pool="bcrypt",state="workers"}' in body
+
+    async def test_counts_answer_checks(self, client, student, db_session):
+        _, token = student
+        task = await make_task(db_session, task_type=6, answer="4")
+        before = answer_checks.value("6", "wrong")
+
+        await client.post(
+            "/api/solutions/check",
+            json={"task_id": task.id, "answer": "5"},
+            headers=auth_headers(token),
+        )
+        assert answer_checks.value("6", "wrong") == before + 1
+
+    async def test_token_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(metrics_router, "METRICS_TOKEN", "s3cret")
+        assert (await client.get("/api/metrics")).status_code == 401
+        resp = await client.get(
+            "/api/metrics", headers={"Authorization": "Bearer s3cret"}
+        )
+        assert resp.status_code == 200
+
+    async def test_worker_label_with_several_workers(
+        self, client, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(metrics_router, "MULTI_WORKER", True)
+        monkeypatch.setattr(
+            metrics_router, "worker_snapshots", WorkerSnapshots(str(tmp_path))
+        )
+        body = (await client.get("/api/metrics")).text
+        assert f'worker="{os.getpid()}"' in body
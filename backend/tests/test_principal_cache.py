@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from backend.auth import create_access_token, principal_cache
+from backend.core.cache import TTLCache
+from backend.tests.conftest import _make_user, auth_headers, make_task
+
+
+class TestTTLCache:
+    def test_lru_eviction(self):
+        cache = TTLCache[int, str](maxsize=2, ttl=60)
+        cache.set(1, "a")
+        cache.set(2, "b")
+        cache.get(1)
+        cache.set(3, "c")
+        assert cache.get(1) == "a"
+        assert cache.get(2) is None
+        assert len(cache) == 2
+
+    def test_expired_entry_dropped(self, monkeypatch):
+        cache = TTLCache[int, str](maxsize=10, ttl=1)
+        cache.set(1, "a")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+class TestPrincipalCache:
+    async def test_principal_cached_after_request(self, client, student):
+        user, token = student
+        resp = await client.get("/api/auth/me", headers=auth_headers(token))
+        assert resp.status_code == 200
+        assert resp.json()["username"] == user.username
+
+        cached = principal_cache.get(user.id)
+        assert cached is not None
+        assert cached.role == "student"
+
+    async def test_set_role_invalidates(self, client, admin, db_session):
+        _, admin_token = admin
+        user, token = await _make_user(db_session, role="student")
+
+        resp = await client.get(
+            "/api/teacher/variants", headers=auth_headers(token)
+        )
+        assert resp.status_code == 403
+
+        await client.put(
+            f"/api/admin/users/{user.id}/role",
+            params={"role": "teacher"},
+            headers=auth_headers(admin_token),
+        )
+
+        resp = await client.get(
+            "/api/teacher/variants", headers=auth_headers(token)
+        )
+        assert resp.status_code == 200
+
+    async def test_membership_change_invalidates(
+        self, client, admin, student, db_session
+    ):
+        _, admin_token = admin
+        stud, stud_token = student
+        task = await make_task(db_session)
+
+        class_resp = await client.post(
+            "/api/classes",
+            json={"name": "11Б"},
+            headers=auth_headers(admin_token),
+        )
+        class_id = class_resp.json()["id"]
+        await client.post(
+            "/api/variants",
+            json={
+                "title": "Классный",
+                "task_ids": [task.id],
+                "class_id": class_id,
+            },
+            headers=auth_headers(admin_token),
+        )
+
+        resp = await client.get(
+            "/api/variants", headers=auth_headers(stud_token)
+        )
+        assert resp.json() == []
+
+        await client.post(
+            f"/api/classes/{class_id}/members",
+            json={"user_id": stud.id},
+            headers=auth_headers(admin_token),
+        )
+
+        resp = await client.get(
+            "/api/variants", headers=auth_headers(stud_token)
+        )
+        assert [v["title"] for v in resp.json()] == ["Классный"]
+
+    async def test_password_change_revokes_old_tokens(self, client, student):
+        _, token = student
+        resp = await client.post(
+            "/api/profile/change-password",
+            json={"old_password": "TestPass123", "new_password": "NewPass456"},
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 200
+        new_token = resp.cookies.get("access_token")
+        assert new_token
+
+        resp = await client.get("/api/auth/me", headers=auth_headers(token))
+        assert resp.status_code == 401
+        resp = await client.get(
+            "/api/auth/me", headers=auth_headers(new_token)
+        )
+        assert resp.status_code == 200
+
+    async def test_newer_token_reloads_stale_principal(
+        self, client, student, db_session
+    ):
+        user, token = student
+        await client.get("/api/auth/me", headers=auth_headers(token))
+        assert principal_cache.get(user.id).token_version == 0
+
+        # Пароль сменили через другой воркер: кэш здесь не сброшен.
+        user.token_version = 1
+        await db_session.flush()
+        new_token = create_access_token({"sub": user.id, "ver": 1})
+
+        resp = await client.get(
+            "/api/auth/me", headers=auth_headers(new_token)
+        )
+        assert resp.status_code == 200
+        resp = await client.get("/api/auth/me", headers=auth_headers(token))
+        assert resp.status_code == 401
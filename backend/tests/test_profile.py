@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+import json
+
 import pytest
 
+from backend.domain.models.solution import Solution
 from backend.tests.conftest import auth_headers, make_task
 
 pytestmark = pytest.mark.asyncio
@@ -114,6 +118,83 @@ class TestMyHistory:
         assert resp.status_code == 401
 
 
+async def _seed_history(db, user, count):
+    even = await make_task(db, task_type=2)
+    odd = await make_task(db, task_type=9)
+    start = datetime(2024, 3, 1, 12, 0)
+    db.add_all(
+        Solution(
+            user_id=user.id,
+            task_id=(even if i % 2 == 0 else odd).id,
+            answer=str(i),
+            is_correct=i % 3 == 0,
+            # Пары с одинаковым временем проверяют сортировку по id.
+            created_at=start + timedelta(days=i // 2),
+        )
+        for i in range(count)
+    )
+    await db.flush()
+
+
+class TestHistoryPagination:
+    async def test_keyset_pages_cover_history(
+        self, client, student, db_session
+    ):
+        user, token = student
+        await _seed_history(db_session, user, 7)
+        headers = auth_headers(token)
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            resp = await client.get(
+                "/api/profile/history",
+                params={"cursor": cursor, "per_page": 3},
+                headers=headers,
+            )
+            assert resp.status_code == 200
+            page = resp.json()
+            seen.extend(item["answer"] for item in page["items"])
+            cursor = page["next_cursor"]
+        assert seen == [str(i) for i in (6, 5, 4, 3, 2, 1, 0)]
+
+    async def test_filters(self, client, student, db_session):
+        user, token = student
+        await _seed_history(db_session, user, 7)
+        resp = await client.get(
+            "/api/profile/history",
+            params={
+                "task_type": 2,
+                "is_correct": "true",
+                "date_to": "2024-03-02",
+            },
+            headers=auth_headers(token),
+        )
+        assert [item["answer"] for item in resp.json()] == ["0"]
+
+    async def test_ndjson_export(self, client, teacher, student, db_session):
+        user, _ = student
+        _, token = teacher
+        await _seed_history(db_session, user, 5)
+        resp = await client.get(
+            f"/api/profile/user/{user.id}/history",
+            params={"format": "ndjson"},
+            headers=auth_headers(token),
+        )
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["answer"] for line in lines] == ["4", "3", "2", "1", "0"]
+        assert lines[0]["task_type"] == 2
+
+    async def test_invalid_cursor(self, client, student):
+        _, token = student
+        resp = await client.get(
+            "/api/profile/history",
+            params={"cursor": "not-a-cursor"},
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 400
+
+
 class TestUserProfile:
     async def test_get_user_profile(self, client, student):
         user, _ = student
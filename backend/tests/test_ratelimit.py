@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from backend.core.config import RATE_LIMIT_CHECK
+from backend.core.ratelimit import SQLiteStorage, client_ip
+from backend.tests.conftest import auth_headers, make_task
+
+
+def _request(peer: str, headers: dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "client": (peer, 50000),
+            "headers": [
+                (k.lower().encode(), v.encode()) for k, v in headers.items()
+            ],
+        }
+    )
+
+
+class TestClientIp:
+    def test_real_ip_from_trusted_proxy(self):
+        request = _request("172.18.0.1", {"X-Real-IP": "203.0.113.7"})
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_forwarded_for_skips_trusted_hops(self):
+        request = _request(
+            "127.0.0.1",
+            {"X-Forwarded-For": "10.0.0.5, 203.0.113.7, 172.18.0.1"},
+        )
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_headers_ignored_from_untrusted_peer(self):
+        request = _request("198.51.100.2", {"X-Real-IP": "203.0.113.7"})
+        assert client_ip(request) == "198.51.100.2"
+
+
+class TestSQLiteStorage:
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return SQLiteStorage(f"sqlite:///{tmp_path}/limits.db")
+
+    def test_incr_and_expiry(self, storage):
+        assert storage.incr("k", 60) == 1
+        assert storage.incr("k", 60, amount=2) == 3
+        assert storage.get("k") == 3
+        assert storage.get_expiry("k") > time.time() + 50
+        storage.clear("k")
+        assert storage.get("k") == 0
+
+    def test_expired_counter_restarts(self, storage):
+        storage.incr("k", 0.01)
+        time.sleep(0.02)
+        assert storage.get("k") == 0
+        assert storage.incr("k", 60) == 1
+
+    def test_sliding_window_limit(self, storage):
+        for _ in range(3):
+            assert storage.acquire_sliding_window_entry("k", 3, 60)
+        assert not storage.acquire_sliding_window_entry("k", 3, 60)
+        _, _, current, _ = storage.get_sliding_window("k", 60)
+        assert current == 3
+
+    def test_locked_file_fails_open(self, storage, tmp_path):
+        storage.incr("k", 60)
+        other = sqlite3.connect(tmp_path / "limits.db", isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        started = time.perf_counter()
+        try:
+            for _ in range(3):
+                assert storage.acquire_sliding_window_entry("k", 1, 60)
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+        assert time.perf_counter() - started < 0.5
+
+    def test_counters_shared_between_instances(self, storage, tmp_path):
+        other = SQLiteStorage(f"sqlite:///{tmp_path}/limits.db")
+        assert storage.acquire_sliding_window_entry("k", 1, 60)
+        assert not other.acquire_sliding_window_entry("k", 1, 60)
+        assert other.reset() == 1
+
+
+@pytest.mark.asyncio
+class TestEndpointLimits:
+    async def test_check_limited_per_user(
+        self, client, student, teacher, db_session, monkeypatch
+    ):
+        # Середина минуты: все запросы попадают в одно окно, иначе
+        # на границе прошлое окно учитывается с весом меньше единицы.
+        frozen = time.time() // 60 * 60 + 30
+        monkeypatch.setattr(
+            "backend.core.ratelimit.time", SimpleNamespace(time=lambda: frozen)
+        )
+        task = await make_task(db_session, answer="1")
+        limit = int(RATE_LIMIT_CHECK.split("/")[0])
+        body = {"task_id": task.id, "answer": "2"}
+        _, token = student
+        for _ in range(limit):
+            resp = await client.post(
+                "/api/solutions/check", json=body, headers=auth_headers(token)
+            )
+            assert resp.status_code == 200
+
+        resp = await client.post(
+            "/api/solutions/check", json=body, headers=auth_headers(token)
+        )
+        assert resp.status_code == 429
+
+        _, other_token = teacher
+        resp = await client.post(
+            "/api/solutions/check",
+            json=body,
+            headers=auth_headers(other_token),
+        )
+        assert resp.status_code == 200
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.domain.models.task import Task
+from backend.search import LikeSearchBackend, search_index, stem, tokenize
+from backend.tests.conftest import auth_headers, make_task
+
+
+class TestStemmer:
+    def test_word_forms_share_stem(self):
+        assert stem("уравнение") == stem("уравнения") == stem("уравнениями")
+        assert stem("вероятность") == stem("вероятности")
+
+    def test_tokenize_strips_markup(self):
+        assert tokenize("<p>Найдите значение</p>") == ["найд", "значен"]
+
+
+@pytest.mark.asyncio
+class TestInMemorySearch:
+    async def test_matches_other_word_forms(self, client, db_session):
+        await make_task(db_session, text="Решите квадратные уравнения")
+        resp = await client.get(
+            "/api/tasks", params={"search": "квадратное уравнение"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["total"] == 1
+
+    async def test_last_word_matches_prefix(self, client, db_session):
+        await make_task(db_session, text="Найдите площадь трапеции")
+        resp = await client.get("/api/tasks", params={"search": "трапец"})
+        assert resp.json()["total"] == 1
+
+    async def test_ranked_by_term_frequency(self, db_session):
+        once = await make_task(db_session, text="Синус угла и косинус")
+        twice = await make_task(
+            db_session, text="Синус угла равен синусу другого угла"
+        )
+        found = await search_index.search(db_session, "синус")
+        assert found.ids[:2] == [twice.id, once.id]
+
+    async def test_admin_update_reindexes(self, client, admin, db_session):
+        _, token = admin
+        task = await make_task(db_session, text="Старый текст")
+        await client.get("/api/tasks", params={"search": "старый"})
+
+        await client.put(
+            f"/api/admin/tasks/{task.id}",
+            json={"text": "Новая формулировка"},
+            headers=auth_headers(token),
+        )
+
+        resp = await client.get("/api/tasks", params={"search": "старый"})
+        assert resp.json()["total"] == 0
+        resp = await client.get(
+            "/api/tasks", params={"search": "формулировки"}
+        )
+        assert resp.json()["total"] == 1
+
+    async def test_search_respects_filters(self, client, db_session):
+        await make_task(db_session, task_type=3, text="Логарифм числа")
+        await make_task(db_session, task_type=4, text="Логарифм суммы")
+        resp = await client.get(
+            "/api/tasks", params={"search": "логарифм", "task_type": 4}
+        )
+        data = resp.json()
+        assert data["total"] == 1
+        assert data["tasks"][0]["task_type"] == 4
+
+    @pytest.mark.parametrize(
+        "backend", [search_index, LikeSearchBackend()], ids=["memory", "like"]
+    )
+    async def test_filter_applied_before_paging(self, backend, db_session):
+        for i in range(20):
+            await make_task(
+                db_session, task_type=1 + i % 2, text=f"Найдите число {i}"
+            )
+
+        found = await backend.search(
+            db_session, "число", [Task.task_type == 2], offset=6, limit=3
+        )
+        assert found.total == 10
+        assert len(found.ids) == 3
+
+    async def test_filtered_search_pages(self, client, db_session):
+        for i in range(20):
+            await make_task(
+                db_session, task_type=1 + i % 2, text=f"Найдите число {i}"
+            )
+        resp = await client.get(
+            "/api/tasks",
+            params={"search": "число", "task_type": 2, "per_page": 3},
+        )
+        data = resp.json()
+        assert data["total"] == 10
+        assert data["pages"] == 4
+        assert all(t["task_type"] == 2 for t in data["tasks"])
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.core.capacity import (
+    available_cpus,
+    executor_workers,
+    pool_limits,
+    worker_count,
+)
+from backend.core.workers import BoundedExecutor
+from backend.repositories.task_repo import task_total_cache
+from backend.services.warmup import open_connections, warm_task_totals
+from backend.tests.conftest import make_task
+
+
+class TestCapacity:
+    def test_workers_follow_cpus_within_budget(self):
+        assert worker_count(cpus=4, budget=120) == 4
+        assert worker_count(cpus=32, budget=120) == 12
+        assert worker_count(cpus=8, budget=5) == 1
+
+    def test_pools_fit_budget(self):
+        for workers in (1, 2, 4, 12):
+            pool_size, overflow = pool_limits(workers, budget=120)
+            assert pool_size >= 1
+            assert workers * (pool_size + overflow) <= 120
+
+    def test_single_worker_keeps_old_pool(self):
+        assert pool_limits(1, budget=120) == (25, 50)
+
+    def test_cpus_capped_by_cgroup_quota(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "os.sched_getaffinity", lambda pid: set(range(8)), raising=False
+        )
+        assert available_cpus(str(tmp_path)) == 8
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert available_cpus(str(tmp_path)) == 8
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        assert available_cpus(str(tmp_path)) == 2
+
+    def test_executors_split_between_workers(self):
+        assert executor_workers(8, workers=1, cap=4) == 4
+        assert executor_workers(8, workers=4, cap=4) == 2
+        assert executor_workers(8, workers=16, cap=4) == 1
+
+
+@pytest.mark.asyncio
+class TestWarmUp:
+    async def test_task_totals_are_cached(self, db_session):
+        await make_task(db_session, task_type=3)
+        await make_task(db_session, task_type=3)
+        await make_task(db_session, task_type=7)
+
+        await warm_task_totals(db_session)
+        assert task_total_cache.get((3, None)) == 2
+        assert task_total_cache.get((7, None)) == 1
+        assert task_total_cache.get((None, None)) == 3
+
+    async def test_open_connections_fills_pool(self, tmp_path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=AsyncAdaptedQueuePool,
+        )
+        await open_connections(engine, 3)
+        assert engine.pool.checkedin() == 3
+        await engine.dispose()
+
+    async def test_executor_warm_up_starts_workers(self):
+        executor = BoundedExecutor("warm", workers=2, max_queue=4)
+        await executor.warm_up()
+        assert executor._executor is not None
+        executor.shutdown()
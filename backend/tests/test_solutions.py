@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import io
 
 from PIL import Image
 import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from backend.tests.conftest import auth_headers, make_task
+from backend.database import Base
+from backend.domain.models.solution import Solution
+from backend.image_utils import MAX_FILE_SIZE_MB
+from backend.repositories.solution_repo import SolutionRepository
+from backend.tests.conftest import _make_user, auth_headers, make_task
 
 pytestmark = pytest.mark.asyncio
 
@@ -111,6 +117,29 @@ class TestFileUpload:
         )
         assert resp.status_code == 200
 
+    async def test_upload_too_large(self, client, student, db_session):
+        _, token = student
+        task = await make_task(db_session)
+        sol_resp = await client.post(
+            "/api/solutions",
+            json={"task_id": task.id},
+            headers=auth_headers(token),
+        )
+        sol_id = sol_resp.json()["id"]
+
+        resp = await client.post(
+            f"/api/solutions/upload/{sol_id}",
+            files={
+                "file": (
+                    "huge.jpg",
+                    b"\x00" * (MAX_FILE_SIZE_MB * 1024 * 1024 + 1),
+                    "image/jpeg",
+                )
+            },
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 413
+
 
 class TestStats:
     async def test_correct_answer_increments_stats(
@@ -183,3 +212,93 @@ class TestStats:
             "/api/profile/stats", headers=auth_headers(token)
         )
         assert resp2.json()["tasks_solved"] == solved_after_first
+
+
+class TestTaskProgress:
+    async def test_progress_tracks_attempts(self, client, student, db_session):
+        _, token = student
+        task = await make_task(db_session, answer="7")
+        other = await make_task(db_session, answer="1")
+        for answer in ("3", "7", "7"):
+            await client.post(
+                "/api/solutions/check",
+                json={"task_id": task.id, "answer": answer},
+                headers=auth_headers(token),
+            )
+
+        resp = await client.get(
+            "/api/solutions/progress",
+            params={"task_ids": [task.id, other.id]},
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 200
+        progress = resp.json()
+        assert len(progress) == 1
+        assert progress[0]["task_id"] == task.id
+        assert progress[0]["attempts"] == 3
+        assert progress[0]["solved_at"] is not None
+
+        await db_session.refresh(task)
+        assert task.total_attempts == 1
+        assert task.solved_count == 1
+
+    async def test_saved_solution_makes_check_not_first_try(
+        self, client, student, db_session
+    ):
+        _, token = student
+        task = await make_task(db_session, answer="7")
+        await client.post(
+            "/api/solutions",
+            json={"task_id": task.id, "content": []},
+            headers=auth_headers(token),
+        )
+        await client.post(
+            "/api/solutions/check",
+            json={"task_id": task.id, "answer": "7"},
+            headers=auth_headers(token),
+        )
+
+        await db_session.refresh(task)
+        assert task.total_attempts == 0
+        assert task.solved_count == 1
+
+    async def test_concurrent_first_attempts(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/p.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def attempt() -> tuple[bool, bool]:
+            async with sessions() as db:
+                result = await SolutionRepository(db).record_attempt(
+                    1, 1, correct=True
+                )
+                await db.commit()
+                return result
+
+        results = await asyncio.gather(attempt(), attempt())
+        async with sessions() as db:
+            [progress] = await SolutionRepository(db).get_progress(1, [1])
+        await engine.dispose()
+
+        assert sorted(results) == [(False, False), (True, True)]
+        assert progress.attempts == 2
+
+    async def test_backfill_from_existing_solutions(self, db_session):
+        user, _ = await _make_user(db_session)
+        task = await make_task(db_session)
+        db_session.add_all(
+            [
+                Solution(user_id=user.id, task_id=task.id, is_correct=False),
+                Solution(user_id=user.id, task_id=task.id, is_correct=True),
+                Solution(user_id=user.id, task_id=task.id, content=[]),
+            ]
+        )
+        await db_session.flush()
+
+        repo = SolutionRepository(db_session)
+        await repo.backfill_progress()
+
+        [progress] = await repo.get_progress(user.id, [task.id])
+        assert progress.attempts == 3
+        assert progress.solved_at is not None
@@ -4,15 +4,34 @@ import json
 import tempfile
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from backend.domain.models import Task
-from backend.import_json import import_tasks
+from backend.core.cache import ResponseCache
+from backend.core.instrumentation import track_queries
+from backend.domain.models import CatalogueVersion, ImportManifest, Task
+from backend.import_json import (
+    import_if_changed,
+    import_tasks,
+    iter_json_array,
+)
+from backend.migrate import head_revision
+from backend.repositories.task_repo import (
+    bump_catalogue_version,
+    task_response_cache,
+)
 from backend.tests.conftest import auth_headers, make_task
 
 pytestmark = pytest.mark.asyncio
 
 
+def _write_json(data: list[dict]) -> str:
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".json", delete=False, encoding="utf-8"
+    ) as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+        return f.name
+
+
 class TestImportJSON:
     async def test_import_tasks_from_json(self, db_session):
         sample = [
@@ -55,6 +74,8 @@ class TestImportJSON:
         assert task.task_type == 5
         assert task.answer == "42"
         assert task.guid == "abc-123"
+        version = await db_session.scalar(select(CatalogueVersion.version))
+        assert version == 1
 
     async def test_import_skips_duplicates(self, db_session):
         sample = [
@@ -74,6 +95,65 @@ class TestImportJSON:
         await import_tasks(tmp_path, db_session)
         await import_tasks(tmp_path, db_session)
 
+    async def test_reimport_skips_unchanged_and_updates_changed(
+        self, db_session
+    ):
+        sample = [
+            {"id": f"FIPI-BULK-{i:03}", "type": 2, "text": f"Задача {i}"}
+            for i in range(5)
+        ]
+        sample[0]["answer"] = "12"
+        path = _write_json(sample)
+
+        report = await import_tasks(path, db_session, batch_size=2)
+        assert (report.inserted, report.updated) == (5, 0)
+
+        sample[0] = {"id": "FIPI-BULK-000", "type": 3, "text": "Новый текст"}
+        report = await import_tasks(_write_json(sample), db_session)
+        assert (report.inserted, report.updated, report.unchanged) == (
+            0,
+            1,
+            4,
+        )
+
+        task = await db_session.scalar(
+            select(Task).where(Task.fipi_id == "FIPI-BULK-000")
+        )
+        await db_session.refresh(task)
+        assert task.text == "Новый текст"
+        assert task.task_type == 3
+        assert task.answer == "12"
+
+    async def test_manifest_skips_unchanged_dump(self, db_session):
+        sample = [{"id": "FIPI-MAN-001", "type": 1, "text": "Задача"}]
+        path = _write_json(sample)
+
+        report = await import_if_changed(path, db_session)
+        assert report is not None and report.inserted == 1
+        assert await import_if_changed(path, db_session) is None
+
+        manifest = await db_session.scalar(select(ImportManifest))
+        assert manifest is not None
+        assert manifest.schema_revision == head_revision()
+        manifest.schema_revision = "0001"
+        await db_session.flush()
+        report = await import_if_changed(path, db_session)
+        assert report is not None and report.unchanged == 1
+
+        sample.append({"id": "FIPI-MAN-002", "type": 1, "text": "Ещё"})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(sample, f, ensure_ascii=False)
+        report = await import_if_changed(path, db_session)
+        assert report is not None
+        assert (report.inserted, report.unchanged) == (1, 1)
+
+    async def test_streaming_reader_handles_chunk_boundaries(self):
+        sample = [
+            {"id": str(i), "text": "Задача «" + "x" * i} for i in range(40)
+        ]
+        path = _write_json(sample)
+        assert list(iter_json_array(path, chunk_size=7)) == sample
+
 
 class TestTaskCRUD:
     async def test_admin_can_update_task(self, client, admin, db_session):
@@ -112,6 +192,83 @@ class TestTaskCRUD:
         assert resp.status_code == 403
 
 
+class TestResponseCache:
+    async def test_etag_revalidation(self, client, db_session):
+        task = await make_task(db_session)
+
+        first = await client.get(f"/api/tasks/{task.id}")
+        etag = first.headers["etag"]
+        again = await client.get(
+            f"/api/tasks/{task.id}", headers={"If-None-Match": etag}
+        )
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+    async def test_cached_page_skips_database(self, client, db_session):
+        await make_task(db_session, task_type=11)
+        params = {"task_type": 11, "per_page": 5}
+        first = await client.get("/api/tasks", params=params)
+
+        with track_queries() as stats:
+            second = await client.get("/api/tasks", params=params)
+        assert stats.count == 0
+        assert second.json() == first.json()
+
+    async def test_vote_and_update_invalidate(self, client, admin, db_session):
+        _, token = admin
+        task = await make_task(db_session)
+        before = await client.get(f"/api/tasks/{task.id}")
+
+        await client.post(
+            f"/api/tasks/{task.id}/vote",
+            json={"vote": "like"},
+            headers=auth_headers(token),
+        )
+        voted = await client.get(f"/api/tasks/{task.id}")
+        assert voted.json()["likes"] == 1
+        assert voted.headers["etag"] != before.headers["etag"]
+
+        await client.put(
+            f"/api/admin/tasks/{task.id}",
+            json={"text": "Новый текст"},
+            headers=auth_headers(token),
+        )
+        updated = await client.get(f"/api/tasks/{task.id}")
+        assert updated.json()["text"] == "Новый текст"
+
+    async def test_changes_from_other_process_invalidate(
+        self, client, db_session, monkeypatch
+    ):
+        monkeypatch.setattr(task_response_cache, "sync_interval", 0)
+        task = await make_task(db_session, text="Старый текст")
+        await client.get(f"/api/tasks/{task.id}")
+
+        # Так же пишет импорт или другой воркер: кэш этого процесса
+        # напрямую не трогается.
+        await db_session.execute(
+            update(Task).where(Task.id == task.id).values(text="Из импорта")
+        )
+        await bump_catalogue_version(db_session)
+        await db_session.flush()
+
+        resp = await client.get(f"/api/tasks/{task.id}")
+        assert resp.json()["text"] == "Из импорта"
+
+    async def test_memory_cap_evicts_oldest(self):
+        cache = ResponseCache(maxsize=10, max_bytes=10, ttl=60)
+        cache.put("a", b"12345", cache.version)
+        cache.put("b", b"12345", cache.version)
+        cache.put("c", b"123", cache.version)
+        assert cache.get("a") is None
+        assert cache.size_bytes == 8
+
+        stale = cache.version
+        cache.bump()
+        cache.put("d", b"1", stale)
+        assert len(cache) == 0
+
+
 class TestVariants:
     async def test_create_variant(self, client, admin, db_session):
         _, token = admin
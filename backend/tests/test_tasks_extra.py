@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import base64
+import json
+
 import pytest
 
 from backend.domain.models.task import Task
@@ -134,3 +137,97 @@ class TestTaskSearchCombined:
         assert resp.status_code == 200
         assert resp.json()["total"] == 0
         assert resp.json()["tasks"] == []
+
+
+class TestTaskCursorPagination:
+    async def test_cursor_walks_all_pages(self, client, db_session):
+        created = [
+            await make_task(db_session, task_type=17, text=f"Курсор {i}")
+            for i in range(5)
+        ]
+
+        seen: list[int] = []
+        cursor = ""
+        while cursor is not None:
+            resp = await client.get(
+                "/api/tasks",
+                params={"task_type": 17, "per_page": 2, "cursor": cursor},
+            )
+            assert resp.status_code == 200
+            data = resp.json()
+            assert len(data["tasks"]) <= 2
+            seen.extend(t["id"] for t in data["tasks"])
+            cursor = data["next_cursor"]
+
+        assert seen == sorted(t.id for t in created)
+
+    async def test_cursor_with_total(self, client, db_session):
+        for i in range(3):
+            await make_task(db_session, task_type=18, text=f"Итого {i}")
+        resp = await client.get(
+            "/api/tasks",
+            params={"task_type": 18, "cursor": "", "with_total": True},
+        )
+        data = resp.json()
+        assert data["total"] == 3
+        assert data["next_cursor"] is None
+
+    async def test_cursor_over_search_results(self, client, db_session):
+        for i in range(3):
+            await make_task(db_session, text=f"Параллелограмм номер {i}")
+        first = await client.get(
+            "/api/tasks",
+            params={"search": "параллелограмм", "per_page": 2, "cursor": ""},
+        )
+        second = await client.get(
+            "/api/tasks",
+            params={
+                "search": "параллелограмм",
+                "per_page": 2,
+                "cursor": first.json()["next_cursor"],
+            },
+        )
+        assert len(first.json()["tasks"]) == 2
+        assert len(second.json()["tasks"]) == 1
+        assert second.json()["next_cursor"] is None
+
+    async def test_invalid_cursor(self, client):
+        resp = await client.get("/api/tasks", params={"cursor": "не-курсор"})
+        assert resp.status_code == 400
+
+    async def test_tampered_offset_rejected(self, client, db_session):
+        for i in range(3):
+            await make_task(db_session, text=f"Трапеция номер {i}")
+        params = {"search": "трапеция", "per_page": 2, "cursor": ""}
+        first = await client.get("/api/tasks", params=params)
+        cursor = first.json()["next_cursor"]
+        position = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        # Лишнее корректное поле не прикрывает неверное.
+        position.update(o=-2, k=[1, 1])
+        forged = base64.urlsafe_b64encode(json.dumps(position).encode())
+
+        resp = await client.get(
+            "/api/tasks", params={**params, "cursor": forged.decode()}
+        )
+        assert resp.status_code == 400
+
+    async def test_cursor_bound_to_query(self, client, db_session):
+        for i in range(3):
+            await make_task(db_session, task_type=16, text=f"Связь {i}")
+        first = await client.get(
+            "/api/tasks",
+            params={"task_type": 16, "per_page": 2, "cursor": ""},
+        )
+        cursor = first.json()["next_cursor"]
+
+        for params in (
+            {"task_type": 15},
+            {"task_type": 16, "filter": "no_answer"},
+            {"task_type": 16, "search": "связь"},
+        ):
+            resp = await client.get(
+                "/api/tasks", params={**params, "cursor": cursor}
+            )
+            assert resp.status_code == 400
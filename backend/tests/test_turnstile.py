@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from backend.bench.turnstile_stub import FAILING_TOKEN, create_app
+from backend.core.cache import TTLCache
+from backend.turnstile import (
+    CircuitBreaker,
+    TurnstileVerifier,
+    turnstile_verifier,
+)
+
+pytestmark = pytest.mark.asyncio
+
+STUB_URL = "http://turnstile.test/siteverify"
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+        self.calls = 0
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        self.calls += 1
+        return await self.inner.handle_async_request(request)
+
+
+def _unreachable(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectTimeout("timed out", request=request)
+
+
+def _verifier(
+    transport: httpx.AsyncBaseTransport,
+    fail_open: bool = False,
+    cooldown: float = 60,
+) -> TurnstileVerifier:
+    return TurnstileVerifier(
+        url=STUB_URL,
+        secret="secret",
+        timeout=httpx.Timeout(1.0),
+        fail_open=fail_open,
+        breaker=CircuitBreaker(threshold=2, cooldown=cooldown),
+        rejected=TTLCache(100, 300),
+        transport=transport,
+    )
+
+
+class TestVerifier:
+    async def test_rejections_cached(self):
+        transport = CountingTransport(httpx.ASGITransport(app=create_app()))
+        verifier = _verifier(transport)
+
+        assert await verifier.verify(FAILING_TOKEN) is False
+        assert await verifier.verify(FAILING_TOKEN) is False
+        assert transport.calls == 1
+        await verifier.close()
+
+    async def test_passed_token_works_once(self):
+        transport = CountingTransport(httpx.ASGITransport(app=create_app()))
+        verifier = _verifier(transport)
+
+        assert await verifier.verify("token") is True
+        assert await verifier.verify("token") is False
+        assert transport.calls == 2
+        await verifier.close()
+
+    @pytest.mark.parametrize("fail_open", [False, True])
+    async def test_breaker_opens_after_failures(self, fail_open):
+        transport = CountingTransport(httpx.MockTransport(_unreachable))
+        verifier = _verifier(transport, fail_open=fail_open)
+
+        for token in ("a", "b", "c", "d"):
+            assert await verifier.verify(token) is fail_open
+        assert transport.calls == 2
+        await verifier.close()
+
+    async def test_probe_closes_breaker(self):
+        verifier = _verifier(httpx.MockTransport(_unreachable), cooldown=0)
+        for token in ("a", "b"):
+            await verifier.verify(token)
+
+        verifier.transport = httpx.ASGITransport(app=create_app())
+        await verifier.close()
+        assert await verifier.verify("c") is True
+        assert verifier.breaker.failures == 0
+        await verifier.close()
+
+
+@pytest_asyncio.fixture
+async def stub_verifier(monkeypatch):
+    monkeypatch.setenv("TURNSTILE_SECRET_KEY", "secret")
+    monkeypatch.setattr(turnstile_verifier, "secret", "secret")
+    monkeypatch.setattr(turnstile_verifier, "url", STUB_URL)
+    monkeypatch.setattr(
+        turnstile_verifier, "transport", httpx.ASGITransport(app=create_app())
+    )
+    monkeypatch.setattr(turnstile_verifier, "rejected", TTLCache(100, 300))
+    await turnstile_verifier.close()
+    yield turnstile_verifier
+    await turnstile_verifier.close()
+
+
+class TestCaptchaOnLogin:
+    async def test_rejected_token(self, client, stub_verifier):
+        resp = await client.post(
+            "/api/auth/login",
+            json={
+                "username": "nobody",
+                "password": "Wrong999",
+                "turnstile_token": FAILING_TOKEN,
+            },
+        )
+        assert resp.status_code == 400
+
+        resp = await client.post(
+            "/api/auth/login",
+            json={
+                "username": "nobody",
+                "password": "Wrong999",
+                "turnstile_token": "ok",
+            },
+        )
+        assert resp.status_code == 401
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import pytest
 
-from backend.tests.conftest import auth_headers, make_task
+from backend.domain.models import (
+    ClassMember,
+    SchoolClass,
+    Solution,
+    SolutionFile,
+)
+from backend.tests.conftest import _make_user, auth_headers, make_task
 
 pytestmark = pytest.mark.asyncio
 
@@ -156,3 +162,114 @@ class TestVariantBadInput:
         )
         assert resp.status_code == 200
         assert resp.json()["tasks"] == []
+
+
+class TestStudentSolutions:
+    async def test_fields_merge_from_newest_filled(
+        self, client, teacher, db_session
+    ):
+        _, token = teacher
+        t1 = await make_task(db_session)
+        t2 = await make_task(db_session)
+        pupil, _ = await _make_user(db_session)
+        draft = Solution(
+            user_id=pupil.id, task_id=t1.id, content=[{"type": "text"}]
+        )
+        db_session.add(draft)
+        await db_session.flush()
+        db_session.add(
+            SolutionFile(
+                solution_id=draft.id,
+                filename="photo.jpg",
+                filepath="/uploads/photo.jpg",
+            )
+        )
+        db_session.add(
+            Solution(user_id=pupil.id, task_id=t1.id, answer="5", content=[])
+        )
+        await db_session.flush()
+        db_session.add(
+            Solution(
+                user_id=pupil.id, task_id=t1.id, answer="7", is_correct=False
+            )
+        )
+        await db_session.flush()
+        created = await client.post(
+            "/api/variants",
+            json={"title": "Домашняя", "task_ids": [t1.id, t2.id]},
+            headers=auth_headers(token),
+        )
+        variant_id = created.json()["id"]
+
+        resp = await client.get(
+            f"/api/variants/{variant_id}/student/{pupil.id}/solutions",
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 200
+        merged, empty = resp.json()
+        assert merged["answer"] == "7"
+        assert merged["is_correct"] is False
+        assert merged["content"] == [{"type": "text"}]
+        assert [f["filename"] for f in merged["files"]] == ["photo.jpg"]
+        assert empty["task_id"] == t2.id
+        assert empty["answer"] is None
+        assert empty["files"] == []
+
+
+class TestClassMatrix:
+    async def test_matrix_statuses(self, client, teacher, db_session):
+        teacher_user, token = teacher
+        t1 = await make_task(db_session)
+        t2 = await make_task(db_session)
+        t3 = await make_task(db_session)
+        solver, _ = await _make_user(db_session, username="a_solver")
+        idle, _ = await _make_user(db_session, username="b_idle")
+        outsider, _ = await _make_user(db_session)
+        school_class = SchoolClass(name="9Б", created_by=teacher_user.id)
+        db_session.add(school_class)
+        await db_session.flush()
+        db_session.add_all(
+            [
+                ClassMember(class_id=school_class.id, user_id=solver.id),
+                ClassMember(class_id=school_class.id, user_id=idle.id),
+                ClassMember(
+                    class_id=school_class.id,
+                    user_id=teacher_user.id,
+                    role="teacher",
+                ),
+            ]
+        )
+        db_session.add_all(
+            [
+                Solution(user_id=solver.id, task_id=t1.id, is_correct=False),
+                Solution(user_id=solver.id, task_id=t1.id, is_correct=True),
+                Solution(user_id=solver.id, task_id=t2.id, is_correct=False),
+                Solution(user_id=solver.id, task_id=t3.id, content=[]),
+                Solution(user_id=outsider.id, task_id=t1.id, is_correct=True),
+            ]
+        )
+        await db_session.flush()
+        created = await client.post(
+            "/api/variants",
+            json={"title": "Контрольная", "task_ids": [t3.id, t1.id, t2.id]},
+            headers=auth_headers(token),
+        )
+        variant_id = created.json()["id"]
+
+        resp = await client.get(
+            f"/api/variants/{variant_id}/class/{school_class.id}/matrix",
+            headers=auth_headers(token),
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["task_ids"] == [t3.id, t1.id, t2.id]
+        assert data["student_ids"] == [solver.id, idle.id]
+        assert data["status"] == [[3, 2, 1], [0, 0, 0]]
+        assert data["attempts"] == [[1, 2, 1], [0, 0, 0]]
+
+    async def test_students_forbidden(self, client, student):
+        _, token = student
+        resp = await client.get(
+            "/api/variants/1/class/1/matrix", headers=auth_headers(token)
+        )
+        assert resp.status_code == 403
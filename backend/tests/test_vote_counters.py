@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.core.instrumentation import track_queries
+from backend.domain.models.task import TaskVote
+from backend.repositories.task_repo import task_response_cache
+from backend.services.vote_counters import (
+    apply_vote_deltas,
+    reconcile_vote_counts,
+    vote_buffer,
+)
+from backend.tests.conftest import _make_user, make_task
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    vote_buffer.drain()
+    yield
+    vote_buffer.drain()
+
+
+class TestVoteCounters:
+    async def test_deltas_coalesce_into_one_update(self, db_session):
+        first = await make_task(db_session)
+        second = await make_task(db_session)
+        vote_buffer.add(first.id, 1, 0)
+        vote_buffer.add(first.id, 1, 0)
+        vote_buffer.add(first.id, -1, 1)
+        vote_buffer.add(second.id, 0, 1)
+        vote_buffer.add(second.id, 0, -1)
+
+        with track_queries() as stats:
+            assert await apply_vote_deltas(db_session) == 1
+        updates = [f for f in stats.fingerprints if f.startswith("UPDATE")]
+        assert len(updates) == 1
+        assert (first.likes, first.dislikes) == (1, 1)
+        assert (second.likes, second.dislikes) == (0, 0)
+        assert len(vote_buffer) == 0
+
+    async def test_flush_drops_only_affected_task_responses(self, db_session):
+        voted = await make_task(db_session)
+        other = await make_task(db_session)
+        version = task_response_cache.version
+        for key in [("task", voted.id), ("task", other.id), ("list",)]:
+            task_response_cache.put(key, b"{}", version)
+
+        vote_buffer.add(voted.id, 1, 0)
+        await apply_vote_deltas(db_session)
+
+        assert task_response_cache.get(("task", voted.id)) is None
+        assert task_response_cache.get(("task", other.id)) is not None
+        assert task_response_cache.get(("list",)) is not None
+
+    async def test_reconcile_skips_pending_deltas(
+        self, db_session, monkeypatch
+    ):
+        user, _ = await _make_user(db_session)
+        task = await make_task(db_session)
+        db_session.add(
+            TaskVote(user_id=user.id, task_id=task.id, vote_type="like")
+        )
+        await db_session.flush()
+        vote_buffer.add(task.id, 1, 0)
+        # Приращение пришло, пока сверка сбрасывала буфер.
+        monkeypatch.setattr(vote_buffer, "drain", lambda: {})
+        assert await reconcile_vote_counts(db_session) == 0
+        await db_session.refresh(task)
+        assert task.likes == 0
+
+    async def test_reconcile_recounts_from_votes(self, db_session):
+        user, _ = await _make_user(db_session)
+        other, _ = await _make_user(db_session)
+        task = await make_task(db_session)
+        task.likes, task.dislikes = 7, 3
+        db_session.add_all(
+            [
+                TaskVote(user_id=user.id, task_id=task.id, vote_type="like"),
+                TaskVote(
+                    user_id=other.id, task_id=task.id, vote_type="dislike"
+                ),
+            ]
+        )
+        await db_session.flush()
+
+        assert await reconcile_vote_counts(db_session) >= 1
+        await db_session.refresh(task)
+        assert (task.likes, task.dislikes) == (1, 1)
+        assert await reconcile_vote_counts(db_session) == 0
@@ -1,23 +1,162 @@
+"""Проверка капчи Cloudflare Turnstile.
+
+Один httpx-клиент на процесс держит соединения с Cloudflare открытыми,
+поэтому вход и регистрация не платят за TCP и TLS на каждый запрос.
+Если siteverify отвечает ошибкой или не укладывается в таймауты, после
+нескольких неудач подряд проверка на время отключается и решение
+принимается по TURNSTILE_FAILURE_POLICY, не дожидаясь таймаутов.
+"""
+
+import hashlib
+import logging
 import os
-from typing import Any, cast
+import time
+from typing import Any
 
 import httpx
 
+from backend.core.cache import TTLCache
+from backend.core.config import (
+    TURNSTILE_BREAKER_COOLDOWN,
+    TURNSTILE_BREAKER_THRESHOLD,
+    TURNSTILE_CONNECT_TIMEOUT,
+    TURNSTILE_FAILURE_POLICY,
+    TURNSTILE_READ_TIMEOUT,
+    TURNSTILE_VERDICT_CACHE_SIZE,
+    TURNSTILE_VERDICT_TTL,
+    TURNSTILE_VERIFY_URL,
+)
+from backend.core.metrics import turnstile_verifications
+
+logger = logging.getLogger(__name__)
+
 TURNSTILE_SECRET = os.getenv("TURNSTILE_SECRET_KEY", "")
-VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
 
 
-async def verify_turnstile(token: str) -> bool:
-    if not TURNSTILE_SECRET:
+class CircuitBreaker:
+    """Размыкается после threshold ошибок подряд; через cooldown
+    пропускает один пробный запрос."""
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def allow(self) -> bool:
+        if self.failures < self.threshold:
+            return True
+        now = time.monotonic()
+        if now < self.open_until:
+            return False
+        # Пробный запрос; остальные ждут его исхода ещё cooldown.
+        self.open_until = now + self.cooldown
         return True
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            VERIFY_URL,
-            data={
-                "secret": TURNSTILE_SECRET,
-                "response": token,
-            },
-        )
-        result = cast(dict[str, Any], response.json())
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures == self.threshold:
+            self.open_until = time.monotonic() + self.cooldown
+
+
+class TurnstileVerifier:
+    def __init__(
+        self,
+        url: str,
+        secret: str,
+        timeout: httpx.Timeout,
+        fail_open: bool,
+        breaker: CircuitBreaker,
+        rejected: TTLCache[str, bool],
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+        self.fail_open = fail_open
+        self.breaker = breaker
+        self.rejected = rejected
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    def start(self) -> None:
+        self._get_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _siteverify(self, token: str, remote_ip: str | None) -> bool:
+        data = {"secret": self.secret, "response": token}
+        if remote_ip:
+            data["remoteip"] = remote_ip
+        response = await self._get_client().post(self.url, data=data)
+        response.raise_for_status()
+        result: dict[str, Any] = response.json()
         return bool(result.get("success", False))
+
+    async def verify(self, token: str, remote_ip: str | None = None) -> bool:
+        if not self.secret:
+            return True
+
+        # Запоминаются только отказы: прошедший токен одноразовый, и его
+        # повтор должен снова уйти в Cloudflare, который его отклонит.
+        key = hashlib.sha256(token.encode()).hexdigest()
+        if self.rejected.get(key) is not None:
+            turnstile_verifications.inc("cached")
+            return False
+
+        if not self.breaker.allow():
+            turnstile_verifications.inc("breaker_open")
+            return self.fail_open
+
+        try:
+            verdict = await self._siteverify(token, remote_ip)
+        except (httpx.HTTPError, ValueError) as e:
+            self.breaker.record_failure()
+            turnstile_verifications.inc("error")
+            logger.warning("Turnstile недоступен: %r", e)
+            return self.fail_open
+
+        self.breaker.record_success()
+        if verdict:
+            turnstile_verifications.inc("success")
+        else:
+            self.rejected.set(key, False)
+            turnstile_verifications.inc("rejected")
+        return verdict
+
+
+turnstile_verifier = TurnstileVerifier(
+    url=TURNSTILE_VERIFY_URL,
+    secret=TURNSTILE_SECRET,
+    timeout=httpx.Timeout(
+        TURNSTILE_READ_TIMEOUT, connect=TURNSTILE_CONNECT_TIMEOUT
+    ),
+    fail_open=TURNSTILE_FAILURE_POLICY == "open",
+    breaker=CircuitBreaker(
+        TURNSTILE_BREAKER_THRESHOLD, TURNSTILE_BREAKER_COOLDOWN
+    ),
+    rejected=TTLCache(TURNSTILE_VERDICT_CACHE_SIZE, TURNSTILE_VERDICT_TTL),
+)
+
+
+async def verify_turnstile(token: str, remote_ip: str | None = None) -> bool:
+    return await turnstile_verifier.verify(token, remote_ip)
@@ -21,6 +21,7 @@ export default function UserProfilePage() {
   const [stats, setStats] = useState<UserStats | null>(null);
   const [typeStats, setTypeStats] = useState<TypeStatItem[]>([]);
   const [history, setHistory] = useState<HistoryItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [error, setError] = useState('');
 
   const canSeeHistory =
@@ -47,12 +48,26 @@ export default function UserProfilePage() {
 
     if (canSeeHistory) {
       profileApi
-        .getUserHistory(userId)
-        .then(setHistory)
+        .getUserHistoryPage(userId)
+        .then((page) => {
+          setHistory(page.items);
+          setNextCursor(page.next_cursor);
+        })
         .catch(() => {});
     }
   }, [userId, canSeeHistory]);
 
+  const loadMoreHistory = () => {
+    if (!nextCursor) return;
+    profileApi
+      .getUserHistoryPage(userId, nextCursor)
+      .then((page) => {
+        setHistory((prev) => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(() => {});
+  };
+
   if (error) return <div className="text-center py-20 text-red-500">{error}</div>;
   if (!profileUser)
     return <div className="text-center py-20 text-gray-500">Загрузка...</div>;
@@ -77,7 +92,10 @@ export default function UserProfilePage() {
       </Card>
 
       {canSeeHistory ? (
-        <HistoryList history={history} />
+        <HistoryList
+          history={history}
+          onLoadMore={nextCursor ? loadMoreHistory : undefined}
+        />
       ) : (
         <p className="text-gray-400 text-sm text-center mt-4">
           История ответов доступна только самому пользователю, учителям и
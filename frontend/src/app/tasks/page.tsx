@@ -2,13 +2,18 @@
 
 import { useState, Suspense } from 'react';
 import { useRouter, useSearchParams, usePathname } from 'next/navigation';
-import useSWR from 'swr';
+import useSWRInfinite from 'swr/infinite';
 import { taskApi } from '@/entities/task/api/task-api';
+import type { TaskCursorResponse } from '@/entities/task/model/types';
 import { TaskCard } from '@/widgets/task-card/ui/task-card';
 import { TYPE_NAMES } from '@/shared/config/task-types';
 import { Input } from '@/components/ui/input';
 import { Button } from '@/components/ui/button';
 
+const PER_PAGE = 10;
+
+type TasksKey = readonly ['tasks', number | null, string, string];
+
 function TasksContent() {
   const router = useRouter();
   const pathname = usePathname();
@@ -17,27 +22,33 @@ function TasksContent() {
   const urlType = searchParams.get('type');
   const initialType = urlType ? Number(urlType) : null;
 
-  const [page, setPage] = useState(1);
   const [searchInput, setSearchInput] = useState('');
   const [appliedSearch, setAppliedSearch] = useState('');
   const [taskType, setTaskType] = useState<number | null>(initialType);
   const [errorMsg, setErrorMsg] = useState<string | null>(null);
 
-  const { data, error, isLoading } = useSWR(
-    ['tasks', page, taskType, appliedSearch],
-    () =>
-      taskApi.getList({
-        page,
-        per_page: 10,
-        task_type: taskType ?? undefined,
-        search: appliedSearch || undefined,
+  // Курсорные страницы: подгрузка следующей не зависит от глубины.
+  // Смена типа или поиска меняет ключ первой страницы и сбрасывает ленту.
+  const { data, error, isLoading, isValidating, size, setSize } = useSWRInfinite(
+    (_index: number, previous: TaskCursorResponse | null): TasksKey | null => {
+      if (previous && !previous.next_cursor) return null;
+      return ['tasks', taskType, appliedSearch, previous?.next_cursor ?? ''];
+    },
+    ([, type, search, cursor]: TasksKey) =>
+      taskApi.getCursorPage({
+        cursor,
+        per_page: PER_PAGE,
+        task_type: type ?? undefined,
+        search: search || undefined,
+        with_total: !cursor,
       }),
-    { revalidateOnFocus: false },
+    { revalidateOnFocus: false, revalidateFirstPage: false },
   );
 
-  const tasks = data?.tasks || [];
-  const total = data?.total || 0;
-  const pages = data?.pages || 1;
+  const tasks = data?.flatMap((p) => p.tasks) ?? [];
+  const total = data?.[0]?.total ?? 0;
+  const hasMore = Boolean(data?.[data.length - 1]?.next_cursor);
+  const isLoadingMore = isValidating && size > (data?.length ?? 0);
 
   const handleSearch = () => {
     const trimmedSearch = searchInput.trim();
@@ -50,13 +61,11 @@ function TasksContent() {
       return;
     }
     setErrorMsg(null);
-    setPage(1);
     setAppliedSearch(trimmedSearch);
   };
 
   const selectType = (t: number | null) => {
     setTaskType(t);
-    setPage(1);
 
     const params = new URLSearchParams(searchParams.toString());
     if (t !== null) {
@@ -136,27 +145,17 @@ function TasksContent() {
       ) : (
         <>
           {tasks.map((task, i) => (
-            <TaskCard key={task.id} task={task} index={(page - 1) * 10 + i + 1} />
+            <TaskCard key={task.id} task={task} index={i + 1} />
           ))}
 
-          {pages > 1 && (
-            <div className="flex justify-center gap-2 mt-6">
-              <Button
-                variant="outline"
-                disabled={page <= 1}
-                onClick={() => setPage(page - 1)}
-              >
-                ◀
-              </Button>
-              <span className="flex items-center px-4 text-sm text-gray-600">
-                {page} / {pages}
-              </span>
+          {hasMore && (
+            <div className="flex justify-center mt-6">
               <Button
                 variant="outline"
-                disabled={page >= pages}
-                onClick={() => setPage(page + 1)}
+                disabled={isLoadingMore}
+                onClick={() => setSize(size + 1)}
               >
-                ▶
+                {isLoadingMore ? 'Загрузка...' : 'Показать ещё'}
               </Button>
             </div>
           )}
@@ -1,5 +1,5 @@
 import http from '@/shared/api/http';
-import type { Solution } from '../model/types';
+import type { Solution, TaskProgress } from '../model/types';
 
 export interface CheckAnswerResponse {
   correct: boolean;
@@ -18,6 +18,14 @@ export const solutionApi = {
   getMy: (task_id: number) =>
     http.get<Solution[]>(`/solutions/task/${task_id}`).then((r) => r.data),
 
+  getProgress: (task_ids: number[]) =>
+    http
+      .get<TaskProgress[]>('/solutions/progress', {
+        params: { task_ids },
+        paramsSerializer: { indexes: null },
+      })
+      .then((r) => r.data),
+
   getAll: (task_id: number) =>
     http.get<Solution[]>(`/solutions/task/${task_id}/all`).then((r) => r.data),
 
@@ -22,3 +22,10 @@ export interface Solution {
   updated_at: string;
   username?: string;
 }
+
+export interface TaskProgress {
+  task_id: number;
+  attempts: number;
+  first_attempt_at: string;
+  solved_at?: string | null;
+}
@@ -1,17 +1,20 @@
 import http from '@/shared/api/http';
-import type { Task, TaskListResponse } from '../model/types';
+import type { Task, TaskCursorResponse } from '../model/types';
 
 interface GetTasksParams {
-  page?: number;
+  cursor?: string;
   per_page?: number;
   task_type?: number;
   search?: string;
   filter?: string;
+  with_total?: boolean;
 }
 
 export const taskApi = {
-  getList: (params: GetTasksParams) =>
-    http.get<TaskListResponse>('/tasks', { params }).then((r) => r.data),
+  getCursorPage: ({ cursor = '', ...params }: GetTasksParams) =>
+    http
+      .get<TaskCursorResponse>('/tasks', { params: { ...params, cursor } })
+      .then((r) => r.data),
 
   getById: (id: number) => http.get<Task>(`/tasks/${id}`).then((r) => r.data),
 
@@ -22,3 +22,9 @@ export interface TaskListResponse {
   page: number;
   pages: number;
 }
+
+export interface TaskCursorResponse {
+  tasks: Task[];
+  next_cursor: string | null;
+  total: number | null;
+}
@@ -4,11 +4,17 @@ import type { UserStats, TypeStatItem } from '../model/types';
 export interface HistoryItem {
   id: number;
   task_id: number;
-  answer: string;
-  is_correct: boolean;
+  task_type: number;
+  answer: string | null;
+  is_correct: boolean | null;
   created_at: string;
 }
 
+export interface HistoryPage {
+  items: HistoryItem[];
+  next_cursor: string | null;
+}
+
 export const profileApi = {
   getMyStats: () => http.get<UserStats>('/profile/stats').then((r) => r.data),
 
@@ -23,8 +29,12 @@ export const profileApi = {
   getUserTypeStats: (userId: number) =>
     http.get<TypeStatItem[]>(`/profile/user/${userId}/type-stats`).then((r) => r.data),
 
-  getUserHistory: (userId: number) =>
-    http.get<HistoryItem[]>(`/profile/user/${userId}/history`).then((r) => r.data),
+  getUserHistoryPage: (userId: number, cursor = '', perPage = 50) =>
+    http
+      .get<HistoryPage>(`/profile/user/${userId}/history`, {
+        params: { cursor, per_page: perPage },
+      })
+      .then((r) => r.data),
 
   changePassword: (oldPassword: string, newPassword: string) =>
     http.post('/profile/change-password', {
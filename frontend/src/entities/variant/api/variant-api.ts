@@ -1,5 +1,9 @@
 import http from '@/shared/api/http';
-import type { Variant, VariantStudentSolution } from '../model/types';
+import type {
+  Variant,
+  VariantClassMatrix,
+  VariantStudentSolution,
+} from '../model/types';
 
 export interface VariantCreate {
   title: string;
@@ -26,6 +30,11 @@ export const variantApi = {
       >(`/variants/${variantId}/student/${studentId}/solutions`)
       .then((r) => r.data),
 
+  getClassMatrix: (variantId: number, classId: number) =>
+    http
+      .get<VariantClassMatrix>(`/variants/${variantId}/class/${classId}/matrix`)
+      .then((r) => r.data),
+
   getTeacherVariants: () =>
     http.get<Variant[]>('/teacher/variants').then((r) => r.data),
 
@@ -20,3 +20,14 @@ export interface VariantStudentSolution {
   content: SolutionContent[];
   files: SolutionFile[];
 }
+
+/** status: 0 — не приступал, 1 — неверно, 2 — решено, 3 — без проверки. */
+export interface VariantClassMatrix {
+  variant_id: number;
+  class_id: number;
+  task_ids: number[];
+  student_ids: number[];
+  usernames: string[];
+  status: number[][];
+  attempts: number[][];
+}
@@ -3,9 +3,10 @@ import type { HistoryItem } from '@/entities/user/api/profile-api';
 
 interface HistoryListProps {
   history: HistoryItem[];
+  onLoadMore?: () => void;
 }
 
-export function HistoryList({ history }: HistoryListProps) {
+export function HistoryList({ history, onLoadMore }: HistoryListProps) {
   if (history.length === 0) return null;
 
   return (
@@ -31,6 +32,15 @@ export function HistoryList({ history }: HistoryListProps) {
             </div>
           ))}
         </div>
+        {onLoadMore && (
+          <button
+            type="button"
+            onClick={onLoadMore}
+            className="mt-4 text-sm text-blue-600 hover:underline"
+          >
+            Показать ещё
+          </button>
+        )}
       </CardContent>
     </Card>
   );